@@ -0,0 +1,138 @@
+import threading
+
+from typing import Dict, List, Optional
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Semaphore whose limit adapts to observed latency and errors (AIMD).
+
+    The limit grows by `increase` after every `window` successful trades
+    whose p95 latency stays under `latency_target`, and is multiplied by
+    `backoff` on a failed or timed-out trade. After a cut, trades that were
+    already in flight finish without cutting again, so one burst of errors
+    costs a single decrease. Callers report orders the backend refused on
+    business grounds as successes; only transport and backend failures
+    signal overload.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 10,
+        min_limit: int = 1,
+        max_limit: int = 16,
+        latency_target: float = 2.5,
+        timeout: float = 10.0,
+        window: int = 20,
+        increase: int = 1,
+        backoff: float = 0.5,
+    ):
+        if not 1 <= min_limit <= max_limit:
+            raise ValueError("Limits must satisfy 1 <= min_limit <= max_limit")
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_target = latency_target
+        self.timeout = timeout
+        self.window = window
+        self.increase = increase
+        self.backoff = backoff
+
+        self.limit = min(max(initial_limit, min_limit), max_limit)
+        self.in_flight = 0
+        self.peak_limit = self.limit
+        self.peak_in_flight = 0
+        self.completed = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.increases = 0
+        self.decreases = 0
+        self.last_p95: Optional[float] = None
+
+        self._samples: List[float] = []
+        self._recovering = 0
+        self._cond = threading.Condition()
+
+    def acquire(self):
+        """Wait for a free slot under the current limit"""
+        with self._cond:
+            while self.in_flight >= self.limit:
+                self._cond.wait()
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+
+    def abandon(self):
+        """Free a slot whose trade never ran, without feeding the controller"""
+        with self._cond:
+            self.in_flight -= 1
+            self._cond.notify_all()
+
+    def reconfigure(
+        self, min_limit: int, max_limit: int, limit: Optional[int] = None
+    ):
+        """Swap in new bounds (and optionally a new limit), clamping the limit"""
+        if not 1 <= min_limit <= max_limit:
+            raise ValueError("Limits must satisfy 1 <= min_limit <= max_limit")
+        with self._cond:
+            self.min_limit = min_limit
+            self.max_limit = max_limit
+            if limit is None:
+                limit = self.limit
+            self.limit = min(max(limit, min_limit), max_limit)
+            self.peak_limit = max(self.peak_limit, self.limit)
+            self._cond.notify_all()
+
+    def release(self, latency: float, success: bool = True):
+        """Free a slot and feed the trade outcome to the controller"""
+        with self._cond:
+            self.in_flight -= 1
+            self.completed += 1
+            timed_out = latency > self.timeout
+            self.timeouts += timed_out
+            self.errors += not success
+
+            recovering = self._recovering > 0
+            if recovering:
+                self._recovering -= 1
+            if not success or timed_out:
+                if not recovering:
+                    self._decrease()
+            else:
+                self._samples.append(latency)
+                if len(self._samples) >= self.window:
+                    self._evaluate_window()
+            self._cond.notify_all()
+
+    def _decrease(self):
+        """Multiplicative decrease (caller holds the lock)"""
+        self.limit = max(self.min_limit, int(self.limit * self.backoff))
+        self.decreases += 1
+        self._samples.clear()
+        # Trades issued under the old limit must drain before the next cut
+        self._recovering = self.in_flight
+
+    def _evaluate_window(self):
+        """Additive increase if the window p95 met the target (caller holds the lock)"""
+        ordered = sorted(self._samples)
+        self.last_p95 = ordered[max(0, -(-len(ordered) * 95 // 100) - 1)]
+        self._samples.clear()
+        if self.last_p95 <= self.latency_target and self.limit < self.max_limit:
+            self.limit = min(self.max_limit, self.limit + self.increase)
+            self.peak_limit = max(self.peak_limit, self.limit)
+            self.increases += 1
+
+    def metrics(self) -> Dict[str, float]:
+        """Snapshot of the controller state"""
+        with self._cond:
+            return {
+                "concurrency_limit": self.limit,
+                "concurrency_max": self.max_limit,
+                "concurrency_peak": self.peak_limit,
+                "in_flight": self.in_flight,
+                "in_flight_peak": self.peak_in_flight,
+                "completed": self.completed,
+                "errors": self.errors,
+                "timeouts": self.timeouts,
+                "increases": self.increases,
+                "decreases": self.decreases,
+                "latency_p95_s": self.last_p95,
+            }
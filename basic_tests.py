@@ -1,8 +1,115 @@
 import logging
+import multiprocessing
+import glob
+import gzip
+import json
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
 import unittest
+import urllib.request
 
 from unittest.mock import patch, MagicMock, call
-from crypto_trading_bot import TradingSession  # Assuming this is your main module
+from adaptive_concurrency import AdaptiveConcurrencyLimiter
+from config import logger
+from exposure import ExposureIndex
+from log_rotation import CompressingRotatingFileHandler, wait_for_compression
+from market_data import MarkPriceFeed, ReplayPriceSource, SharedPriceSource
+from crypto_trading_bot import (  # Assuming this is your main module
+    BalanceCache,
+    ProxyManager,
+    TradingSession,
+    TransactionManager,
+)
+from simulator import SimulatedBackend
+from trade_result import (
+    Direction, ResultBuffer, TradeResult, TradeStatus, asset_code, asset_name
+)
+from position_book import PositionBook, LONG, SHORT
+from proxy_assignment import LatencyWeightedAssignment, LeastOutstandingAssignment
+from result_ring import ResultRing
+from risk import PreTradeRisk
+from timing_wheel import TimingWheel
+import loadtest
+import replay
+import reporting
+from settings import SettingsReloader, compile_settings
+from trading_ui_automation import (
+    BENCHMARK_THIRD_PARTY_PATH, TradingPlatformUI, benchmark_browser_profiles
+)
+from tx_ids import TransactionIdGenerator, decode_tx_id, parse_tx_id
+import tracing
+import tx_ids
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+CHROME_BINARIES = (
+    "google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "chrome"
+)
+
+
+def mock_batch_results(orders):
+    """
+    Successful result for every order in a batch.
+    """
+    return [
+        TradeResult(
+            TradeStatus.SUCCESS,
+            str(order["wallet_key"]),
+            asset_code(order["asset"]),
+            Direction.from_name(order["direction"]),
+            order["size"],
+            tx_id=i + 1,
+        )
+        for i, order in enumerate(orders)
+    ]
+
+
+def batch_order_args(execute_batch_mock):
+    """
+    Flatten execute_batch calls into execute_trade-style argument tuples.
+    """
+    return [
+        (
+            order["wallet_key"], order["asset"], order["direction"],
+            order["size"], order["proxy"],
+        )
+        for batch_call in execute_batch_mock.call_args_list
+        for order in batch_call.args[0]
+    ]
+
+
+def mock_balances(wallets):
+    """
+    Balance of 100 for every wallet, so that trade sizes
+    equal the drawn volume percentage.
+    """
+    return {wallet: 100.0 for wallet in wallets}
+
+
+def run_in_temp_dir(test_case):
+    """
+    Run the test case from a temporary working directory so that session
+    logs and CSV results do not end up in the repository.
+    """
+    previous_dir = os.getcwd()
+    temp_dir = tempfile.TemporaryDirectory()
+    os.chdir(temp_dir.name)
+
+    def cleanup():
+        for handler in logger.handlers[:]:
+            if isinstance(handler, logging.FileHandler):
+                logger.removeHandler(handler)
+                handler.close()
+        os.chdir(previous_dir)
+        temp_dir.cleanup()
+
+    test_case.addCleanup(cleanup)
 
 
 class TestTradingSession(unittest.TestCase):
@@ -16,7 +123,11 @@ class TestTradingSession(unittest.TestCase):
             format="%(asctime)s - %(levelname)s - %(message)s"
         )
 
+        run_in_temp_dir(self)
+
         self.config = {
+            "keys_file": os.path.join(REPO_DIR, "wallet_keys.txt"),
+            "proxy_file": os.path.join(REPO_DIR, "proxies.txt"),
             "branch_wallet_range": (2, 3),
             "max_parallel_branches": 2,
             "enable_shuffling": False,
@@ -41,6 +152,7 @@ class TestTradingSession(unittest.TestCase):
         session.wallet_manager = wallet_manager_mock
         session.proxy_manager = proxy_manager_mock
         session.transaction_manager = transaction_manager_mock
+        transaction_manager_mock.get_balances.side_effect = mock_balances
 
         mock_wallets = ["wallet_1", "wallet_2", "wallet_3"]
         wallet_manager_mock.wallets = mock_wallets
@@ -53,16 +165,10 @@ class TestTradingSession(unittest.TestCase):
             "auth": f"user{account_id}:pass{account_id}",
         }
 
-        transaction_manager_mock.execute_trade.side_effect = (
-            lambda wallet, asset, direction, size, proxy: {
-                "status": "success",
-                "transaction_hash": f"hash_{wallet}",
-                "details": {"wallet": wallet, "proxy_used": proxy["ip_port"]},
-            }
-        )
+        transaction_manager_mock.execute_batch.side_effect = mock_batch_results
 
         session.run_session("branch")
-        transaction_manager_mock.execute_trade.assert_called()
+        transaction_manager_mock.execute_batch.assert_called()
 
     @patch("crypto_trading_bot.time.sleep", return_value=None)
     def test_run_session_no_wallets(self, mock_sleep):
@@ -139,6 +245,8 @@ class TestTradingSession(unittest.TestCase):
         session.wallet_manager = wallet_manager_mock
         session.proxy_manager = proxy_manager_mock
         session.transaction_manager = transaction_manager_mock
+        transaction_manager_mock.get_balances.side_effect = mock_balances
+        transaction_manager_mock.execute_batch.side_effect = mock_batch_results
         # session.config = config
 
         # Running tested function
@@ -153,11 +261,11 @@ class TestTradingSession(unittest.TestCase):
             (("wallet_5", "key_5"), asset, "short", 15.0, proxy_data),
         ]
 
+        # Each branch is submitted as one batch
+        self.assertEqual(transaction_manager_mock.execute_batch.call_count, 2)
+
         # Get actual calls
-        actual_calls = [
-            call.args for call
-            in transaction_manager_mock.execute_trade.call_args_list
-        ]
+        actual_calls = batch_order_args(transaction_manager_mock.execute_batch)
 
         # Verify number of calls
         self.assertEqual(
@@ -182,8 +290,8 @@ class TestTradingSession(unittest.TestCase):
 
             # Assert we found the expected call
             assert found_the_right_call, (
-                f"transaction_manager.execute_trade "
-                f"was called with expected args: "
+                f"transaction_manager.execute_batch "
+                f"was called with expected order: "
                 f"wallet={expected_call[0]}, "
                 f"asset={expected_call[1]}, "
                 f"direction={expected_call[2]}, "
@@ -247,9 +355,11 @@ class TestTradingSession(unittest.TestCase):
         session.wallet_manager = wallet_manager_mock
         session.proxy_manager = proxy_manager_mock
         session.transaction_manager = transaction_manager_mock
+        transaction_manager_mock.get_balances.side_effect = mock_balances
 
         mock_wallets = [("wallet_1", "key_1"), ("wallet_2", "key_2")]
         wallet_manager_mock.wallets = mock_wallets
+        transaction_manager_mock.execute_batch.side_effect = mock_batch_results
 
         test_proxy = {"ip_port": "127.0.0.1:8080", "auth": "user1:pass1"}
         proxy_manager_mock.get_proxy.return_value = test_proxy
@@ -264,8 +374,9 @@ class TestTradingSession(unittest.TestCase):
         )
 
         # Verify each trade used the correct proxy
-        for call in transaction_manager_mock.execute_trade.call_args_list:
-            _, _, _, _, proxy = call.args
+        order_args = batch_order_args(transaction_manager_mock.execute_batch)
+        self.assertEqual(len(order_args), len(mock_wallets))
+        for _, _, _, _, proxy in order_args:
             self.assertEqual(
                 proxy, test_proxy,
                 "Each trade should use the configured test proxy"
@@ -280,3 +391,1469 @@ class TestTradingSession(unittest.TestCase):
             ]
         )
         self.assertEqual(mock_random_randint.call_count, 2)
+
+
+class TestRuntimeStartup(unittest.TestCase):
+
+    def test_import_has_no_side_effects(self):
+        """
+        Test that importing the modules creates no files
+        and does not pull in NumPy, requests or Selenium.
+        """
+        with tempfile.TemporaryDirectory() as temp_dir:
+            code = (
+                "import sys\n"
+                f"sys.path.insert(0, {REPO_DIR!r})\n"
+                "import config, crypto_trading_bot, trading_ui_automation\n"
+                "assert 'numpy' not in sys.modules\n"
+                "assert 'requests' not in sys.modules\n"
+                "assert 'selenium' not in sys.modules\n"
+            )
+            subprocess.run(
+                [sys.executable, "-c", code], cwd=temp_dir, check=True
+            )
+            self.assertEqual(os.listdir(temp_dir), [])
+
+
+class TestPositionBook(unittest.TestCase):
+
+    def setUp(self):
+        self.book = PositionBook(["BTC", "ETH"], capacity=2)
+
+    def test_fills_are_netted_in_order(self):
+        """
+        Test that same-side fills average the entry and opposite
+        fills reduce, realize PnL and flip the position.
+        """
+        self.book.apply_fills(
+            ["w1", "w1", "w1", "w2"],
+            ["BTC", "BTC", "BTC", "ETH"],
+            ["long", "long", "short", "short"],
+            [100.0, 200.0, 450.0, 50.0],
+            [10.0, 20.0, 30.0, 5.0],
+            [5, 10, 3, 2],
+        )
+
+        btc = self.book.position("w1", "BTC")
+        self.assertEqual(btc["side"], LONG)
+        self.assertAlmostEqual(btc["size"], 5.0)
+        self.assertAlmostEqual(btc["entry"], 15.0)
+        self.assertAlmostEqual(btc["realized_pnl"], 225.0)
+        self.assertEqual(btc["leverage"], 10)
+
+        self.book.apply_fills(["w1"], ["BTC"], ["short"], [300.0], [30.0], [4])
+        btc = self.book.position("w1", "BTC")
+        self.assertEqual(btc["side"], SHORT)
+        self.assertAlmostEqual(btc["size"], 5.0)
+        self.assertAlmostEqual(btc["entry"], 30.0)
+        self.assertEqual(btc["leverage"], 4)
+        self.assertEqual(len(self.book), 2)
+
+    def test_mark_against_price_vector(self):
+        """
+        Test unrealized PnL and liquidation math for long and short rows.
+        """
+        self.book.apply_fills(
+            ["w1", "w2"], ["BTC", "ETH"], ["long", "short"],
+            [1000.0, 1000.0], [100.0, 100.0], [10, 10],
+        )
+        marked = self.book.mark(self.book.price_vector({"BTC": 110.0, "ETH": 95.0}))
+
+        self.assertEqual(list(marked["unrealized_pnl"]), [100.0, 50.0])
+        self.assertAlmostEqual(marked["liquidation_price"][0], 90.5)
+        self.assertAlmostEqual(marked["liquidation_price"][1], 109.5)
+        self.assertAlmostEqual(marked["liquidation_distance"][0], 19.5 / 110.0)
+        self.assertAlmostEqual(marked["liquidation_distance"][1], 14.5 / 95.0)
+        self.assertEqual(list(self.book.margin_by_wallet()), [100.0, 100.0])
+
+    def test_session_books_fills(self):
+        """
+        Test that a session nets every fill into its book, including fills
+        of assets added by a settings reload.
+        """
+        run_in_temp_dir(self)
+        keys_file, proxy_file = loadtest.write_synthetic_inputs(os.getcwd(), 20, 2)
+        session = TradingSession({
+            "keys_file": keys_file,
+            "proxy_file": proxy_file,
+            "launch_delay": (0, 0),
+            "enable_logs": False,
+            "trading_assets": ["BTC"],
+            "position_direction": "long",
+            "volume_percentage_range": (10, 10),
+            "max_parallel_branches": 10,
+        })
+        session.transaction_manager.backend = SimulatedBackend(latency_range=(0, 0))
+        session.run_session("branch")
+        session.apply_settings({"trading_assets": ["SOL"]})
+        session.run_session("parallel")
+
+        fills = [result for result in session.results.recent if result.success]
+        self.assertEqual(session.status()["open_positions"], len(fills))
+        for result in fills:
+            position = session.positions.position(result.wallet, asset_name(result.asset))
+            self.assertEqual(position["side"], Direction(result.direction))
+            self.assertAlmostEqual(position["size"], result.size)
+            self.assertEqual(position["leverage"], session.settings.leverage)
+
+
+class TestBalanceSizing(unittest.TestCase):
+
+    def test_balances_are_fetched_in_bulk_and_invalidated(self):
+        """
+        Test that a batch of wallets costs one balance request
+        and that only invalidated wallets are fetched again.
+        """
+        fetch = MagicMock(side_effect=mock_balances)
+        cache = BalanceCache(fetch, ttl=60)
+
+        cache.prefetch(["w1", "w2", "w3"])
+        self.assertEqual(cache.get("w2"), 100.0)
+        fetch.assert_called_once_with(["w1", "w2", "w3"])
+
+        cache.invalidate("w2")
+        cache.prefetch(["w1", "w2", "w3"])
+        self.assertEqual(fetch.call_count, 2)
+        fetch.assert_called_with(["w2"])
+
+    def test_trade_rejected_above_backend_balance(self):
+        """
+        Test that the simulated backend rejects orders
+        larger than the wallet balance and debits filled ones.
+        """
+        backend = SimulatedBackend(starting_balance=100.0, latency_range=(0, 0))
+        manager = TransactionManager(backend)
+        wallet = "0x" + "ab" * 32
+
+        result = manager.execute_trade(wallet, "BTC", "long", 60.0, {})
+        self.assertEqual(result.status, TradeStatus.SUCCESS)
+
+        result = manager.execute_trade(wallet, "BTC", "long", 60.0, {})
+        self.assertEqual(result.status, TradeStatus.FAILED)
+        self.assertEqual(result.error, "Insufficient balance")
+        self.assertEqual(manager.get_balances([wallet]), {wallet: 40.0})
+
+    def test_batch_costs_one_round_trip_with_partial_failure(self):
+        """
+        Test that a batch is one backend request and that a rejected
+        order does not fail the rest of the batch.
+        """
+        backend = SimulatedBackend(starting_balance=100.0, latency_range=(0, 0))
+        manager = TransactionManager(backend)
+        wallets = ["0x" + str(i) * 64 for i in range(1, 4)]
+        orders = [
+            {"wallet_key": wallet, "asset": "BTC", "direction": "long",
+             "size": size, "proxy": {}}
+            for wallet, size in zip(wallets, [50.0, 150.0, 80.0])
+        ]
+
+        results = manager.execute_batch(orders)
+
+        self.assertEqual(backend.request_count, 1)
+        self.assertEqual(
+            [result.success for result in results], [True, False, True]
+        )
+        self.assertEqual(results[1].error, "Insufficient balance")
+        self.assertEqual(len({result.tx_id for result in results}), 3)
+
+    def test_batch_order_without_id_fails_alone(self):
+        """
+        Test that an order whose transaction ID cannot be generated
+        fails without being sent and without failing the batch.
+        """
+        backend = SimulatedBackend(starting_balance=100.0, latency_range=(0, 0))
+        manager = TransactionManager(backend)
+        wallets = ["0x" + str(i) * 64 for i in range(1, 3)]
+        orders = [
+            {"wallet_key": wallet, "asset": "BTC", "direction": "long",
+             "size": 10.0, "proxy": {}}
+            for wallet in wallets
+        ]
+
+        with patch.object(
+            manager.id_generator, "next_id", side_effect=[RuntimeError("no id"), 42]
+        ):
+            results = manager.execute_batch(orders)
+
+        self.assertEqual([result.success for result in results], [False, True])
+        self.assertEqual(results[0].error, "no id")
+        self.assertEqual(results[1].tx_id, 42)
+        self.assertEqual(
+            manager.get_balances(wallets), {wallets[0]: 100.0, wallets[1]: 90.0}
+        )
+
+
+class TestReporting(unittest.TestCase):
+
+    def setUp(self):
+        run_in_temp_dir(self)
+        with open("old.csv", "w") as f:
+            f.write(
+                "timestamp,wallet,asset,direction,size,status,transaction_hash,error\n"
+                "2025-02-17T15:46:28,0xaa,BTC,long,10.0,success,tx_1,\n"
+                "2025-02-17T15:46:29,0xbb,BTC,short,5.0,failed,tx_2,Insufficient balance\n"
+            )
+        with open("new.csv", "w") as f:
+            f.write(
+                "timestamp,wallet,direction,size,status,active_branches,"
+                "thread_count,transaction_hash,error\n"
+                "2025-02-18T10:00:00,0xaa,long,20.0,success,1,10,tx_3,\n"
+            )
+        with open("trading_2_20250218.txt", "w") as f:
+            f.write(
+                "2025-02-18 10:00:01,000 - Executing trade: tx_4 for 0xcc - long 4.0 of ETH\n"
+                "2025-02-18 10:00:02,000 - Trade executed successfully: tx_4\n"
+                "2025-02-18 10:00:03,000 - Executing trade: tx_5 for 0xdd - short 6.0 of ETH\n"
+                "2025-02-18 10:00:04,000 - Trade failed for 0xdd: Backend error\n"
+            )
+        self.paths = ["old.csv", "new.csv", "trading_2_20250218.txt"]
+
+    def test_report_normalizes_schemas_and_uses_cache(self):
+        """
+        Test aggregates across schema versions and logs, and that
+        a re-run reads no unchanged files.
+        """
+        report = reporting.build_report(self.paths, "cache.json", chunk_size=1)
+        rows = {(row["day"], row["asset"]): row for row in report}
+
+        self.assertEqual(rows[("2025-02-17", "BTC")]["trades"], 2)
+        self.assertEqual(rows[("2025-02-17", "BTC")]["success_rate"], 0.5)
+        self.assertEqual(rows[("2025-02-18", "unknown")]["volume"], 20.0)
+        self.assertEqual(rows[("2025-02-18", "ETH")]["trades"], 2)
+        self.assertEqual(rows[("2025-02-18", "ETH")]["successes"], 1)
+
+        with patch("reporting.aggregate_file") as aggregate_mock:
+            self.assertEqual(reporting.build_report(self.paths, "cache.json"), report)
+            aggregate_mock.assert_not_called()
+
+    def test_session_log_with_csv_is_not_counted_twice(self):
+        """
+        Test that a session's log is skipped while its results CSV is
+        reported, and that legacy logs in the working directory are found.
+        """
+        os.makedirs("trade_results")
+        os.makedirs("logs")
+        csv_path = os.path.join("trade_results", "trade_results_20250219_100000.csv")
+        with open(csv_path, "w") as f:
+            f.write(
+                "timestamp,wallet,asset,direction,size,status,"
+                "active_branches,thread_count,transaction_hash,error\n"
+                "2025-02-19T10:00:01,0xaa,SOL,long,3.0,success,0,10,tx_10,\n"
+                "2025-02-19T10:00:02,0xbb,SOL,short,3.0,success,0,10,tx_11,\n"
+            )
+        log_path = os.path.join("logs", "trading_2_20250219_100000.txt")
+        with open(log_path, "w") as f:
+            for tx_id, wallet in (("tx_11", "0xbb"), ("tx_10", "0xaa")):
+                f.write(
+                    f"2025-02-19 10:00:01,000 - INFO - Executing trade: {tx_id} "
+                    f"for {wallet} - long 3.0 of SOL\n"
+                    f"2025-02-19 10:00:02,000 - INFO - Trade executed "
+                    f"successfully: {tx_id}\n"
+                )
+
+        paths = reporting.find_input_files(
+            reporting.DEFAULT_RESULT_GLOB, reporting.DEFAULT_LOG_GLOBS
+        )
+        self.assertEqual(paths, [csv_path, log_path, "trading_2_20250218.txt"])
+        rows = {
+            (row["day"], row["asset"]): row
+            for row in reporting.build_report(paths, "cache.json")
+        }
+        self.assertEqual(rows[("2025-02-19", "SOL")]["trades"], 2)
+        self.assertEqual(rows[("2025-02-18", "ETH")]["trades"], 2)
+
+        # Without its CSV, the session is reported from its log
+        os.remove(csv_path)
+        paths.remove(csv_path)
+        rows = {
+            (row["day"], row["asset"]): row
+            for row in reporting.build_report(paths, "cache.json")
+        }
+        self.assertEqual(rows[("2025-02-19", "SOL")]["trades"], 2)
+        self.assertEqual(rows[("2025-02-19", "SOL")]["volume"], 6.0)
+
+
+class TestTransactionIds(unittest.TestCase):
+
+    def test_ids_unique_and_ordered_across_threads(self):
+        """
+        Test that more concurrent threads than lanes never produce
+        duplicate IDs and that each thread's IDs are strictly increasing.
+        """
+        generator = TransactionIdGenerator(process_id=7)
+        per_thread = []
+
+        def generate():
+            per_thread.append([generator.next_tx_id() for _ in range(5000)])
+
+        # More threads than ID lanes
+        threads = [threading.Thread(target=generate) for _ in range(40)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        all_ids = [tx_id for ids in per_thread for tx_id in ids]
+        self.assertEqual(len(set(all_ids)), len(all_ids))
+        for ids in per_thread:
+            self.assertEqual(ids, sorted(ids))
+            self.assertEqual(
+                [parse_tx_id(tx_id) for tx_id in ids],
+                sorted(parse_tx_id(tx_id) for tx_id in ids),
+            )
+        self.assertEqual(decode_tx_id(all_ids[0])["process_id"], 7)
+
+    def test_sequence_overflow_borrows_next_millisecond(self):
+        """
+        Test that more than 4096 IDs in one millisecond stay unique.
+        """
+        generator = TransactionIdGenerator(process_id=1)
+        with patch("tx_ids.time.time", return_value=1767225600.0):
+            ids = [generator.next_tx_id() for _ in range(5000)]
+
+        self.assertEqual(ids, sorted(set(ids)))
+        self.assertEqual(decode_tx_id(ids[0])["timestamp_ms"], 1767225600000)
+        self.assertEqual(decode_tx_id(ids[-1])["timestamp_ms"], 1767225600001)
+
+    def test_process_ids_claimed_per_live_process(self):
+        """
+        Test that a process skips numbers live processes hold, takes over
+        those of exited processes, and falls back to its PID with a warning.
+        """
+        run_in_temp_dir(self)
+        exited = subprocess.Popen([sys.executable, "-c", "pass"])
+        exited.wait()
+        with open("0", "w") as f:
+            f.write(str(os.getppid()))
+        with open("1", "w") as f:
+            f.write(str(exited.pid))
+
+        self.assertEqual(tx_ids.allocate_process_id(6, os.getcwd()), 1)
+        with open("1") as f:
+            self.assertEqual(f.read(), str(os.getpid()))
+        self.assertEqual(tx_ids.allocate_process_id(1, os.getcwd()), None)
+
+        with patch.dict(tx_ids._claimed, clear=True), \
+                patch("tx_ids.allocate_process_id", return_value=None), \
+                self.assertLogs("trading_bot", level="WARNING"):
+            generator = TransactionIdGenerator()
+        self.assertEqual(generator.process_id, os.getpid() % 64)
+
+
+class TestLoadTest(unittest.TestCase):
+
+    @patch("crypto_trading_bot.time.sleep", return_value=None)
+    def test_every_mode_trades_against_simulator(self, mock_sleep):
+        """
+        Test that the load test drives every execution mode
+        and reports throughput and latency figures.
+        """
+        results = loadtest.run_loadtest(
+            wallet_count=40, proxy_count=5, latency_range=(0, 0),
+            error_rate=0.0, isolate=False,
+        )
+
+        self.assertEqual([r["mode"] for r in results], loadtest.EXECUTION_MODES)
+        for result in results:
+            self.assertGreater(result["trades"], 0)
+            self.assertEqual(result["failed"], 0)
+            self.assertGreater(result["trades_per_s"], 0)
+            self.assertIn("latency_p99_ms", result)
+        # Orders sent by forked workers are counted too
+        self.assertEqual(results[-1]["mode"], "process")
+        self.assertEqual(results[-1]["trades"], 40)
+        self.assertGreater(results[-1]["requests"], 40)
+
+    @patch("crypto_trading_bot.time.sleep", return_value=None)
+    def test_process_mode_counts_worker_cpu(self, mock_sleep):
+        """
+        Test that process-mode CPU time includes the joined workers.
+        """
+        with patch("loadtest.children_cpu_s", side_effect=[1.0, 6.0]):
+            result = loadtest.run_mode("process", 20, 5, (0, 0), 0.0)
+
+        self.assertEqual(result["trades"], 20)
+        self.assertGreaterEqual(result["cpu_s"], 5.0)
+
+
+class TestTradeResults(unittest.TestCase):
+
+    def test_result_formatted_at_sink(self):
+        """
+        Test that a compact result formats to the CSV row schema.
+        """
+        result = TradeResult(
+            TradeStatus.SUCCESS, "0xabc", asset_code("ETH"),
+            Direction.SHORT, 12.5, tx_id=255, timestamp=0.0,
+        )
+        row = result.to_row(active_branches=2, thread_count=10)
+
+        self.assertEqual(row["asset"], "ETH")
+        self.assertEqual(row["direction"], "short")
+        self.assertEqual(row["status"], "success")
+        self.assertEqual(row["transaction_hash"], "tx_00000000000000ff")
+        self.assertFalse(hasattr(result, "__dict__"))
+
+    def test_buffer_memory_is_bounded(self):
+        """
+        Test that the result buffer keeps totals but only recent records.
+        """
+        buffer = ResultBuffer(capacity=10)
+        for i in range(1000):
+            status = TradeStatus.SUCCESS if i % 2 else TradeStatus.FAILED
+            buffer.append(
+                TradeResult(status, "0xabc", asset_code("BTC"), Direction.LONG, 1.0)
+            )
+
+        self.assertEqual(len(buffer.recent), 10)
+        self.assertEqual((buffer.total, buffer.succeeded, buffer.failed), (1000, 500, 500))
+        self.assertEqual(buffer.volume, 500.0)
+
+
+class TestSettings(unittest.TestCase):
+
+    def test_invalid_settings_rejected(self):
+        """
+        Test that compiling reports every invalid setting.
+        """
+        with self.assertRaises(ValueError) as context:
+            compile_settings({
+                "branch_wallet_range": (1, 3),
+                "position_direction": "sideways",
+            })
+
+        self.assertIn("branch_wallet_range", str(context.exception))
+        self.assertIn("position_direction", str(context.exception))
+        self.assertEqual(compile_settings({}).trading_assets, ("BTC", "ETH", "SOL"))
+
+    @patch("crypto_trading_bot.time.sleep", return_value=None)
+    def test_reload_applies_to_running_session(self, mock_sleep):
+        """
+        Test that reloaded limits and assets reach the session,
+        while settings that need a restart are ignored.
+        """
+        run_in_temp_dir(self)
+        config = {
+            "keys_file": os.path.join(REPO_DIR, "wallet_keys.txt"),
+            "proxy_file": os.path.join(REPO_DIR, "proxies.txt"),
+            "branch_wallet_range": (2, 2),
+            "max_parallel_branches": 5,
+            "trading_assets": ["BTC"],
+            "enable_logs": False,
+        }
+        session = TradingSession(config)
+        session.wallet_manager = MagicMock(wallets=["w1", "w2", "w3", "w4"])
+        session.proxy_manager = MagicMock()
+        session.transaction_manager = MagicMock()
+        session.transaction_manager.get_balances.side_effect = mock_balances
+        session.transaction_manager.execute_batch.side_effect = mock_batch_results
+
+        with open("settings.json", "w") as f:
+            f.write('{"max_parallel_branches": 1, "trading_assets": ["ETH"], '
+                    '"keys_file": "other.txt"}')
+        reloader = SettingsReloader("settings.json", session.apply_settings)
+        self.assertTrue(reloader.reload())
+
+        self.assertEqual(session.settings.keys_file, config["keys_file"])
+        session.run_session("branch")
+        self.assertEqual(session.transaction_manager.execute_batch.call_count, 1)
+        orders = batch_order_args(session.transaction_manager.execute_batch)
+        self.assertEqual({order[1] for order in orders}, {"ETH"})
+
+        with open("settings.json", "w") as f:
+            f.write('{"thread_count": 0}')
+        self.assertFalse(reloader.reload())
+        self.assertEqual(session.settings.max_parallel_branches, 1)
+
+
+class TestReplay(unittest.TestCase):
+
+    def test_replay_is_deterministic(self):
+        """
+        Test that replaying a results CSV with the same seed reproduces
+        every outcome, and that the diff reports no changes.
+        """
+        run_in_temp_dir(self)
+        with open("trade_results.csv", "w") as f:
+            f.write("timestamp,wallet,asset,direction,size,status,"
+                    "active_branches,thread_count,transaction_hash,error\n")
+            for i in range(30):
+                size = 20000 if i % 10 == 0 else 100
+                f.write(f"2026-01-01T10:00:{i:02d},0x{i:064x},BTC,long,"
+                        f"{size},success,1,10,,\n")
+
+        trades = replay.load_trades("trade_results.csv")
+        self.assertEqual(len(trades), 30)
+        profiles = []
+        for _ in range(2):
+            backend = SimulatedBackend(latency_range=(0, 0), error_rate=0.2, seed=3)
+            profiles.append(
+                replay.replay(trades, TransactionManager(backend=backend))
+            )
+
+        diff = replay.diff_profiles(*profiles)
+        self.assertEqual(diff["changed_outcomes"], 0)
+        self.assertEqual(profiles[0]["outcomes"], profiles[1]["outcomes"])
+        # Oversized trades fail against the simulated balance
+        self.assertEqual(profiles[0]["outcomes"][0], "F")
+
+        recorded = replay.recorded_profile(trades)
+        diff = replay.diff_profiles(recorded, profiles[0])
+        self.assertEqual(diff["metrics"]["success_rate"]["baseline"], 1.0)
+        self.assertLess(diff["metrics"]["success_rate"]["delta"], 0)
+        self.assertIsNone(diff["metrics"]["latency_p95_ms"]["baseline"])
+
+
+class TestAdaptiveConcurrency(unittest.TestCase):
+
+    def test_additive_increase_multiplicative_decrease(self):
+        """
+        Test that the limit grows while p95 latency meets the target
+        and halves once per burst of errors.
+        """
+        limiter = AdaptiveConcurrencyLimiter(
+            initial_limit=4, max_limit=8, latency_target=1.0, window=5
+        )
+        for _ in range(10):
+            limiter.acquire()
+            limiter.release(0.1)
+        self.assertEqual(limiter.limit, 6)
+
+        # Slow but successful trades hold the limit
+        for _ in range(5):
+            limiter.acquire()
+            limiter.release(2.0)
+        self.assertEqual(limiter.limit, 6)
+
+        # Three trades in flight fail together: a single cut
+        for _ in range(3):
+            limiter.acquire()
+        for _ in range(3):
+            limiter.release(0.1, success=False)
+        self.assertEqual(limiter.limit, 3)
+
+        # A timeout counts as a failure
+        limiter.acquire()
+        limiter.release(60.0)
+        metrics = limiter.metrics()
+        self.assertEqual(metrics["concurrency_limit"], 1)
+        self.assertEqual(metrics["concurrency_peak"], 6)
+        self.assertEqual((metrics["errors"], metrics["timeouts"]), (3, 1))
+
+    def test_only_backend_failures_cut_the_limit(self):
+        """
+        Test that orders refused for insufficient balance leave the limit
+        alone while backend errors cut it.
+        """
+        run_in_temp_dir(self)
+        keys_file, proxy_file = loadtest.write_synthetic_inputs(os.getcwd(), 40, 4)
+        cuts = {}
+        for error in ("Insufficient balance", "Backend error"):
+            session = TradingSession({
+                "keys_file": keys_file,
+                "proxy_file": proxy_file,
+                "launch_delay": (0, 0),
+                "enable_logs": False,
+                "thread_count": 8,
+            })
+            backend = SimulatedBackend(latency_range=(0, 0))
+            session.transaction_manager.backend = backend
+            with patch.object(
+                backend, "submit_order",
+                return_value={"status": "failed", "error": error},
+            ):
+                session.run_session("parallel")
+            self.assertEqual(session.results.failed, 40)
+            cuts[error] = session.concurrency.decreases
+        self.assertEqual(cuts["Insufficient balance"], 0)
+        self.assertGreater(cuts["Backend error"], 0)
+
+    def test_reload_resizes_limiter(self):
+        """
+        Test that reloaded concurrency bounds and thread_count reach
+        the running limiter.
+        """
+        run_in_temp_dir(self)
+        session = TradingSession({
+            "keys_file": os.path.join(REPO_DIR, "wallet_keys.txt"),
+            "proxy_file": os.path.join(REPO_DIR, "proxies.txt"),
+            "enable_logs": False,
+            "thread_count": 10,
+        })
+        session.concurrency = AdaptiveConcurrencyLimiter(
+            initial_limit=10, max_limit=16
+        )
+
+        session.apply_settings({"concurrency_max": 8})
+        limiter = session.concurrency
+        self.assertEqual((limiter.limit, limiter.max_limit), (8, 8))
+        session.apply_settings({"concurrency_max": 64, "concurrency_min": 4})
+        self.assertEqual((limiter.limit, limiter.min_limit), (8, 4))
+        session.apply_settings({"thread_count": 40})
+        self.assertEqual(limiter.limit, 40)
+
+
+class TestStatusEndpoint(unittest.TestCase):
+
+    def test_pause_resume_drain(self):
+        """
+        Test that the endpoint reports live state and that pause, resume
+        and drain control a running session.
+        """
+        run_in_temp_dir(self)
+        keys_file, proxy_file = loadtest.write_synthetic_inputs(os.getcwd(), 200, 5)
+        session = TradingSession({
+            "keys_file": keys_file,
+            "proxy_file": proxy_file,
+            "launch_delay": (0, 0),
+            "thread_count": 4,
+            "enable_logs": False,
+            # Pinned proxy state: all 5 proxies are kept and wallets trade
+            # in file order, so the first 5 trades use every proxy
+            "proxy_preflight": False,
+            "proxy_assignment": "modulo",
+            "enable_shuffling": False,
+        })
+        backend = SimulatedBackend(latency_range=(0.01, 0.01))
+        session.transaction_manager.backend = backend
+        server = session.start_status_server(port=0)
+        self.addCleanup(server.stop)
+        url = f"http://127.0.0.1:{server.port}"
+
+        def request(path, method="GET"):
+            with urllib.request.urlopen(
+                urllib.request.Request(url + path, method=method)
+            ) as response:
+                return json.load(response)
+
+        self.assertEqual(request("/pause", "POST")["state"], "paused")
+        runner = threading.Thread(target=session.run_session, args=("parallel",))
+        runner.start()
+        time.sleep(0.1)
+        self.assertEqual(request("/status")["trades"]["completed"], 0)
+
+        request("/resume", "POST")
+        deadline = time.monotonic() + 5
+        while request("/status")["trades"]["completed"] < 10:
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.01)
+        request("/drain", "POST")
+        runner.join(timeout=5)
+        self.assertFalse(runner.is_alive())
+
+        status = request("/status")
+        self.assertEqual(status["state"], "draining")
+        self.assertLess(status["trades"]["completed"], 200)
+        self.assertEqual(status["trades"]["in_flight"], 0)
+        self.assertEqual(status["trades"]["queued"], 0)
+        self.assertEqual(len(status["proxies"]), 5)
+        self.assertGreater(status["throughput_per_s"], 0)
+
+
+class TestExposure(unittest.TestCase):
+
+    def test_index_tracks_net_exposure(self):
+        """
+        Test net exposure per asset and branch, and the gating rule.
+        """
+        index = ExposureIndex()
+        btc = asset_code("BTC")
+        index.record_fill(btc, Direction.LONG, 100.0, branch=0)
+        index.record_fill(btc, Direction.SHORT, 60.0, branch=0)
+        index.record_fill(btc, Direction.LONG, 50.0, branch=1)
+        index.record_fill(btc, Direction.SHORT, 50.0, branch=1)
+
+        self.assertEqual(index.net("BTC"), 40.0)
+        self.assertAlmostEqual(index.by_asset()["BTC"]["imbalance"], 40.0 / 260.0)
+        self.assertEqual(index.branch(0)["net"], 40.0)
+        self.assertEqual(index.unbalanced_branches(), [0])
+
+        self.assertTrue(index.allows("BTC", 10.0, limit=50.0))
+        self.assertFalse(index.allows("BTC", 20.0, limit=50.0))
+        # Reducing the imbalance is always allowed
+        self.assertTrue(index.allows("BTC", -10.0, limit=0.0))
+        self.assertEqual(index.rejected, 1)
+
+    @patch("crypto_trading_bot.time.sleep", return_value=None)
+    def test_session_gates_and_balances_legs(self, mock_sleep):
+        """
+        Test that branch legs share one asset, across runs too, and that
+        orders over the net exposure limit are skipped.
+        """
+        run_in_temp_dir(self)
+        keys_file, proxy_file = loadtest.write_synthetic_inputs(os.getcwd(), 20, 2)
+        config = {
+            "keys_file": keys_file,
+            "proxy_file": proxy_file,
+            "launch_delay": (0, 0),
+            "trading_assets": ["BTC", "ETH", "SOL"],
+            "volume_percentage_range": (10, 10),
+            "max_parallel_branches": 10,
+            "enable_logs": False,
+        }
+        session = TradingSession(config)
+        session.transaction_manager.backend = SimulatedBackend(latency_range=(0, 0))
+        session.run_session("branch")
+        first_run = session.active_branches
+        session.run_session("branch")
+
+        # A second run's branches get new IDs instead of adding to the first's
+        for branch in range(first_run + session.active_branches):
+            self.assertAlmostEqual(session.exposure.branch(branch)["net"], 0.0)
+        self.assertIsNone(session.exposure.branch(first_run + session.active_branches))
+        self.assertEqual(session.exposure.unbalanced_branches(), [])
+
+        session = TradingSession(dict(
+            config,
+            trading_assets=["BTC"],
+            position_direction="long",
+            max_net_exposure=2500,
+            thread_count=1,
+            concurrency_max=1,
+        ))
+        session.transaction_manager.backend = SimulatedBackend(latency_range=(0, 0))
+        session.run_session("parallel")
+
+        self.assertEqual(session.exposure.net("BTC"), 2000.0)
+        self.assertEqual(session.exposure.rejected, 18)
+
+    def test_concurrent_orders_reserve_exposure(self):
+        """
+        Test that orders in flight at the same time cannot together
+        exceed the net exposure limit.
+        """
+        run_in_temp_dir(self)
+        keys_file, proxy_file = loadtest.write_synthetic_inputs(os.getcwd(), 40, 4)
+        session = TradingSession({
+            "keys_file": keys_file,
+            "proxy_file": proxy_file,
+            "launch_delay": (0, 0),
+            "trading_assets": ["BTC"],
+            "position_direction": "long",
+            "volume_percentage_range": (10, 10),
+            "max_net_exposure": 5000,
+            "thread_count": 16,
+            "concurrency_max": 16,
+            "enable_logs": False,
+        })
+        # Orders overlap while they wait on the backend
+        session.transaction_manager.backend = SimulatedBackend(
+            latency_range=(0.02, 0.02)
+        )
+        session.run_session("parallel")
+
+        self.assertEqual(session.exposure.net("BTC"), 5000.0)
+        self.assertEqual(session.exposure.rejected, 35)
+        self.assertEqual(session.exposure.reserved("BTC"), 0.0)
+
+
+class TestLogRotation(unittest.TestCase):
+
+    def test_rotates_compresses_and_prunes(self):
+        """
+        Test that full segments are gzipped in the background,
+        retention keeps the newest ones and reporting reads them.
+        """
+        run_in_temp_dir(self)
+        handler = CompressingRotatingFileHandler(
+            "trading_5_20260101_000000.txt", max_bytes=200, max_age=None, backup_count=3
+        )
+        handler.setFormatter(logging.Formatter("%(asctime)s - %(message)s"))
+        test_logger = logging.getLogger("trading_bot.rotation_test")
+        test_logger.propagate = False
+        test_logger.addHandler(handler)
+        self.addCleanup(handler.close)
+        self.addCleanup(test_logger.removeHandler, handler)
+
+        for i in range(40):
+            test_logger.warning(
+                "Executing trade: tx_%016x for 0xabc - long 10.0 of BTC", i + 1
+            )
+            test_logger.warning("Trade executed successfully: tx_%016x", i + 1)
+        wait_for_compression()
+
+        archives = glob.glob("trading_5_20260101_000000.txt.*.gz")
+        self.assertEqual(len(archives), 3)
+        self.assertEqual(glob.glob("trading_5_20260101_000000.txt.*[0-9]"), [])
+        with gzip.open(archives[0], "rt") as f:
+            self.assertIn("Executing trade", f.read())
+        self.assertLess(os.path.getsize("trading_5_20260101_000000.txt"), 400)
+
+        records = list(reporting.iter_trade_records(archives[0]))
+        self.assertTrue(records)
+        self.assertEqual(records[0]["status"], "success")
+
+    def test_rotates_by_age(self):
+        """
+        Test that a segment older than max_age is rotated on the next record.
+        """
+        run_in_temp_dir(self)
+        handler = CompressingRotatingFileHandler("general.log", max_bytes=0, max_age=60)
+        self.addCleanup(handler.close)
+        record = logging.LogRecord("t", logging.INFO, __file__, 0, "message", None, None)
+        handler.emit(record)
+        self.assertFalse(handler.shouldRollover(record))
+
+        handler._opened_at -= 61
+        handler.emit(record)
+        wait_for_compression()
+        self.assertEqual(len(glob.glob("general.log.*.gz")), 1)
+
+
+class TestProxyPreflight(unittest.TestCase):
+
+    def listener(self, backlog_full=False):
+        """
+        Local proxy stand-in; with a full backlog, connections hang
+        like a dead proxy's.
+        """
+        listener = socket.socket()
+        listener.bind(("127.0.0.1", 0))
+        listener.listen(0)
+        self.addCleanup(listener.close)
+        if backlog_full:
+            filler = socket.create_connection(listener.getsockname(), timeout=1)
+            self.addCleanup(filler.close)
+        return "127.0.0.1:%d" % listener.getsockname()[1]
+
+    def test_preflight_excludes_unreachable_proxies(self):
+        """
+        Test that malformed lines are skipped, and that pre-flight keeps
+        listening proxies with their latency and drops the rest within
+        about one timeout.
+        """
+        run_in_temp_dir(self)
+        live = [self.listener(), self.listener()]
+        hanging = [self.listener(backlog_full=True) for _ in range(20)]
+        # Bound but not listening: connections are refused
+        closed = socket.socket()
+        closed.bind(("127.0.0.1", 0))
+        self.addCleanup(closed.close)
+        refused = "127.0.0.1:%d" % closed.getsockname()[1]
+
+        with open("proxies.txt", "w") as f:
+            f.write(f"{live[0]}@user:pass\n\nnot-a-proxy\n{refused}@user:pass\n")
+            for address in hanging:
+                f.write(f"{address}@user:pass\n")
+            f.write(f"{live[1]}@user:pass|http://127.0.0.1/refresh\n")
+
+        manager = ProxyManager("proxies.txt")
+        self.assertEqual(len(manager.proxies), 23)
+
+        started = time.monotonic()
+        dropped = manager.preflight(timeout=0.5, max_parallel=64)
+        self.assertLess(time.monotonic() - started, 1.0)
+
+        self.assertEqual(dropped, 21)
+        self.assertEqual([proxy["ip_port"] for proxy in manager.proxies], live)
+        self.assertEqual(sorted(manager.latencies), sorted(live))
+
+
+class TestTracing(unittest.TestCase):
+
+    def test_span_trees(self):
+        """
+        Test that sampled trades and branches export one span tree each,
+        with the backend stages nested under the right parents, and that
+        nothing is exported at sample rate 0.
+        """
+        run_in_temp_dir(self)
+        self.addCleanup(tracing.configure, 0.0)
+        keys_file, proxy_file = loadtest.write_synthetic_inputs(os.getcwd(), 20, 4)
+        session = TradingSession({
+            "keys_file": keys_file,
+            "proxy_file": proxy_file,
+            "launch_delay": (0, 0),
+            "enable_logs": False,
+            "trace_sample_rate": 1.0,
+            "trace_file": os.path.join("logs", "traces.jsonl"),
+        })
+        session.transaction_manager.backend = SimulatedBackend(latency_range=(0, 0))
+        exporter = tracing.InMemoryExporter()
+        tracing.tracer.exporter = exporter
+
+        session.run_session("parallel")
+        wallets = session.wallet_manager.wallets[:4]
+        session._process_branch(wallets, 2, 2, branch=1)
+
+        traces = {}
+        for span in exporter.spans:
+            traces.setdefault(span["trace_id"], []).append(span)
+        self.assertEqual(len(traces), 21)
+        for spans in traces.values():
+            by_id = {span["span_id"]: span for span in spans}
+            roots = [span for span in spans if span["parent_id"] is None]
+            self.assertEqual(len(roots), 1)
+            for span in spans:
+                if span["parent_id"] is not None:
+                    self.assertIn(span["parent_id"], by_id)
+            names = {span["name"] for span in spans}
+            if roots[0]["name"] == "trade":
+                self.assertIn("execute_trade", names)
+                self.assertEqual(
+                    by_id[next(s for s in spans if s["name"] == "sign")["parent_id"]]
+                    ["name"], "execute_trade",
+                )
+            else:
+                self.assertEqual(roots[0]["name"], "branch")
+                self.assertEqual(roots[0]["legs"], 4)
+                self.assertIn("submit_batch", names)
+                self.assertEqual(
+                    sum(1 for span in spans if span["name"] == "get_proxy"), 4
+                )
+
+        tracing.tracer.sample_rate = 0.0
+        exported = len(exporter.spans)
+        session._process_branch(wallets, 2, 2, branch=2)
+        self.assertEqual(len(exporter.spans), exported)
+
+
+class TestProcessMode(unittest.TestCase):
+
+    def test_ring_round_trip(self):
+        """
+        Test that records written by a forked process come back intact and
+        in order, including after the ring wraps around while full.
+        """
+        ring = ResultRing(capacity=8)
+        self.addCleanup(ring.close)
+        wallets = [f"0x{i:064x}" for i in range(50)]
+        btc = asset_code("BTC")
+
+        def produce():
+            for i in range(50):
+                if i % 2:
+                    result = TradeResult(
+                        TradeStatus.FAILED, wallets[i], btc, Direction.SHORT, i / 2,
+                        tx_id=i + 1, error="Insufficient balance",
+                    )
+                else:
+                    result = TradeResult(
+                        TradeStatus.SUCCESS, wallets[i], btc, Direction.LONG, i / 2,
+                        tx_id=i + 1, signature=bytes([i]) * 32,
+                    )
+                ring.write(result, i, i % 3 or None)
+
+        process = multiprocessing.get_context("fork").Process(target=produce)
+        process.start()
+        received = []
+        deadline = time.monotonic() + 5
+        while len(received) < 50:
+            self.assertLess(time.monotonic(), deadline)
+            received.extend(ring.drain(wallets))
+        process.join()
+
+        for i, (result, proxy_index) in enumerate(received):
+            self.assertEqual(result.wallet, wallets[i])
+            self.assertEqual(result.tx_id, i + 1)
+            self.assertEqual(result.size, i / 2)
+            self.assertEqual(result.asset, btc)
+            self.assertEqual(proxy_index, i % 3 or None)
+            if i % 2:
+                self.assertFalse(result.success)
+                self.assertEqual(result.direction, Direction.SHORT)
+                self.assertEqual(result.error, "Insufficient balance")
+            else:
+                self.assertTrue(result.success)
+                self.assertEqual(result.signature, bytes([i]) * 32)
+        self.assertEqual(list(ring.drain(wallets)), [])
+
+    def test_process_session(self):
+        """
+        Test that a process-mode session trades every wallet once across
+        workers and records each result with a unique transaction ID.
+        """
+        run_in_temp_dir(self)
+        keys_file, proxy_file = loadtest.write_synthetic_inputs(os.getcwd(), 60, 4)
+        session = TradingSession({
+            "keys_file": keys_file,
+            "proxy_file": proxy_file,
+            "launch_delay": (0, 0),
+            "enable_logs": False,
+            "thread_count": 4,
+            "process_count": 3,
+            "result_ring_capacity": 4,
+        })
+        session.transaction_manager.backend = SimulatedBackend(latency_range=(0, 0))
+        session.run_session("process")
+
+        results = list(session.results.recent)
+        self.assertEqual(len(results), 60)
+        self.assertEqual(
+            sorted(result.wallet for result in results),
+            sorted(session.wallet_manager.wallets),
+        )
+        self.assertTrue(all(result.success for result in results))
+        self.assertEqual(len({result.tx_id for result in results}), 60)
+        self.assertEqual(
+            sum(stats["succeeded"] for stats in session.proxy_manager.health().values()),
+            60,
+        )
+
+    def test_worker_results_leave_parent_assignment_alone(self):
+        """
+        Test that results of worker-routed trades count toward proxy
+        totals only, while the parent's own closes release their proxies.
+        """
+        run_in_temp_dir(self)
+        keys_file, proxy_file = loadtest.write_synthetic_inputs(os.getcwd(), 30, 3)
+        session = TradingSession({
+            "keys_file": keys_file,
+            "proxy_file": proxy_file,
+            "launch_delay": (0, 0),
+            "enable_logs": False,
+            "thread_count": 4,
+            "process_count": 2,
+            "position_hold_time": 0.05,
+        })
+        session.transaction_manager.backend = SimulatedBackend(latency_range=(0, 0))
+        assignment = session.proxy_manager.assignment
+        with patch.object(assignment, "release", wraps=assignment.release) as release:
+            session.run_session("process")
+
+        self.assertEqual(session.lifecycle.closed, 30)
+        # Only the parent's 30 closes went through its assignment
+        self.assertEqual(release.call_count, 30)
+        health = session.proxy_manager.health()
+        self.assertEqual(sum(stats["succeeded"] for stats in health.values()), 60)
+        self.assertEqual(
+            {load["in_flight"] for load in assignment.load().values()}, {0}
+        )
+        with open(session.csv_writer.csv_file) as f:
+            self.assertEqual(len(f.readlines()), 61)
+
+
+class TestProxyAssignment(unittest.TestCase):
+
+    def test_strategies(self):
+        """
+        Test that load-aware strategies keep wallets on their proxy, pick
+        the least loaded or fastest proxy for new wallets, and move only the
+        wallets of a removed proxy.
+        """
+        proxies = [{"ip_port": f"10.0.0.{i}:8080", "auth": "u:p"} for i in range(4)]
+        assignment = LeastOutstandingAssignment(proxies)
+        # Wallets 0-3 hold a trade each on four different proxies
+        first = [assignment.assign(account)["ip_port"] for account in range(4)]
+        self.assertEqual(len(set(first)), 4)
+        # Proxy of wallet 0 frees up: the next new wallet goes there
+        assignment.release({"ip_port": first[0]}, True)
+        self.assertEqual(assignment.assign(4)["ip_port"], first[0])
+        # Affinity holds however busy the proxy is
+        for _ in range(5):
+            self.assertEqual(assignment.assign(1)["ip_port"], first[1])
+
+        moved = assignment.remove(first[1])
+        self.assertEqual(moved, [1])
+        load = assignment.load()
+        self.assertNotIn(first[1], load)
+        self.assertEqual(sum(entry["wallets"] for entry in load.values()), 5)
+        self.assertNotEqual(assignment.assign(1)["ip_port"], first[1])
+        self.assertEqual(assignment.assign(0)["ip_port"], first[0])
+
+        latencies = {"10.0.0.0:8080": 0.4, "10.0.0.1:8080": 0.1, "10.0.0.2:8080": 0.2}
+        assignment = LatencyWeightedAssignment(proxies, latencies)
+        chosen = [assignment.assign(account)["ip_port"] for account in range(3)]
+        # Fastest first; once loaded, the 0.2s proxies (the unprobed one
+        # counts as the median) beat it, and the slowest is never picked
+        self.assertEqual(chosen, ["10.0.0.1:8080", "10.0.0.2:8080", "10.0.0.3:8080"])
+
+    def test_failing_proxy_removed(self):
+        """
+        Test that a proxy reaching max_failures consecutive failures leaves
+        the rotation and its wallets move to the remaining proxies, while
+        orders the backend refuses do not count against it.
+        """
+        run_in_temp_dir(self)
+        with open("proxies.txt", "w") as f:
+            f.write("10.0.0.1:8080@u:p\n10.0.0.2:8080@u:p\n")
+        manager = ProxyManager("proxies.txt", assignment="modulo", max_failures=2)
+        failing = manager.get_proxy(0)
+        refused = TradeResult(
+            TradeStatus.FAILED, "0xabc", asset_code("BTC"), Direction.LONG, 1.0,
+            error="Insufficient balance",
+        )
+        for _ in range(3):
+            manager.record_outcome(failing, refused)
+            manager.get_proxy(0)
+        self.assertEqual(len(manager.proxies), 2)
+        self.assertEqual(manager.health()["10.0.0.1:8080"]["status"], "healthy")
+
+        failed = TradeResult(
+            TradeStatus.FAILED, "0xabc", asset_code("BTC"), Direction.LONG, 1.0,
+            error="Backend error",
+        )
+        manager.record_outcome(failing, failed)
+        manager.get_proxy(0)
+        manager.record_outcome(failing, failed)
+
+        self.assertEqual(
+            [proxy["ip_port"] for proxy in manager.proxies], ["10.0.0.2:8080"]
+        )
+        self.assertEqual(manager.get_proxy(0)["ip_port"], "10.0.0.2:8080")
+        health = manager.health()
+        self.assertEqual(health["10.0.0.1:8080"]["status"], "removed")
+        self.assertEqual(health["10.0.0.1:8080"]["failed"], 5)
+
+
+class TestPreTradeRisk(unittest.TestCase):
+
+    def test_rules(self):
+        """
+        Test that one pass over a batch reports the first rule each order
+        breaks, and that a session rejects orders before any request.
+        """
+        exposure = ExposureIndex()
+        exposure.record_fill(asset_code("ETH"), Direction.LONG, 90.0)
+        risk = PreTradeRisk(exposure)
+
+        def order(wallet, asset, direction, size, **extra):
+            return dict(
+                wallet_key=wallet, asset=asset, direction=direction, size=size, **extra
+            )
+
+        orders = [
+            order("0xa", "BTC", "long", 50.0),
+            order("0xb", "BTC", "long", -1.0),
+            order("0xc", "BTC", "short", 60.0),
+            order("0xc", "BTC", "short", 60.0),
+            order("0xd", "BTC", "long", 10.0, leverage=50),
+            order("0xe", "ETH", "long", 20.0),
+            order("0xf", "SOL", "long", 10.0, price=99.0),
+            order("0xg", "SOL", "short", 10.0, price=100.1),
+            order("0xh", "BTC", "long", 10.0),
+            order("0xi", "ETH", "short", 10.0),
+        ]
+        balances = [100.0] * 8 + [None, 100.0]
+        # 0xi already holds 1995 of open notional: 20.05x after the order
+        open_notional = [0.0] * 9 + [1995.0]
+        reasons = risk.check(
+            orders, balances,
+            max_net_exposure=100.0, open_notional=open_notional, max_leverage=20,
+            slippage_tolerance=0.5, prices={"SOL": 100.0},
+        )
+        self.assertEqual(reasons, [
+            None, "size", "balance", "balance", "leverage",
+            "exposure", "slippage", None, "balance", "leverage",
+        ])
+        self.assertEqual(risk.rejected["balance"], 3)
+        self.assertEqual(exposure.rejected, 1)
+        with self.assertRaises(ValueError):
+            compile_settings({"leverage": 25, "max_leverage": 20})
+
+        run_in_temp_dir(self)
+        keys_file, proxy_file = loadtest.write_synthetic_inputs(os.getcwd(), 10, 2)
+        session = TradingSession({
+            "keys_file": keys_file,
+            "proxy_file": proxy_file,
+            "launch_delay": (0, 0),
+            "enable_logs": False,
+            "volume_percentage_range": (60, 60),
+            "leverage": 1,
+            "max_leverage": 2,
+        })
+        backend = SimulatedBackend(latency_range=(0, 0))
+        session.transaction_manager.backend = backend
+        session.run_session("parallel")
+        self.assertEqual(session.results.succeeded, 10)
+
+        # Second round: 6000 held plus 2400 ordered on 4000 of balance is 2.1x
+        requests = backend.request_count
+        session.run_session("parallel")
+        self.assertEqual(session.results.total, 10)
+        self.assertEqual(session.risk.rejected["leverage"], 10)
+        # Only the balance prefetches reached the backend
+        self.assertEqual(backend.request_count - requests, 1)
+
+    def test_slippage_against_planning_mark(self):
+        """
+        Test that orders are priced at the mark they were planned at and
+        rejected when the mark moves against them before the check.
+        """
+        run_in_temp_dir(self)
+        keys_file, proxy_file = loadtest.write_synthetic_inputs(os.getcwd(), 4, 2)
+        session = TradingSession({
+            "keys_file": keys_file,
+            "proxy_file": proxy_file,
+            "enable_logs": False,
+            "trading_assets": ["BTC"],
+            "position_direction": "long",
+            "slippage_tolerance": 0.5,
+        })
+        session.transaction_manager.backend = SimulatedBackend(latency_range=(0, 0))
+        session.price_feed = MagicMock()
+        session.price_feed.snapshot.prices = {"BTC": 101.0}
+        session.price_feed.snapshot.ages.return_value = {"BTC": 0.0}
+        wallets = session.wallet_manager.wallets
+        session.balance_cache.prefetch(wallets)
+
+        # Planned at 100, marked at 101 when checked: 1% against a long
+        self.assertIsNone(session._process_wallet(wallets[0], {"BTC": 100.0}))
+        self.assertEqual(session.risk.rejected["slippage"], 1)
+        result = session._process_wallet(wallets[1], {"BTC": 100.8})
+        self.assertTrue(result.success)
+        # Planned now, so no move since
+        self.assertTrue(session._process_wallet(wallets[2]).success)
+
+
+class TestPositionLifecycle(unittest.TestCase):
+
+    def test_timing_wheel(self):
+        """
+        Test that entries expire on their tick, across laps and after long
+        gaps between advances.
+        """
+        wheel = TimingWheel(tick=1.0, slots=8, now=0.0)
+        for deadline in (0.5, 3.0, 3.2, 9.0, 17.0, 40.0):
+            wheel.schedule(deadline, deadline)
+        self.assertEqual(wheel.advance(1.0), [0.5])
+        self.assertEqual(wheel.advance(3.5), [3.0])
+        self.assertEqual(wheel.advance(4.0), [3.2])
+        # 9.0 shares a bucket with 17.0 one lap later
+        self.assertEqual(wheel.advance(9.0), [9.0])
+        self.assertEqual(wheel.advance(30.0), [17.0])
+        self.assertEqual(len(wheel), 1)
+        self.assertEqual(wheel.drain(), [40.0])
+
+    def test_session_closes_held_positions(self):
+        """
+        Test that every opened position is closed after its hold time, in
+        batched close requests, leaving exposure and balances flat.
+        """
+        run_in_temp_dir(self)
+        keys_file, proxy_file = loadtest.write_synthetic_inputs(os.getcwd(), 40, 4)
+        session = TradingSession({
+            "keys_file": keys_file,
+            "proxy_file": proxy_file,
+            "launch_delay": (0, 0),
+            "enable_logs": False,
+            "thread_count": 8,
+            "position_hold_time": 0.2,
+            "position_close_batch": 16,
+        })
+        backend = SimulatedBackend(latency_range=(0, 0))
+        session.transaction_manager.backend = backend
+        started = time.monotonic()
+        session.run_session("parallel")
+
+        self.assertGreaterEqual(time.monotonic() - started, 0.2)
+        lifecycle = session.lifecycle
+        self.assertEqual(lifecycle.opened, 40)
+        self.assertEqual(lifecycle.closed, 40)
+        self.assertEqual(lifecycle.open_count, 0)
+        self.assertLess(lifecycle.close_requests, 40)
+        self.assertEqual(session.results.total, 80)
+        for exposure in session.exposure.by_asset().values():
+            self.assertAlmostEqual(exposure["net"], 0.0)
+        for balance in backend.balances.values():
+            self.assertAlmostEqual(balance, backend.starting_balance)
+        # Closing fills netted every booked position flat
+        self.assertEqual(session.positions.count, 40)
+        self.assertEqual(len(session.positions), 0)
+
+    def test_closes_succeed_with_every_trade_thread_busy(self):
+        """
+        Test that the closer thread gets transaction IDs while as many
+        trade threads as concurrency_max are generating them too.
+        """
+        run_in_temp_dir(self)
+        keys_file, proxy_file = loadtest.write_synthetic_inputs(os.getcwd(), 160, 4)
+        session = TradingSession({
+            "keys_file": keys_file,
+            "proxy_file": proxy_file,
+            "launch_delay": (0, 0),
+            "enable_logs": False,
+            "thread_count": 16,
+            "concurrency_max": 16,
+            "position_hold_time": 0.05,
+            "position_close_batch": 4,
+        })
+        # Trades overlap with each other and with the closes
+        session.transaction_manager.backend = SimulatedBackend(
+            latency_range=(0.01, 0.015)
+        )
+        session.run_session("parallel")
+
+        lifecycle = session.lifecycle
+        self.assertEqual(session.concurrency.metrics()["in_flight_peak"], 16)
+        self.assertEqual((lifecycle.opened, lifecycle.closed), (160, 160))
+        self.assertEqual(lifecycle.abandoned, 0)
+        self.assertEqual(session.results.failed, 0)
+        self.assertEqual(len(session.positions), 0)
+
+
+class TestMarkPriceFeed(unittest.TestCase):
+
+    def test_replay_snapshots_and_staleness(self):
+        """
+        Test that a replayed feed publishes new snapshots without touching
+        old ones, tracks staleness, and that trades on assets without a
+        fresh price are rejected.
+        """
+        run_in_temp_dir(self)
+        with open("prices.csv", "w") as f:
+            f.write("timestamp,asset,price\n")
+            f.write("1700000000.0,BTC,100.0\n1700000000.0,ETH,10.0\n")
+            f.write("1700000000.05,BTC,101.0\n")
+
+        feed = MarkPriceFeed(["BTC", "ETH"], ReplayPriceSource("prices.csv"))
+        feed.poll()
+        first = feed.snapshot
+        self.assertTrue(feed.wait_ready(0))
+        self.assertEqual(dict(first.prices), {"BTC": 100.0, "ETH": 10.0})
+        time.sleep(0.06)
+        feed.poll()
+        self.assertEqual(feed.snapshot.price("BTC"), 101.0)
+        self.assertEqual(first.price("BTC"), 100.0)
+        self.assertEqual(feed.snapshot.sequence, first.sequence + 1)
+        metrics = feed.metrics()
+        self.assertEqual(metrics["assets"]["BTC"]["updates"], 2)
+        self.assertEqual(metrics["assets"]["ETH"]["updates"], 1)
+        self.assertGreater(metrics["assets"]["BTC"]["max_gap_s"], 0.05)
+        self.assertGreater(metrics["assets"]["ETH"]["age_s"], 0.05)
+
+        # Only BTC is ever priced: ETH trades are blocked
+        with open("btc.csv", "w") as f:
+            f.write("timestamp,asset,price\n2024-01-01T00:00:00,BTC,100.0\n")
+        keys_file, proxy_file = loadtest.write_synthetic_inputs(os.getcwd(), 30, 2)
+        session = TradingSession({
+            "keys_file": keys_file,
+            "proxy_file": proxy_file,
+            "launch_delay": (0, 0),
+            "enable_logs": False,
+            "trading_assets": ["BTC", "ETH"],
+            "price_feed": "btc.csv",
+            "price_poll_interval": 0.01,
+            "price_max_age": 0.5,
+        })
+        session.transaction_manager.backend = SimulatedBackend(latency_range=(0, 0))
+        session.run_session("parallel")
+
+        traded = {asset_name(result.asset) for result in session.results.recent}
+        self.assertEqual(traded, {"BTC"})
+        self.assertEqual(
+            session.results.total + session.risk.rejected["price"], 30
+        )
+        self.assertGreater(session.risk.rejected["price"], 0)
+
+    @patch("crypto_trading_bot.time.sleep", return_value=None)
+    def test_workers_follow_parent_marks(self, mock_sleep):
+        """
+        Test that a mirrored feed's marks reach a reading feed once per
+        update, and that process-mode workers trade at the parent's marks.
+        """
+        feed = MarkPriceFeed(["BTC", "ETH"], None)
+        feed.mirror = SharedPriceSource(["BTC", "ETH"])
+        reader = MarkPriceFeed(["BTC", "ETH"], feed.mirror)
+        feed.update({"BTC": 100.0})
+        reader.poll()
+        feed.update({"ETH": 10.0})
+        reader.poll()
+        reader.poll()
+        self.assertEqual(dict(reader.snapshot.prices), {"BTC": 100.0, "ETH": 10.0})
+        self.assertEqual(reader.metrics()["assets"]["BTC"]["updates"], 1)
+        self.assertEqual(reader.metrics()["assets"]["ETH"]["updates"], 1)
+
+        run_in_temp_dir(self)
+        keys_file, proxy_file = loadtest.write_synthetic_inputs(os.getcwd(), 20, 2)
+        session = TradingSession({
+            "keys_file": keys_file,
+            "proxy_file": proxy_file,
+            "launch_delay": (0, 0),
+            "enable_logs": False,
+            "process_count": 2,
+            "price_feed": "simulated",
+            "price_poll_interval": 0.01,
+        })
+        session.transaction_manager.backend = SimulatedBackend(latency_range=(0, 0))
+        session.run_session("process")
+
+        self.assertEqual(session.results.total, 20)
+        self.assertIsNone(session.price_feed.mirror)
+
+    def test_reloaded_assets_are_priced(self):
+        """
+        Test that reloading trading_assets swaps in a running feed that
+        prices the new assets.
+        """
+        session = TradingSession({
+            "enable_logs": False,
+            "trading_assets": ["BTC"],
+            "price_feed": "simulated",
+            "price_poll_interval": 0.01,
+        })
+        feed = session.price_feed
+        feed.start()
+        self.addCleanup(lambda: session.price_feed.stop())
+        session.apply_settings({"trading_assets": ["BTC", "SOL"]})
+
+        self.assertFalse(feed.running)
+        self.assertTrue(session.price_feed.running)
+        self.assertTrue(session.price_feed.wait_ready(1))
+        self.assertIsNotNone(session.price_feed.snapshot.price("SOL"))
+
+
+class TestUITimeouts(unittest.TestCase):
+
+    def setUp(self):
+        with patch.object(TradingPlatformUI, "setup_logging"):
+            self.ui = TradingPlatformUI(
+                timeouts={"balance_display": 40, "approve_usdc": 3}
+            )
+
+    def test_timeout_follows_step_latency_within_bounds(self):
+        """
+        Test that a step's timeout starts at its configured value, adapts to
+        observed latency, and never drops below half the configured value.
+        """
+        ui = self.ui
+        self.assertEqual(ui.timeout_for("balance_display"), 40)
+        self.assertEqual(ui.timeout_for("connect_wallet"), 15)
+        self.assertEqual(ui.timeout_for("unknown_step"), ui.DEFAULT_TIMEOUT)
+
+        for _ in range(10):
+            ui._record_step("balance_display", 0.1, True)
+        self.assertAlmostEqual(ui._latency_ewma["balance_display"], 0.1)
+        self.assertEqual(ui.timeout_for("balance_display"), 20)
+        # Small configured timeouts keep the absolute floor
+        ui._record_step("approve_usdc", 0.1, True)
+        self.assertEqual(ui.timeout_for("approve_usdc"), ui.MIN_TIMEOUT)
+
+        # Slow steps raise the timeout up to the configured bound
+        for _ in range(3):
+            ui._record_step("balance_display", 12.0, True)
+        self.assertAlmostEqual(
+            ui.timeout_for("balance_display"),
+            3 * (0.657 * 12.0 + 0.343 * 0.1),
+        )
+        ui._record_step("balance_display", 40.0, False)
+        self.assertEqual(ui.timeout_for("balance_display"), 40)
+
+        timings = ui.get_step_timings()["balance_display"]
+        self.assertEqual(timings["count"], 14)
+        self.assertEqual(timings["max"], 40.0)
+        self.assertEqual(timings["timeout"], 40)
+
+
+class TestBrowserProfiles(unittest.TestCase):
+
+    @unittest.skipUnless(
+        any(shutil.which(name) for name in CHROME_BINARIES), "Chrome is not installed"
+    )
+    def test_lean_profile_skips_non_essential_resources(self):
+        """
+        Test against the local benchmark page that the lean profile never
+        requests the image or the third-party analytics script, and
+        transfers fewer bytes than the standard profile.
+        """
+        run_in_temp_dir(self)
+        with patch.object(TradingPlatformUI, "setup_logging"):
+            results = benchmark_browser_profiles(user_agent="Mozilla/5.0")
+
+        standard, lean = results["standard"], results["lean"]
+        for path in (BENCHMARK_THIRD_PARTY_PATH, "/hero.png"):
+            self.assertIn(path, standard["served_paths"])
+            self.assertNotIn(path, lean["served_paths"])
+        self.assertGreater(standard["bytes_transferred"], 512 * 1024)
+        self.assertLess(lean["bytes_transferred"], standard["bytes_transferred"])
+        self.assertGreater(lean["load_time"], 0)
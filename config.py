@@ -1,15 +1,11 @@
 import logging
 import os
+
+from log_rotation import CompressingRotatingFileHandler, archive_logs
 from typing import Dict, List
 from datetime import datetime
 
-# Create logs directory if it doesn't exist
 LOG_DIR = "logs"
-os.makedirs(LOG_DIR, exist_ok=True)
-
-# Generate session-specific log filename
-current_time = datetime.now().strftime("%Y%m%d_%H%M%S")
-session_log_file = os.path.join(LOG_DIR, f"trading_session_{current_time}.log")
 
 # Logging configuration
 LOGGING_CONFIG: Dict = {
@@ -17,51 +13,103 @@ LOGGING_CONFIG: Dict = {
     "level": logging.INFO,  # Logging level: DEBUG, INFO, WARNING, ERROR, CRITICAL
     "format": '%(asctime)s - %(levelname)s - %(message)s',
     "to_file": True,  # Enable/disable logging to file
-    "log_file": session_log_file,  # Session-specific log file
+    "log_file": None,  # Session-specific log file, set by init_runtime()
     "console_output": True,  # Enable/disable console output
     # Optional: keep general log file as well
     "general_log": {
         "enabled": True,
         "file": os.path.join(LOG_DIR, "trading_bot_general.log")
-    }
+    },
+    # Rotation for all log files: a file is rotated when it reaches max_bytes
+    # or max_age seconds; rotated segments are gzipped in the background and
+    # kept up to backup_count per file and retention seconds overall
+    "rotation": {
+        "max_bytes": 50 * 1024 * 1024,
+        "max_age": 24 * 3600,
+        "backup_count": 20,
+        "retention": 30 * 24 * 3600,
+    },
 }
 
-# Setup logging based on configuration
-if LOGGING_CONFIG["enabled"]:
+
+def rotating_file_handler(filename: str) -> CompressingRotatingFileHandler:
+    """Create a log file handler with the configured rotation and retention"""
+    rotation = LOGGING_CONFIG["rotation"]
+    handler = CompressingRotatingFileHandler(
+        filename,
+        max_bytes=rotation["max_bytes"],
+        max_age=rotation["max_age"],
+        backup_count=rotation["backup_count"],
+        retention=rotation["retention"],
+    )
+    handler.setFormatter(logging.Formatter(LOGGING_CONFIG["format"]))
+    return handler
+
+
+def archive_finished_logs(pattern: str):
+    """Compress log files of earlier sessions matching pattern (under LOG_DIR)"""
+    rotation = LOGGING_CONFIG["rotation"]
+    archive_logs(
+        os.path.join(LOG_DIR, pattern), rotation["max_age"], rotation["retention"]
+    )
+
+logger = logging.getLogger('trading_bot')
+
+_runtime_initialized = False
+
+
+def init_runtime() -> None:
+    """
+    Set up process-wide runtime state: the logs directory,
+    the session and general log files and the logging handlers.
+
+    Importing this module has no side effects; entry points call this
+    once before starting a session. Repeated calls are no-ops.
+    """
+    global _runtime_initialized
+    if _runtime_initialized:
+        return
+    _runtime_initialized = True
+
+    # Disable logging if not enabled in config
+    if not LOGGING_CONFIG["enabled"]:
+        logger.disabled = True
+        return
+
     handlers = []
-    
+
     if LOGGING_CONFIG["console_output"]:
         console_handler = logging.StreamHandler()
         console_handler.setFormatter(logging.Formatter(LOGGING_CONFIG["format"]))
         handlers.append(console_handler)
-    
+
+    current_time = datetime.now().strftime("%Y%m%d_%H%M%S")
     if LOGGING_CONFIG["to_file"]:
+        # Create logs directory if it doesn't exist
+        os.makedirs(LOG_DIR, exist_ok=True)
+
         # Session-specific log handler
-        session_handler = logging.FileHandler(LOGGING_CONFIG["log_file"])
-        session_handler.setFormatter(logging.Formatter(LOGGING_CONFIG["format"]))
-        handlers.append(session_handler)
-        
+        archive_finished_logs("trading_session_*.log")
+        LOGGING_CONFIG["log_file"] = os.path.join(
+            LOG_DIR, f"trading_session_{current_time}.log"
+        )
+        handlers.append(rotating_file_handler(LOGGING_CONFIG["log_file"]))
+
         # General log handler (if enabled)
         if LOGGING_CONFIG["general_log"]["enabled"]:
-            general_handler = logging.FileHandler(LOGGING_CONFIG["general_log"]["file"])
-            general_handler.setFormatter(logging.Formatter(LOGGING_CONFIG["format"]))
-            handlers.append(general_handler)
-    
+            handlers.append(
+                rotating_file_handler(LOGGING_CONFIG["general_log"]["file"])
+            )
+
     logging.basicConfig(
         level=LOGGING_CONFIG["level"],
         format=LOGGING_CONFIG["format"],
         handlers=handlers
     )
 
-logger = logging.getLogger('trading_bot')
-# Disable logging if not enabled in config
-if not LOGGING_CONFIG["enabled"]:
-    logger.disabled = True
-
-# Log session start with configuration details
-if LOGGING_CONFIG["enabled"]:
+    # Log session start with configuration details
     logger.info(f"Starting new trading session at {current_time}")
-    logger.info(f"Session log file: {session_log_file}")
+    logger.info(f"Session log file: {LOGGING_CONFIG['log_file']}")
 
 # Trading configuration
 TRADING_CONFIG: Dict = {
@@ -71,9 +119,22 @@ TRADING_CONFIG: Dict = {
     
     # Proxy settings
     "proxy_type": "regular",  # Options: "regular" or "mobile"
+    # How wallets get their proxy; a wallet keeps its proxy for the session.
+    # "modulo": wallet index modulo proxy count; "least_outstanding": the
+    # proxy with the fewest trades in flight; "latency_weighted": the lowest
+    # connect latency (from pre-flight) times load
+    "proxy_assignment": "modulo",
+    # Consecutive failed trades after which a proxy leaves the rotation and
+    # its wallets move to other proxies; orders the backend refuses (e.g.
+    # insufficient balance) do not count. None keeps every proxy
+    "proxy_max_failures": None,
+    # Probe every proxy (TCP connect) at session start and exclude unreachable ones
+    "proxy_preflight": False,
+    "proxy_preflight_timeout": 3.0,  # Seconds per connection attempt
+    "proxy_preflight_parallelism": 256,  # Max connection attempts open at once
     
     # Execution settings
-    "execution_mode": "branch",  # Options: "branch" or "parallel"
+    "execution_mode": "branch",  # Options: "branch", "parallel" or "process"
     "enable_shuffling": True,
     
     # Thread and branch settings
@@ -81,17 +142,89 @@ TRADING_CONFIG: Dict = {
     "launch_delay": (0, 3600),  # Delay range in seconds
     "branch_wallet_range": (2, 5),  # Min and max wallets per branch
     "max_parallel_branches": 5,
+    # Parallel mode adapts in-flight trades between these limits, starting at
+    # thread_count: +1 per window with p95 latency under target, halved on
+    # backend errors or timed-out trades (refused orders such as insufficient
+    # balance do not count). At most 256; reloading thread_count resets the
+    # limit
+    "concurrency_min": 1,
+    "concurrency_max": 16,
+    "latency_target_p95": 2.5,  # Seconds
+    "trade_timeout": 10,  # Seconds; slower trades count as timeouts
+    # Transaction ID worker (0-63), must differ per process. None claims a
+    # free one on this host, falling back to the PID (with a warning)
+    "worker_id": None,
+    # Process mode splits wallets over worker processes (0: one per CPU, at
+    # most 63), each trading with up to thread_count threads and returning
+    # results through a shared-memory ring of this many records
+    "process_count": 0,
+    "result_ring_capacity": 4096,
     
     # Trading parameters
     "trading_assets": ["BTC", "ETH", "SOL"],  # List of assets to trade
     "position_direction": "random",  # Options: "random", "long", "short"
-    "volume_percentage_range": (10, 50),  # Min and max trade size
+    "volume_percentage_range": (10, 50),  # Min and max trade size, % of wallet balance
+    # Max absolute net (long - short) filled notional per asset; orders that
+    # would grow it past the limit are skipped. None disables the check
+    "max_net_exposure": None,
+    # Positions opened through the backend are held this many seconds and
+    # then closed, positions falling due together in batches of up to
+    # position_close_batch; failed closes are retried (max_retries,
+    # retry_delay). None leaves positions open
+    "position_hold_time": None,
+    "position_close_batch": 100,
+    # Mark prices: "simulated" (random walk), a CSV file of timestamp,asset,price
+    # rows replayed at price_replay_speed, or None for no feed. Prices are
+    # polled every price_poll_interval seconds; trades on an asset whose
+    # price is older than price_max_age seconds are rejected. Process-mode
+    # workers read the session's marks from shared memory
+    "price_feed": None,
+    "price_poll_interval": 1.0,
+    "price_max_age": 5.0,
+    "price_replay_speed": 1.0,
+    # Pre-trade checks reject orders over the wallet balance, orders that
+    # take a wallet's open notional above max_leverage times its balance,
+    # orders over max_net_exposure and orders whose mark moved more than
+    # slippage_tolerance percent against them since they were planned,
+    # before any request is made
+    "leverage": 5,
+    "max_leverage": 20,
+    "balance_cache_ttl": 30,  # Seconds a fetched wallet balance stays valid
+    "result_buffer_size": 1000,  # Recent trade results kept in memory
     
     # Additional trading settings
     "max_retries": 3,  # Maximum retry attempts for failed transactions
     "retry_delay": 5,  # Delay between retries in seconds
     "gas_limit": 300000,  # Maximum gas limit for transactions
     "slippage_tolerance": 0.5,  # Maximum allowed slippage in percentage
+
+    # UI automation settings
+    "browser_profile": "standard",  # Options: "standard" or "lean" (blocks images, fonts, media, analytics)
+    # Per-step wait timeouts in seconds, merged over
+    # TradingPlatformUI.SELECTOR_TIMEOUTS (other steps wait up to 10s).
+    # Waits adapt to observed step latency but never below half of these
+    "ui_timeouts": {"balance_display": 30, "approval_confirmed": 60},
+
+    # Local status/control endpoint (GET /status, POST /pause, /resume, /drain)
+    # on 127.0.0.1; None disables it, 0 picks a free port
+    "status_port": None,
+
+    # Tracing: share of trades/branches traced stage by stage (0 disables);
+    # spans go to trace_file as JSON lines and/or as UDP datagrams to a
+    # local collector ("host:port"). Summarize with `python tracing.py <file>`
+    "trace_sample_rate": 0.0,
+    "trace_file": os.path.join(LOG_DIR, "traces.jsonl"),
+    "trace_collector": None,
+
+    # Hot reload: JSON file with overrides for thread_count, launch_delay,
+    # branch_wallet_range, max_parallel_branches, concurrency_min,
+    # concurrency_max, enable_shuffling, trading_assets (restarts the price
+    # feed), position_direction, volume_percentage_range, max_net_exposure,
+    # max_leverage and slippage_tolerance.
+    # Re-read on SIGHUP, or polled every settings_poll_interval seconds
+    # where SIGHUP is unavailable
+    "settings_file": None,
+    "settings_poll_interval": 5,
 }
 
 # User agents for transaction manager
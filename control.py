@@ -0,0 +1,145 @@
+import json
+import threading
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Optional
+
+from config import logger
+
+
+class SessionControl:
+    """
+    Pause/resume/drain switch and trade counters shared by a session's threads.
+
+    Work that is about to start calls proceed(), which blocks while the
+    session is paused and returns False once it is draining: trades already
+    in flight finish, queued and new ones are skipped.
+    """
+
+    def __init__(self):
+        self._running = threading.Event()
+        self._running.set()
+        self._draining = threading.Event()
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.in_flight = 0
+
+    def pause(self):
+        self._running.clear()
+        logger.info("Session paused")
+
+    def resume(self):
+        self._running.set()
+        logger.info("Session resumed")
+
+    def drain(self):
+        self._draining.set()
+        # Paused work must wake up to see the drain
+        self._running.set()
+        logger.info("Session draining: no new trades will start")
+
+    @property
+    def state(self) -> str:
+        if self._draining.is_set():
+            return "draining"
+        return "running" if self._running.is_set() else "paused"
+
+    def proceed(self) -> bool:
+        """Wait while paused, return whether new work may start"""
+        self._running.wait()
+        return not self._draining.is_set()
+
+    def queue(self, count: int = 1):
+        """Count trades waiting for a worker"""
+        with self._lock:
+            self.queued += count
+
+    def start(self, count: int = 1, queued: bool = False):
+        """Count trades sent to the backend (taken from the queue if queued)"""
+        with self._lock:
+            if queued:
+                self.queued -= count
+            self.in_flight += count
+
+    def finish(self, count: int = 1):
+        """Count trades that got their result"""
+        with self._lock:
+            self.in_flight -= count
+
+    def skip(self, count: int = 1):
+        """Drop queued trades that will not run"""
+        with self._lock:
+            self.queued -= count
+
+
+class _StatusHandler(BaseHTTPRequestHandler):
+    """GET /status for live state, POST /pause, /resume or /drain to control"""
+
+    def _send_json(self, code: int, body: Dict[str, Any]):
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        if self.path.rstrip("/") == "/status":
+            self._send_json(200, self.server.get_status())
+        else:
+            self._send_json(404, {"error": f"Unknown path: {self.path}"})
+
+    def do_POST(self):
+        command = self.server.commands.get(self.path.strip("/"))
+        if command is None:
+            self._send_json(404, {"error": f"Unknown command: {self.path}"})
+            return
+        command()
+        self._send_json(200, self.server.get_status())
+
+    def log_message(self, format, *args):
+        logger.debug("Status endpoint: " + format, *args)
+
+
+class StatusServer:
+    """
+    Local HTTP endpoint for a running session.
+
+    Binds to localhost by default; port 0 picks a free port (see `port`).
+    """
+
+    def __init__(
+        self,
+        get_status: Callable[[], Dict[str, Any]],
+        control: SessionControl,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self._server = ThreadingHTTPServer((host, port), _StatusHandler)
+        self._server.daemon_threads = True
+        self._server.get_status = get_status
+        self._server.commands = {
+            "pause": control.pause,
+            "resume": control.resume,
+            "drain": control.drain,
+        }
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="status-server", daemon=True
+        )
+        self._thread.start()
+        host, port = self._server.server_address[:2]
+        logger.info(f"Status endpoint listening on http://{host}:{port}/status")
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
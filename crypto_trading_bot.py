@@ -1,21 +1,45 @@
 import hmac
 import hashlib
+import itertools
 import logging
+import multiprocessing
 import os
 import random
-import requests
+import threading
 import time
 
 from base64 import b64encode
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Callable, Iterable, Optional, Tuple
 
+from adaptive_concurrency import AdaptiveConcurrencyLimiter
 from csv_writer import CSVWriter
-from config import logger, TRADING_CONFIG, USER_AGENTS
-
-
-# Setup logging configuration
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+from config import (
+    LOG_DIR,
+    logger,
+    archive_finished_logs,
+    init_runtime,
+    rotating_file_handler,
+    TRADING_CONFIG,
+    USER_AGENTS,
+)
+from control import SessionControl, StatusServer
+from exposure import ExposureIndex
+from market_data import MarkPriceFeed, SharedPriceSource, create_source
+from position_lifecycle import OPPOSITE_DIRECTIONS, PositionLifecycle
+from proxy_assignment import ProxyAssignment, create_assignment
+from proxy_check import probe_proxies
+from result_ring import ResultRing
+from risk import PreTradeRisk
+from tracing import configure as configure_tracing, tracer
+from settings import MAX_CONCURRENCY, MAX_PROCESSES, Settings, compile_settings
+from simulator import SimulatedBackend
+from trade_result import (
+    Direction, ResultBuffer, TradeResult, TradeStatus, asset_code, asset_name
+)
+from tx_ids import TransactionIdGenerator, format_tx_id
 
 
 class WalletManager:
@@ -52,50 +76,253 @@ class WalletManager:
 
 
 class ProxyManager:
-    def __init__(self, proxy_file: str, proxy_type: str = "regular"):
+    def __init__(
+        self,
+        proxy_file: str,
+        proxy_type: str = "regular",
+        assignment: str = "modulo",
+        max_failures: Optional[int] = None,
+    ):
         self.proxy_file = proxy_file
         self.proxy_type = proxy_type
         self.proxies = self._load_proxies()
         if not self.proxies:
             logger.error("[ERROR] No available proxy servers.")
         logger.info(f"Loaded proxies: {self.proxies}")
+        self.latencies: Dict[str, float] = {}
+        self.assignment_strategy = assignment
+        # Consecutive failed trades after which a proxy is taken out of rotation
+        self.max_failures = max_failures
+        self.assignment: ProxyAssignment = create_assignment(
+            assignment, self.proxies, self.latencies
+        )
+        self._health: Dict[str, Dict[str, Any]] = {}
+        self._health_lock = threading.Lock()
 
 
     def _load_proxies(self) -> List[Dict]:
-        """Load proxies from file"""
+        """Load proxies from file, skipping malformed lines"""
         with open(self.proxy_file, "r") as f:
             proxies = []
-            for line in f:
-                if "|" in line:  # Mobile proxy
-                    proxy_data, refresh_link = line.strip().split("|")
-                    ip_port, auth = proxy_data.split("@")
-                    proxies.append(
-                        {"ip_port": ip_port, "auth": auth, "refresh_link": refresh_link}
+            for line_number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                try:
+                    if "|" in line:  # Mobile proxy
+                        proxy_data, refresh_link = line.split("|")
+                        ip_port, auth = proxy_data.split("@")
+                        proxies.append({
+                            "ip_port": ip_port,
+                            "auth": auth,
+                            "refresh_link": refresh_link,
+                        })
+                    else:  # Regular proxy
+                        ip_port, auth = line.split("@")
+                        proxies.append({
+                            'ip_port': ip_port,
+                            'auth': auth
+                        })
+                except ValueError:
+                    logger.warning(
+                        f"Skipping malformed proxy on line {line_number} of "
+                        f"{self.proxy_file} (expected ip:port@user:pass[|refresh_link])"
                     )
-                else:  # Regular proxy
-                    ip_port, auth = line.strip().split("@")
-                    proxies.append({
-                        'ip_port': ip_port,
-                        'auth': auth
-                    })
             logger.info(f"Proxies loaded: {proxies}")
             return proxies
 
+    def preflight(self, timeout: float = 3.0, max_parallel: int = 256) -> int:
+        """
+        Probe every proxy concurrently and drop the unreachable ones.
+
+        Connect latencies of reachable proxies are kept in `latencies`.
+        Returns the number of proxies dropped.
+        """
+        started = time.monotonic()
+        latencies = probe_proxies(
+            [proxy["ip_port"] for proxy in self.proxies], timeout, max_parallel
+        )
+        reachable = []
+        for proxy in self.proxies:
+            latency = latencies[proxy["ip_port"]]
+            if latency is None:
+                logger.warning(f"Proxy {proxy['ip_port']} is unreachable, excluding it")
+            else:
+                self.latencies[proxy["ip_port"]] = latency
+                reachable.append(proxy)
+
+        dropped = len(self.proxies) - len(reachable)
+        self.proxies = reachable
+        # Runs before any trade: start over with the reachable proxies and
+        # their latencies
+        self.assignment = create_assignment(
+            self.assignment_strategy, self.proxies, self.latencies
+        )
+        logger.info(
+            f"Proxy pre-flight: {len(reachable)} reachable, {dropped} excluded "
+            f"in {time.monotonic() - started:.2f}s"
+        )
+        return dropped
+
     def get_proxy(self, account_id: int) -> Dict:
-        """Get proxy for specific account"""
-        proxy = self.proxies[account_id % len(self.proxies)]
+        """
+        Get proxy for specific account.
+
+        The proxy counts a trade in flight until record_outcome() or
+        release() is called for it.
+        """
+        proxy = self.assignment.assign(account_id)
         logger.info(f"Using proxy for account {account_id}: {proxy}")
         if self.proxy_type == "mobile" and "refresh_link" in proxy:
-            requests.get(proxy["refresh_link"])
+            import requests  # Deferred: only mobile proxies need HTTP here
+
+            try:
+                with tracer.span("refresh_proxy"):
+                    requests.get(proxy["refresh_link"])
+            except Exception:
+                self.release(proxy)
+                raise
             logger.info(f"Refreshed mobile proxy: {proxy['refresh_link']}")
         return proxy
 
+    def release(self, proxy: Dict):
+        """Return a proxy whose trade was not sent"""
+        self.assignment.release(proxy)
+
+    def remove_proxy(self, ip_port: str):
+        """Take a proxy out of rotation and move its wallets to other proxies"""
+        self.proxies = [proxy for proxy in self.proxies if proxy["ip_port"] != ip_port]
+        moved = self.assignment.remove(ip_port)
+        logger.warning(
+            f"Proxy {ip_port} removed from rotation, {len(moved)} wallet(s) reassigned"
+        )
+
+    def record_outcome(self, proxy: Dict, result: TradeResult):
+        """Count trade outcome against the proxy it went through"""
+        # A refused order (e.g. insufficient balance) made it through the
+        # proxy, so it does not count toward the proxy's failure streak
+        healthy = result.success or result.rejected
+        self.assignment.release(proxy, healthy)
+        with self._health_lock:
+            stats = self._count_outcome(proxy, result)
+            if healthy:
+                stats["consecutive_failures"] = 0
+            else:
+                stats["consecutive_failures"] += 1
+            evict = (
+                self.max_failures is not None
+                and stats["consecutive_failures"] == self.max_failures
+                and len(self.proxies) > 1
+            )
+        if evict:
+            self.remove_proxy(proxy["ip_port"])
+
+    def record_health(self, proxy: Dict, result: TradeResult):
+        """
+        Count the outcome of a trade another process (a process-mode
+        worker) routed through proxy. It held nothing in this process's
+        assignment, and that process evicts on its own failure streaks, so
+        only the totals change.
+        """
+        with self._health_lock:
+            self._count_outcome(proxy, result)
+
+    def _count_outcome(self, proxy: Dict, result: TradeResult) -> Dict[str, Any]:
+        """Add result to the proxy's totals (caller holds the health lock)"""
+        stats = self._health.setdefault(proxy["ip_port"], {
+            "succeeded": 0, "failed": 0, "consecutive_failures": 0, "last_error": "",
+        })
+        if result.success:
+            stats["succeeded"] += 1
+        else:
+            stats["failed"] += 1
+            stats["last_error"] = result.error
+        return stats
+
+    def health(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Per-proxy outcome counts, status (healthy, degraded, down or removed)
+        and current load (wallets assigned, trades in flight)
+        """
+        load = self.assignment.load()
+        idle = {"wallets": 0, "in_flight": 0}
+        with self._health_lock:
+            report = {}
+            for ip_port, stats in self._health.items():
+                failures = stats["consecutive_failures"]
+                if ip_port not in load:
+                    status = "removed"
+                elif failures >= 3:
+                    status = "down"
+                else:
+                    status = "degraded" if failures else "healthy"
+                report[ip_port] = dict(stats, status=status, **load.get(ip_port, idle))
+            return report
+
+
+class BalanceCache:
+    """Per-wallet balance cache with TTL, filled by bulk balance requests"""
+
+    def __init__(
+        self,
+        fetch_balances: Callable[[List[str]], Dict[str, float]],
+        ttl: float = 30.0,
+    ):
+        self.fetch_balances = fetch_balances
+        self.ttl = ttl
+        self._entries: Dict[str, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def _is_fresh(self, wallet_key: str, now: float) -> bool:
+        """Check whether the cached balance is present and not expired"""
+        entry = self._entries.get(wallet_key)
+        return entry is not None and now - entry[1] < self.ttl
+
+    def prefetch(self, wallet_keys: Iterable[str]):
+        """Refresh missing or expired balances with a single bulk request"""
+        now = time.monotonic()
+        with self._lock:
+            stale = [
+                wallet_key for wallet_key in dict.fromkeys(wallet_keys)
+                if not self._is_fresh(wallet_key, now)
+            ]
+        if not stale:
+            return
+
+        balances = self.fetch_balances(stale)
+        fetched_at = time.monotonic()
+        with self._lock:
+            for wallet_key in stale:
+                if wallet_key not in balances:
+                    logger.warning(f"No balance returned for wallet {str(wallet_key)[:8]}")
+                self._entries[wallet_key] = (
+                    balances.get(wallet_key, 0.0), fetched_at
+                )
+        logger.info(f"Fetched balances for {len(stale)} wallets")
+
+    def get(self, wallet_key: str) -> float:
+        """Get cached balance, fetching it if missing or expired"""
+        self.prefetch([wallet_key])
+        with self._lock:
+            return self._entries[wallet_key][0]
+
+    def invalidate(self, wallet_key: str):
+        """Drop cached balance, e.g. after a fill changed it"""
+        with self._lock:
+            self._entries.pop(wallet_key, None)
+
 
 class TransactionManager:
     """Handles trading transactions without Web3 dependency"""
 
-    def __init__(self):
+    def __init__(
+        self,
+        backend: Optional[SimulatedBackend] = None,
+        worker_id: Optional[int] = None,
+    ):
         self.user_agents = USER_AGENTS
+        self.backend = backend or SimulatedBackend()
+        self.id_generator = TransactionIdGenerator(worker_id)
 
     def get_random_user_agent(self) -> str:
         """Get user agent generated randomly"""
@@ -103,96 +330,281 @@ class TransactionManager:
         logger.info(f"Selected user agent: {user_agent}")
         return user_agent
 
-    def _generate_signature(self, private_key: str, message: str) -> str:
-        """Generate transaction signature"""
+    def _sign(self, private_key: str, message: str) -> bytes:
+        """Generate raw transaction signature digest"""
         key = bytes.fromhex(private_key.replace("0x", ""))
         message_bytes = message.encode("utf-8")
-        signature = hmac.new(key, message_bytes, hashlib.sha256).digest()
-        return b64encode(signature).decode("utf-8")
+        return hmac.new(key, message_bytes, hashlib.sha256).digest()
+
+    def _generate_signature(self, private_key: str, message: str) -> str:
+        """Generate transaction signature"""
+        return b64encode(self._sign(private_key, message)).decode("utf-8")
+
+    def get_balances(self, wallet_keys: List[str]) -> Dict[str, float]:
+        """Get balances for a batch of wallets in one backend request"""
+        return self.backend.get_balances(wallet_keys)
 
     def execute_trade(
         self, wallet_key: str, asset: str, direction: str, size: float, proxy: Dict
-    ) -> Dict[str, Any]:
+    ) -> TradeResult:
         """Execute trade with given parameters"""
-        try:
-            # Generate transaction ID
-            tx_id = f"tx_{int(time.time())}_{random.randint(1000, 9999)}"
-            logger.info(f"Executing trade: {tx_id} for {wallet_key} - {direction} {size} of {asset}")
-
-            # Simulate transaction validation
-            if size > 10000:
-                logger.warning(f"Trade failed for {wallet_key}: Insufficient balance")
-                return {
-                    "status": "failed",
-                    "error": "Insufficient balance",
-                    "timestamp": datetime.now().isoformat(),
-                    "tx_id": tx_id,
-                }
-
-            # Simulate transaction processing delay
-            time.sleep(random.uniform(0.5, 2.0))
-
-            # Generate signature
-            message = f"{tx_id}:{asset}:{direction}:{size}"
-            signature = self._generate_signature(wallet_key, message)
-
-            logger.info(f"Trade executed successfully: {tx_id}")
-            return {
-                "status": "success",
-                "transaction_hash": tx_id,
-                "signature": signature,
-                "timestamp": datetime.now().isoformat(),
-                "details": {
-                    "asset": asset,
-                    "direction": direction,
-                    "size": size,
-                    "wallet": wallet_key[:10] + "...",
-                },
-            }
-
-        except Exception as e:
-            logger.error(f"Trade execution failed: {str(e)}")
-            return {
-                "status": "failed",
-                "error": str(e),
-                "timestamp": datetime.now().isoformat(),
-            }
+        tx_id = 0
+        with tracer.span("execute_trade"):
+            try:
+                # Generate transaction ID
+                tx_id = self.id_generator.next_id()
+                logger.info(
+                    "Executing trade: %s for %s - %s %s of %s",
+                    format_tx_id(tx_id), wallet_key, direction, size, asset,
+                )
+
+                # Submit order to the backend (validates balance)
+                with tracer.span("submit_order"):
+                    response = self.backend.submit_order(
+                        wallet_key, asset, direction, size
+                    )
+                return self._build_result(
+                    tx_id, wallet_key, asset, direction, size, response
+                )
+
+            except Exception as e:
+                logger.error(f"Trade execution failed: {str(e)}")
+                return self._failed_result(
+                    tx_id, wallet_key, asset, direction, size, str(e)
+                )
+
+    def execute_batch(
+        self, orders: List[Dict[str, Any]], closing: bool = False
+    ) -> List[TradeResult]:
+        """
+        Execute a batch of orders in a single backend request.
+
+        Each order is a dict with the execute_trade arguments (wallet_key,
+        asset, direction, size, proxy). Results are returned in order;
+        orders fail individually, so one rejected leg does not fail the
+        others. If the request itself fails, every order fails with its error.
+        With closing, the orders close held positions (direction is the
+        closing side) instead of opening new ones.
+        """
+        if not orders:
+            return []
+
+        # An order whose ID cannot be generated fails alone and is not sent
+        tx_ids: List[int] = []
+        errors: Dict[int, str] = {}
+        for index, order in enumerate(orders):
+            try:
+                tx_id = self.id_generator.next_id()
+            except Exception as e:
+                logger.error(f"Trade execution failed: {str(e)}")
+                tx_ids.append(0)
+                errors[index] = str(e)
+                continue
+            tx_ids.append(tx_id)
+            logger.info(
+                "Executing trade: %s for %s - %s %s of %s",
+                format_tx_id(tx_id), order["wallet_key"], order["direction"],
+                order["size"], order["asset"],
+            )
+        submitted = [index for index in range(len(orders)) if index not in errors]
+
+        if closing:
+            submit, stage = self.backend.close_batch, "close_batch"
+        else:
+            submit, stage = self.backend.submit_batch, "submit_batch"
+        responses: List[Dict[str, Any]] = []
+        if submitted:
+            try:
+                with tracer.span(stage, orders=len(submitted)):
+                    responses = submit([
+                        (
+                            orders[index]["wallet_key"], orders[index]["asset"],
+                            orders[index]["direction"], orders[index]["size"],
+                        )
+                        for index in submitted
+                    ])
+            except Exception as e:
+                logger.error(
+                    f"Batch execution failed for {len(submitted)} orders: {str(e)}"
+                )
+                responses = [{"status": "failed", "error": str(e)}] * len(submitted)
+        response_for = dict(zip(submitted, responses))
+
+        results = []
+        for index, (tx_id, order) in enumerate(zip(tx_ids, orders)):
+            args = (
+                tx_id, order["wallet_key"], order["asset"],
+                order["direction"], order["size"],
+            )
+            if index in errors:
+                results.append(self._failed_result(*args, errors[index]))
+                continue
+            try:
+                results.append(self._build_result(*args, response_for[index]))
+            except Exception as e:
+                logger.error(f"Trade execution failed: {str(e)}")
+                results.append(self._failed_result(*args, str(e)))
+        return results
+
+    def _failed_result(
+        self,
+        tx_id: int,
+        wallet_key: str,
+        asset: str,
+        direction: str,
+        size: float,
+        error: str,
+    ) -> TradeResult:
+        """Build a failed trade result"""
+        return TradeResult(
+            TradeStatus.FAILED, wallet_key, asset_code(asset),
+            Direction.from_name(direction), size, tx_id=tx_id, error=error,
+        )
+
+    def _build_result(
+        self,
+        tx_id: int,
+        wallet_key: str,
+        asset: str,
+        direction: str,
+        size: float,
+        response: Dict[str, str],
+    ) -> TradeResult:
+        """Turn a backend response into a trade result, signing filled trades"""
+        if response["status"] != "success":
+            logger.warning("Trade failed for %s: %s", wallet_key, response["error"])
+            return self._failed_result(
+                tx_id, wallet_key, asset, direction, size, response["error"]
+            )
+
+        # Generate signature
+        message = f"{format_tx_id(tx_id)}:{asset}:{direction}:{size}"
+        with tracer.span("sign"):
+            signature = self._sign(wallet_key, message)
+
+        logger.info("Trade executed successfully: %s", format_tx_id(tx_id))
+        return TradeResult(
+            TradeStatus.SUCCESS, wallet_key, asset_code(asset),
+            Direction.from_name(direction), size, tx_id=tx_id, signature=signature,
+        )
 
 
 class TradingSession:
     def __init__(self, config: Dict):
         self.config = config
-        self.wallet_manager = WalletManager(config.get("keys_file", "wallet_keys.txt"))
+        self.settings: Settings = compile_settings(config)
+        settings = self.settings
+        self.wallet_manager = WalletManager(settings.keys_file)
         self.proxy_manager = ProxyManager(
-            config.get("proxy_file", "proxies.txt"), config.get("proxy_type", "regular")
+            settings.proxy_file,
+            settings.proxy_type,
+            settings.proxy_assignment,
+            settings.proxy_max_failures,
         )
-        self.transaction_manager = TransactionManager()
+        self.transaction_manager = TransactionManager(worker_id=settings.worker_id)
         self.setup_logging()
+        if settings.trace_sample_rate:
+            if settings.trace_file:
+                os.makedirs(os.path.dirname(settings.trace_file) or ".", exist_ok=True)
+            configure_tracing(
+                settings.trace_sample_rate, settings.trace_file, settings.trace_collector
+            )
         self.csv_writer = CSVWriter()
         self.active_branches = 0
-        self.thread_count = config.get("thread_count", 10)
+        # Branch IDs stay unique across runs so exposure never mixes them
+        self._branch_ids = itertools.count()
+        self.concurrency: Optional[AdaptiveConcurrencyLimiter] = None
+        self.control = SessionControl()
+        self.exposure = ExposureIndex()
+        self.risk = PreTradeRisk(self.exposure)
+        self.price_feed: Optional[MarkPriceFeed] = None
+        if settings.price_feed:
+            self.price_feed = self._build_price_feed(settings)
+        # Open positions netted from fills; created on the first fill so
+        # that NumPy only loads once trading starts
+        self.positions = None
+        self._positions_lock = threading.Lock()
+        self.lifecycle: Optional[PositionLifecycle] = None
+        if settings.position_hold_time is not None:
+            self.lifecycle = PositionLifecycle(
+                settings.position_hold_time,
+                self._close_positions,
+                batch_size=settings.position_close_batch,
+                max_retries=settings.max_retries,
+                retry_delay=settings.retry_delay,
+            )
+        self.execution_mode: Optional[str] = None
+        self._started_at: Optional[float] = None
+        self.results = ResultBuffer(settings.result_buffer_size)
+        self.balance_cache = BalanceCache(
+            lambda wallets: self.transaction_manager.get_balances(wallets),
+            ttl=settings.balance_cache_ttl,
+        )
+
+    @property
+    def thread_count(self) -> int:
+        return self.settings.thread_count
+
+    def apply_settings(self, overrides: Dict[str, Any]) -> Settings:
+        """Validate and swap in reloaded settings; running loops pick them up"""
+        previous = self.settings
+        settings = self.settings = previous.with_overrides(overrides)
+        if self.concurrency is not None:
+            # A new thread_count restarts the adaptive limit from it
+            limit = settings.thread_count
+            self.concurrency.reconfigure(
+                settings.concurrency_min, settings.concurrency_max,
+                limit if limit != previous.thread_count else None,
+            )
+        if (
+            self.price_feed is not None
+            and settings.trading_assets != previous.trading_assets
+        ):
+            # The feed prices a fixed set of assets: replace it
+            feed = self._build_price_feed(settings)
+            previous_feed, self.price_feed = self.price_feed, feed
+            # Process-mode workers keep reading the assets they started with
+            feed.mirror = previous_feed.mirror
+            if previous_feed.running:
+                previous_feed.stop()
+                feed.start()
+        return settings
+
+    @staticmethod
+    def _build_price_feed(settings: Settings) -> MarkPriceFeed:
+        """Mark price feed for the traded assets, from the configured source"""
+        return MarkPriceFeed(
+            settings.trading_assets,
+            create_source(
+                settings.price_feed, settings.trading_assets,
+                settings.price_replay_speed,
+            ),
+            settings.price_poll_interval,
+        )
 
     def setup_logging(self):
         """Setup logging configuration"""
-        if self.config.get('enable_logs', True):
+        if self.settings.enable_logs:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             log_filename = f"trading_{len(self.wallet_manager.wallets)}_{timestamp}.txt"
-            file_handler = logging.FileHandler(log_filename)
+            os.makedirs(LOG_DIR, exist_ok=True)
+            archive_finished_logs("trading_*_*.txt")
+            file_handler = rotating_file_handler(os.path.join(LOG_DIR, log_filename))
             file_handler.setFormatter(logging.Formatter('%(asctime)s - %(message)s'))
             logger.addHandler(file_handler)
 
     def execute_branch_trading(self):
         """Execute trading with branches"""
-        branch_range = self.config.get("branch_wallet_range", (2, 5))
-        max_branches = self.config.get("max_parallel_branches", 5)
-
         wallets = self.wallet_manager.wallets.copy()
-        if self.config.get("enable_shuffling", True):
+        if self.settings.enable_shuffling:
             random.shuffle(wallets)
 
         self.active_branches = 0
-        while wallets and self.active_branches < max_branches:
-            branch_size = random.randint(*branch_range)
+        # Limits are re-read per branch so a settings reload applies mid-run
+        while wallets and self.active_branches < self.settings.max_parallel_branches:
+            if not self.control.proceed():
+                break
+            branch_size = random.randint(*self.settings.branch_wallet_range)
             if len(wallets) < branch_size:
                 break
 
@@ -203,135 +615,719 @@ class TradingSession:
             long_count = random.randint(1, branch_size - 1)
             short_count = branch_size - long_count
 
-            self._process_branch(branch_wallets, long_count, short_count)
+            self._process_branch(
+                branch_wallets, long_count, short_count, next(self._branch_ids)
+            )
             self.active_branches += 1
 
     def execute_parallel_trading(self):
         """Execute trading in parallel threads"""
-        thread_count = self.config.get("thread_count", 10)
-        delay_range = self.config.get("launch_delay", (0, 3600))
-
+        settings = self.settings
         wallets = self.wallet_manager.wallets.copy()
-        if self.config.get("enable_shuffling", True):
+        if settings.enable_shuffling:
             random.shuffle(wallets)
 
-        for i in range(0, len(wallets), thread_count):
-            batch = wallets[i : i + thread_count]
-            for wallet in batch:
-                delay = random.uniform(delay_range[0], delay_range[1])
-                time.sleep(delay)
-                self._process_wallet(wallet)
+        # In-flight trades are capped by an adaptive limit that starts at
+        # thread_count and follows observed latency and errors
+        self.concurrency = AdaptiveConcurrencyLimiter(
+            initial_limit=settings.thread_count,
+            min_limit=settings.concurrency_min,
+            max_limit=settings.concurrency_max,
+            latency_target=settings.latency_target_p95,
+            timeout=settings.trade_timeout,
+        )
 
-    def _process_wallet(self, wallet_key: str):
-        """Process individual wallet"""
-        if not self.wallet_manager.wallets:
+        # Slots are taken before submitting, so the pool only starts threads
+        # for admitted trades and may grow up to any reloaded concurrency_max
+        futures = []
+        with ThreadPoolExecutor(
+            max_workers=MAX_CONCURRENCY, thread_name_prefix="trade"
+        ) as executor:
+            # Batch size and delays are re-read per batch so a settings
+            # reload applies mid-run
+            i = 0
+            while i < len(wallets) and self.control.proceed():
+                batch = wallets[i : i + self.settings.thread_count]
+                i += len(batch)
+                # Orders are planned at the marks of their batch
+                quotes = self._quotes()
+                self.balance_cache.prefetch(batch)
+                for wallet in batch:
+                    delay = random.uniform(*self.settings.launch_delay)
+                    time.sleep(delay)
+                    if not self.control.proceed():
+                        break
+                    self.concurrency.acquire()
+                    self.control.queue()
+                    futures.append(
+                        executor.submit(self._process_wallet_limited, wallet, quotes)
+                    )
+
+        for future in futures:
+            if future.exception() is not None:
+                logger.error(f"Wallet processing failed: {future.exception()}")
+        logger.info("Concurrency: %s", self.concurrency.metrics())
+
+    def _process_wallet_limited(
+        self, wallet_key: str, quotes: Optional[Dict[str, float]] = None
+    ):
+        """Process wallet in a concurrency slot acquired by the launcher"""
+        if not self.control.proceed():
+            self.concurrency.abandon()
+            self.control.skip()
             return
+        self.control.start(queued=True)
+        started = time.monotonic()
+        success = False
+        try:
+            result = self._process_wallet(wallet_key, quotes)
+            # Refused orders are the wallet's problem, not a sign of overload
+            success = result is None or result.success or result.rejected
+        finally:
+            self.concurrency.release(time.monotonic() - started, success)
+            self.control.finish()
+
+    def execute_process_trading(self, pool: Optional[Dict[str, Any]] = None):
+        """
+        Execute trading in worker processes that report through shared memory.
 
-        wallet_index = self.wallet_manager.wallets.index(wallet_key)
-        wallet = self.wallet_manager.get_next_wallet(wallet_index)
-        if not wallet:
-            logger.error(f"[ERROR] Wallet with the index {wallet_index} was not found.")
+        run_session forks the workers (pool) before starting its own threads;
+        without a pool they are forked here.
+        """
+        if "fork" not in multiprocessing.get_all_start_methods():
+            logger.error("Process mode needs fork; falling back to parallel trading.")
+            self.execute_parallel_trading()
             return
+        if pool is None:
+            pool = self._start_workers()
+        if pool is not None:
+            self._collect_workers(pool)
+
+    def _start_workers(self) -> Optional[Dict[str, Any]]:
+        """
+        Fork the worker processes of process mode, None if there is no work.
+
+        A forked child keeps only the forking thread, so locks held by any
+        other thread at that moment stay locked in the child for good. Call
+        this before the session starts its threads (status server, price
+        feed, position closer).
+        """
+        settings = self.settings
+        indices = list(range(len(self.wallet_manager.wallets)))
+        if settings.enable_shuffling:
+            random.shuffle(indices)
+        count = min(settings.process_count or os.cpu_count() or 1, MAX_PROCESSES)
+        count = min(count, len(indices))
+        if not count:
+            return None
+        if settings.max_net_exposure is not None:
+            logger.warning(
+                "Process mode gates max_net_exposure per worker process, "
+                "against that worker's own fills"
+            )
+        # Intern assets before forking so that codes match across processes
+        for asset in settings.trading_assets:
+            asset_code(asset)
 
-        proxy = self.proxy_manager.get_proxy(wallet_index)
+        # Ring records carry proxy indices into this list, which proxies
+        # removed later on either side do not shift
+        proxies = list(self.proxy_manager.proxies)
+        context = multiprocessing.get_context("fork")
+        running, draining = context.Event(), context.Event()
+        running.set()
+        rings = [
+            ResultRing(settings.result_ring_capacity, context) for _ in range(count)
+        ]
+        prices = None
+        if self.price_feed is not None:
+            # Workers trade at the marks of this process's feed
+            prices = SharedPriceSource(settings.trading_assets, context)
+            self.price_feed.mirror = prices
+        pool = {
+            "workers": [], "rings": rings, "proxies": proxies,
+            "running": running, "draining": draining, "prices": prices,
+        }
+        try:
+            for worker, ring in enumerate(rings):
+                process = context.Process(
+                    target=self._run_worker,
+                    args=(
+                        worker, indices[worker::count], proxies, ring, running,
+                        draining, prices,
+                    ),
+                    name=f"trade-worker-{worker}",
+                    daemon=True,
+                )
+                process.start()
+                pool["workers"].append(process)
+        except BaseException:
+            self._stop_workers(pool)
+            raise
+        return pool
+
+    def _collect_workers(self, pool: Dict[str, Any]):
+        """Record worker results until every worker has exited"""
+        workers, rings, proxies = pool["workers"], pool["rings"], pool["proxies"]
+        running, draining = pool["running"], pool["draining"]
+        try:
+            while True:
+                # Checked before draining: once every worker has exited,
+                # this pass collects their last records
+                done = not any(process.is_alive() for process in workers)
+                drained = sum(self._drain_ring(ring, proxies) for ring in rings)
+                if done:
+                    break
+                # Workers follow the session's pause/resume/drain state
+                state = self.control.state
+                if state == "draining":
+                    draining.set()
+                if state == "paused":
+                    running.clear()
+                else:
+                    running.set()
+                if not drained:
+                    time.sleep(0.001)
+
+            for process in workers:
+                process.join()
+                if process.exitcode:
+                    logger.error(f"{process.name} exited with code {process.exitcode}")
+        finally:
+            self._stop_workers(pool)
+
+    def _stop_workers(self, pool: Dict[str, Any]):
+        """Stop workers that are still running and release their rings (once)"""
+        rings = pool.pop("rings", None)
+        if rings is None:
+            return
+        pool["draining"].set()
+        pool["running"].set()
+        for process in pool["workers"]:
+            if process.is_alive():
+                process.terminate()
+            process.join()
+        for ring in rings:
+            ring.close()
+        if pool["prices"] is not None and self.price_feed is not None:
+            self.price_feed.mirror = None
 
-        # Execute trade based on configuration
-        asset = random.choice(self.config.get("trading_assets", ["BTC", "ETH", "SOL"]))
-        direction = self._get_trade_direction()
-        size = self._get_trade_size()
+    def _drain_ring(self, ring: ResultRing, proxies: List[Dict]) -> int:
+        """Record results waiting in a worker's ring, return how many"""
+        results = []
+        for result, proxy_index in ring.drain(self.wallet_manager.wallets):
+            proxy = proxies[proxy_index] if proxy_index is not None else None
+            self._record_result(result.wallet, result, "Wallet", proxy, routed=False)
+            results.append(result)
+        self._book_fills(results)
+        return len(results)
 
-        result = self.transaction_manager.execute_trade(
-            wallet_key, asset, direction, size, proxy
+    def _run_worker(
+        self,
+        worker: int,
+        indices: List[int],
+        proxies: List[Dict],
+        ring: ResultRing,
+        running: Any,
+        draining: Any,
+        prices: Optional[SharedPriceSource],
+    ):
+        """Worker process: trade the wallets at indices, write results to ring"""
+        settings = self.settings
+        # Own transaction ID process number: after an explicit worker_id,
+        # otherwise a claimed one
+        id_generator = self.transaction_manager.id_generator
+        process_id = None
+        if settings.worker_id is not None:
+            process_id = id_generator.process_id + 1 + worker
+        self.transaction_manager.id_generator = TransactionIdGenerator(
+            process_id, id_generator.lane_bits
         )
+        if prices is not None:
+            # Follow the parent's marks; its feed starts after the fork
+            self.price_feed = MarkPriceFeed(
+                settings.trading_assets, prices, settings.price_poll_interval
+            )
+            self.price_feed.start()
+            if not self.price_feed.wait_ready(settings.price_max_age):
+                logger.warning("No price for every asset yet; trades on them are blocked")
+        wallets = self.wallet_manager.wallets
+        proxy_indices = {id(proxy): i for i, proxy in enumerate(proxies)}
 
-        # Record trade result using CSVWriter
-        trade_data = {
-            'timestamp': result.get('timestamp', datetime.now().isoformat()),
-            'wallet': wallet_key,
-            'direction': direction,
-            'size': size,
-            'status': result.get('status', 'unknown'),
-            'active_branches': self.active_branches,
-            'thread_count': self.thread_count,
-            'transaction_hash': result.get('transaction_hash', ''),
-            'error': result.get('error', '')
-        }
-        self.csv_writer.record_trade(trade_data)
+        def trade(index: int, quotes: Optional[Dict[str, float]]):
+            wallet = wallets[index]
+            with tracer.trace("trade", mode="process", worker=worker) as span:
+                asset = random.choice(self.settings.trading_assets)
+                direction = self._get_trade_direction()
+                size = self._get_trade_size(self.balance_cache.get(wallet))
+                span.set(wallet_index=index, asset=asset, direction=direction)
+                order = self._plan_order(wallet, asset, direction, size, quotes)
+                if self._risk_check([order])[0]:
+                    span.set(status="rejected")
+                    return
+                reserved = order.get("reserved", 0.0)
+                try:
+                    proxy = self.proxy_manager.get_proxy(index)
+                    result = self.transaction_manager.execute_trade(
+                        wallet, asset, direction, size, proxy
+                    )
+                except Exception:
+                    self.exposure.release(asset_code(asset), reserved)
+                    raise
+                # The parent records the result too; this process's index
+                # keeps its own fills so that its later checks see them
+                self._settle_exposure(result, reserved)
+                # Frees the proxy for this process's own assignment
+                self.proxy_manager.record_outcome(proxy, result)
+                with tracer.span("record"):
+                    ring.write(result, index, proxy_indices.get(id(proxy)))
+
+        futures = []
+        with ThreadPoolExecutor(
+            max_workers=min(settings.thread_count, settings.concurrency_max),
+            thread_name_prefix="trade",
+        ) as executor:
+            for start in range(0, len(indices), settings.thread_count):
+                batch = indices[start : start + settings.thread_count]
+                quotes = self._quotes()
+                self.balance_cache.prefetch([wallets[index] for index in batch])
+                for index in batch:
+                    time.sleep(random.uniform(*settings.launch_delay))
+                    running.wait()
+                    if draining.is_set():
+                        break
+                    futures.append(executor.submit(trade, index, quotes))
+                if draining.is_set():
+                    break
+
+        for future in futures:
+            if future.exception() is not None:
+                logger.error(f"Wallet processing failed: {future.exception()}")
+
+    def _process_wallet(
+        self, wallet_key: str, quotes: Optional[Dict[str, float]] = None
+    ) -> Optional[TradeResult]:
+        """Process individual wallet (quotes: marks the order is planned at)"""
+        if not self.wallet_manager.wallets:
+            return None
+
+        with tracer.trace("trade", mode="parallel") as span:
+            with tracer.span("select_wallet"):
+                wallet_index = self.wallet_manager.wallets.index(wallet_key)
+                wallet = self.wallet_manager.get_next_wallet(wallet_index)
+            if not wallet:
+                logger.error(f"[ERROR] Wallet with the index {wallet_index} was not found.")
+                return None
 
-        if self.config.get('enable_logs', True):
-            logger.info(f"Wallet {wallet_key[:8]}: {result}")
+            # Execute trade based on configuration
+            with tracer.span("size"):
+                asset = random.choice(self.settings.trading_assets)
+                direction = self._get_trade_direction()
+                size = self._get_trade_size(self.balance_cache.get(wallet_key))
+            span.set(wallet_index=wallet_index, asset=asset, direction=direction)
+            if quotes is None:
+                quotes = self._quotes()
+            order = self._plan_order(wallet_key, asset, direction, size, quotes)
+            if self._risk_check([order])[0]:
+                span.set(status="rejected")
+                return None
+            reserved = order.get("reserved", 0.0)
 
-    def _process_branch(self, wallets: List[str], long_count: int, short_count: int):
+            try:
+                with tracer.span("get_proxy"):
+                    proxy = self.proxy_manager.get_proxy(wallet_index)
+                result = self.transaction_manager.execute_trade(
+                    wallet_key, asset, direction, size, proxy
+                )
+            except Exception:
+                self.exposure.release(asset_code(asset), reserved)
+                raise
+            span.set(status=TradeStatus(result.status).name.lower())
+            self._record_result(wallet_key, result, "Wallet", proxy, reserved=reserved)
+            self._book_fills([result])
+            return result
+
+    def _process_branch(
+        self,
+        wallets: List[str],
+        long_count: int,
+        short_count: int,
+        branch: Optional[int] = None,
+    ):
         """Process branch of wallets"""
-        total_size = self._get_trade_size()
+        with tracer.trace("branch", branch=branch, legs=len(wallets)) as span:
+            # One bulk balance request per branch; the branch size is a share
+            # of the smallest balance so that every leg stays affordable
+            quotes = self._quotes()
+            with tracer.span("prefetch_balances"):
+                self.balance_cache.prefetch(wallets)
+                total_size = self._get_trade_size(
+                    min(self.balance_cache.get(wallet) for wallet in wallets)
+                )
+
+            # All legs trade one asset so that they offset each other, and are
+            # known up front, so the branch goes out as one batch
+            asset = random.choice(self.settings.trading_assets)
+            span.set(asset=asset)
+            legs = []
+            if long_count > 0:
+                long_size = total_size / long_count
+                legs += [(wallet, "long", long_size) for wallet in wallets[:long_count]]
+            if short_count > 0:
+                short_size = total_size / short_count
+                legs += [(wallet, "short", short_size) for wallet in wallets[long_count:]]
+
+            # Legs offset each other, so one rejected leg stops the branch
+            checked = [
+                self._plan_order(wallet, asset, direction, size, quotes)
+                for wallet, direction, size in legs
+            ]
+            reasons = self._risk_check(checked)
+            reserved = [order.get("reserved", 0.0) for order in checked]
+            if any(reasons):
+                span.set(status="rejected")
+                logger.warning(
+                    f"Skipping branch {branch}: pre-trade checks rejected a leg"
+                )
+                self.exposure.release(asset_code(asset), sum(reserved))
+                return
+
+            try:
+                orders = [
+                    self._build_order(wallet, direction, size, asset)
+                    for wallet, direction, size in legs
+                ]
+                self.control.start(len(orders))
+                try:
+                    with tracer.span("execute_batch"):
+                        results = self.transaction_manager.execute_batch(orders)
+                finally:
+                    self.control.finish(len(orders))
+            except Exception:
+                self.exposure.release(asset_code(asset), sum(reserved))
+                raise
+            for order, result, leg_reserved in zip(orders, results, reserved):
+                self._record_result(
+                    order["wallet_key"], result, proxy=order["proxy"], branch=branch,
+                    reserved=leg_reserved,
+                )
+            self._book_fills(results)
 
-        # Process long positions
-        if long_count > 0:
-            long_size = total_size / long_count
-            for wallet in wallets[:long_count]:
-                self._process_wallet_with_size(wallet, "long", long_size)
+    def _risk_check(self, orders: List[Dict[str, Any]]) -> List[Optional[str]]:
+        """Run the pre-trade rules over planned orders, log the rejected ones"""
+        settings = self.settings
+        prices = price_ages = None
+        if self.price_feed is not None:
+            # One snapshot read per batch, no lock and no fetch
+            snapshot = self.price_feed.snapshot
+            prices, price_ages = snapshot.prices, snapshot.ages()
+        with tracer.span("risk_check", orders=len(orders)):
+            wallets = [order["wallet_key"] for order in orders]
+            reasons = self.risk.check(
+                orders,
+                [self.balance_cache.get(wallet) for wallet in wallets],
+                max_net_exposure=settings.max_net_exposure,
+                open_notional=self._open_notional(wallets),
+                max_leverage=settings.max_leverage,
+                slippage_tolerance=settings.slippage_tolerance,
+                prices=prices,
+                price_ages=price_ages,
+                max_price_age=settings.price_max_age,
+            )
+        for order, reason in zip(orders, reasons):
+            if reason:
+                logger.warning(
+                    "Rejected %s %.2f of %s for %s: %s check failed",
+                    order["direction"], order["size"], order["asset"],
+                    order["wallet_key"][:8], reason,
+                )
+        return reasons
 
-        # Process short positions
-        if short_count > 0:
-            short_size = total_size / short_count
-            for wallet in wallets[long_count:]:
-                self._process_wallet_with_size(wallet, "short", short_size)
+    def _quotes(self) -> Optional[Dict[str, float]]:
+        """Current marks, taken when orders are planned; None without a feed"""
+        if self.price_feed is None:
+            return None
+        return self.price_feed.snapshot.prices
+
+    def _plan_order(
+        self,
+        wallet: str,
+        asset: str,
+        direction: str,
+        size: float,
+        quotes: Optional[Dict[str, float]] = None,
+    ) -> Dict[str, Any]:
+        """Order dict for the pre-trade check, priced at the planning mark"""
+        order = {
+            "wallet_key": wallet, "asset": asset,
+            "direction": direction, "size": size,
+        }
+        if quotes and asset in quotes:
+            order["price"] = quotes[asset]
+        return order
 
     def _get_trade_direction(self) -> str:
         """Determine trade direction based on configuration"""
-        direction_config = self.config.get("position_direction", "random")
+        direction_config = self.settings.position_direction
         if direction_config == "random":
             return random.choice(["long", "short"])
         return direction_config
 
-    def _get_trade_size(self) -> float:
-        """Determine trade size based on configuration"""
-        volume_range = self.config.get("volume_percentage_range", (10, 50))
-        return random.uniform(*volume_range)
+    def _get_trade_size(self, balance: float) -> float:
+        """Determine trade size as a percentage of the wallet balance"""
+        return balance * random.uniform(*self.settings.volume_percentage_range) / 100
 
-    def _process_wallet_with_size(
-        self, wallet: str, direction: str, size: float
+    def _build_order(
+        self, wallet: str, direction: str, size: float, asset: Optional[str] = None
     ) -> Dict[str, Any]:
-        """Process wallet with specific size and return result"""
-        proxy = self.proxy_manager.get_proxy(self.wallet_manager.wallets.index(wallet))
-        asset = random.choice(self.config.get("trading_assets", ["BTC", "ETH", "SOL"]))
+        """Build order for wallet with specific direction and size"""
+        wallet_index = self.wallet_manager.wallets.index(wallet)
+        with tracer.span("get_proxy"):
+            proxy = self.proxy_manager.get_proxy(wallet_index)
+        if asset is None:
+            asset = random.choice(self.settings.trading_assets)
+        return {
+            "wallet_key": wallet,
+            "asset": asset,
+            "direction": direction,
+            "size": size,
+            "proxy": proxy,
+        }
 
-        result = self.transaction_manager.execute_trade(
-            wallet, asset, direction, size, proxy
-        )
+    def _record_result(
+        self,
+        wallet: str,
+        result: TradeResult,
+        label: str = "Branch trade - Wallet",
+        proxy: Optional[Dict] = None,
+        branch: Optional[int] = None,
+        closing: bool = False,
+        reserved: float = 0.0,
+        routed: bool = True,
+    ):
+        """
+        Record trade result to caches, exposure, proxy health, CSV and log.
+
+        reserved is the exposure the order reserved in its pre-trade check;
+        routed is False for results of trades a worker process routed.
+        """
+        self._settle_exposure(result, reserved, branch)
+        if result.success:
+            self.balance_cache.invalidate(wallet)
+            if self.lifecycle is not None and not closing:
+                self.lifecycle.hold(
+                    wallet, asset_name(result.asset),
+                    Direction(result.direction).label, result.size, branch,
+                )
+        self.results.append(result)
+        if proxy and routed:
+            self.proxy_manager.record_outcome(proxy, result)
+        elif proxy:
+            self.proxy_manager.record_health(proxy, result)
 
         # Record trade result to CSV
-        self.csv_writer.record_trade({
-            'timestamp': result.get('timestamp', datetime.now().isoformat()),
-            'wallet': wallet,
-            'direction': direction,
-            'size': size,
-            'status': result.get('status', 'unknown'),
-            'active_branches': self.active_branches,
-            'thread_count': self.thread_count,
-            'transaction_hash': result.get('transaction_hash', ''),
-            'error': result.get('error', '')
-        })
+        with tracer.span("record"):
+            self.csv_writer.record_result(result, self.active_branches, self.thread_count)
+
+            if self.settings.enable_logs:
+                logger.info("%s %s: %s", label, wallet[:8], result)
+
+    def _settle_exposure(
+        self, result: TradeResult, reserved: float = 0.0, branch: Optional[int] = None
+    ):
+        """Add a fill to the exposure index, or drop the reservation of a failure"""
+        if result.success:
+            self.exposure.record_fill(
+                result.asset, result.direction, result.size, branch, reserved
+            )
+        else:
+            self.exposure.release(result.asset, reserved)
 
-        if self.config.get('enable_logs', True):
-            logger.info(f"Branch trade - Wallet {wallet[:8]}: {result}")
+    def _book_fills(self, results: List[TradeResult]):
+        """Net the successful fills among results into the position book"""
+        fills = [result for result in results if result.success]
+        if not fills:
+            return
+        assets = [asset_name(result.asset) for result in fills]
+        # Fills are booked at the mark price; without a price feed at a unit
+        # price, so sizes stay quote-currency notionals
+        marks = self.price_feed.snapshot.prices if self.price_feed else {}
+        with self._positions_lock:
+            if self.positions is None:
+                from position_book import PositionBook  # Deferred: loads NumPy
+
+                self.positions = PositionBook(self.settings.trading_assets)
+            self.positions.apply_fills(
+                [result.wallet for result in fills],
+                assets,
+                [Direction(result.direction).label for result in fills],
+                [result.size for result in fills],
+                [marks.get(asset, 1.0) for asset in assets],
+                [self.settings.leverage] * len(fills),
+            )
+
+    def _close_positions(self, positions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Close held positions in one backend request, return those that failed"""
+        with tracer.trace("close", positions=len(positions)):
+            orders = [
+                self._build_order(
+                    position["wallet_key"],
+                    OPPOSITE_DIRECTIONS[position["direction"]],
+                    position["size"],
+                    position["asset"],
+                )
+                for position in positions
+            ]
+            self.control.start(len(orders))
+            try:
+                results = self.transaction_manager.execute_batch(orders, closing=True)
+            finally:
+                self.control.finish(len(orders))
+            failed = []
+            for position, order, result in zip(positions, orders, results):
+                self._record_result(
+                    order["wallet_key"], result, "Close", order["proxy"],
+                    position["branch"], closing=True,
+                )
+                if not result.success:
+                    failed.append(position)
+            self._book_fills(results)
+            return failed
+
+    def status(self) -> Dict[str, Any]:
+        """Live session state, as served by the status endpoint"""
+        results = self.results
+        elapsed = time.monotonic() - self._started_at if self._started_at else 0.0
+        errors = Counter(r.error for r in list(results.recent) if not r.success)
+        return {
+            "state": self.control.state,
+            "execution_mode": self.execution_mode,
+            "active_branches": self.active_branches,
+            "trades": {
+                "queued": self.control.queued,
+                "in_flight": self.control.in_flight,
+                "completed": results.total,
+                "succeeded": results.succeeded,
+                "failed": results.failed,
+                "volume": results.volume,
+            },
+            "elapsed_s": elapsed,
+            "throughput_per_s": results.total / elapsed if elapsed else 0.0,
+            "recent_errors": dict(errors),
+            "concurrency": self.concurrency.metrics() if self.concurrency else None,
+            "exposure": self.exposure.by_asset(),
+            "risk_rejections": dict(self.risk.rejected),
+            "positions": self._position_stats(),
+            "open_positions": self._open_positions(),
+            "prices": self.price_feed.metrics() if self.price_feed else None,
+            "unbalanced_branches": self.exposure.unbalanced_branches(),
+            "proxies": self.proxy_manager.health(),
+        }
+
+    def _position_stats(self) -> Optional[Dict[str, int]]:
+        """Open/close counts of the position lifecycle, None if it is off"""
+        lifecycle = self.lifecycle
+        if lifecycle is None:
+            return None
+        return {
+            "open": lifecycle.open_count,
+            "opened": lifecycle.opened,
+            "closed": lifecycle.closed,
+            "abandoned": lifecycle.abandoned,
+            "close_requests": lifecycle.close_requests,
+        }
 
-        return result
+    def _open_notional(self, wallets: List[str]) -> Optional[List[float]]:
+        """Open notional of each wallet's booked positions at mark prices"""
+        marks = self.price_feed.snapshot.prices if self.price_feed else {}
+        with self._positions_lock:
+            book = self.positions
+            if book is None:
+                return None
+            per_wallet = book.notional_by_wallet(book.price_vector(marks))
+            codes = book.wallet_codes
+            return [
+                float(per_wallet[codes[wallet]]) if wallet in codes else 0.0
+                for wallet in wallets
+            ]
+
+    def _open_positions(self) -> int:
+        """Non-flat rows of the position book"""
+        with self._positions_lock:
+            return len(self.positions) if self.positions is not None else 0
+
+    def start_status_server(self, port: int = 0) -> StatusServer:
+        """Serve status() and pause/resume/drain commands on localhost"""
+        server = StatusServer(self.status, self.control, port=port)
+        server.start()
+        return server
 
     def run_session(self, execution_mode: str = "branch"):
         """Run the trading session based on the execution mode"""
         logger.info(f"Running session with execution mode: {execution_mode}")  # Ou
-        if execution_mode == "branch":
-            logger.info("Execution mode is 'branch', proceeding with branch trading.")
-            self.execute_branch_trading()
-        elif execution_mode == "parallel":
-            logger.info("Execution mode is 'parallel', proceeding with parallel trading.")
-            self.execute_parallel_trading()
-        else:
-            logger.error(f"Invalid execution mode: {execution_mode}")
+        self.execution_mode = execution_mode
+        self._started_at = time.monotonic()
+        status_server = None
+        pool = None
+        try:
+            if self.settings.proxy_preflight:
+                self.proxy_manager.preflight(
+                    self.settings.proxy_preflight_timeout,
+                    self.settings.proxy_preflight_parallelism,
+                )
+                if not self.proxy_manager.proxies:
+                    logger.error("[ERROR] No reachable proxy servers, session aborted.")
+                    return
+            if (
+                execution_mode == "process"
+                and "fork" in multiprocessing.get_all_start_methods()
+            ):
+                # Workers must fork before any of the threads below exist
+                pool = self._start_workers()
+            if self.settings.status_port is not None:
+                status_server = self.start_status_server(self.settings.status_port)
+            if self.price_feed is not None:
+                self.price_feed.start()
+                if not self.price_feed.wait_ready(self.settings.price_max_age):
+                    logger.warning(
+                        "No price for every asset yet; trades on them are blocked"
+                    )
+            if self.lifecycle is not None:
+                self.lifecycle.start()
+
+            if execution_mode == "branch":
+                logger.info("Execution mode is 'branch', proceeding with branch trading.")
+                self.execute_branch_trading()
+            elif execution_mode == "parallel":
+                logger.info(
+                    "Execution mode is 'parallel', proceeding with parallel trading."
+                )
+                self.execute_parallel_trading()
+            elif execution_mode == "process":
+                logger.info(
+                    "Execution mode is 'process', proceeding with worker processes."
+                )
+                self.execute_process_trading(pool)
+            else:
+                logger.error(f"Invalid execution mode: {execution_mode}")
+            if self.lifecycle is not None:
+                # Held positions close when their hold time is up
+                logger.info(
+                    f"Waiting for {self.lifecycle.open_count} open position(s) to close"
+                )
+                self.lifecycle.wait()
+        finally:
+            if pool is not None:
+                self._stop_workers(pool)
+            if self.lifecycle is not None:
+                self.lifecycle.stop()
+            if self.price_feed is not None:
+                self.price_feed.stop()
+            if status_server is not None:
+                status_server.stop()
 
 
 if __name__ == "__main__":
+    init_runtime()
     session = TradingSession(TRADING_CONFIG)
     execution_mode=TRADING_CONFIG.get("execution_mode")
     session.run_session(execution_mode=execution_mode)
@@ -1,13 +1,31 @@
 import csv
 import os
 import logging
+import threading
 from datetime import datetime
 from typing import Dict, Any
 
+from trade_result import TradeResult
+
+FIELDNAMES = [
+    'timestamp', 'wallet', 'asset', 'direction', 'size', 'status',
+    'active_branches', 'thread_count', 'transaction_hash', 'error'
+]
+
 class CSVWriter:
     def __init__(self):
-        self.csv_file = self._setup_csv_file()
-        
+        self._csv_file = None
+        self._lock = threading.Lock()
+
+    @property
+    def csv_file(self) -> str:
+        """CSV file path; the file is created on first access"""
+        if self._csv_file is None:
+            with self._lock:
+                if self._csv_file is None:
+                    self._csv_file = self._setup_csv_file()
+        return self._csv_file
+
     def _setup_csv_file(self) -> str:
         """Setup CSV file for recording trade results"""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -19,11 +37,7 @@ class CSVWriter:
 
         # Write CSV header
         with open(csv_path, 'w', newline='') as csvfile:
-            fieldnames = [
-                'timestamp', 'wallet', 'direction', 'size', 'status',
-                'active_branches', 'thread_count', 'transaction_hash', 'error'
-            ]
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+            writer = csv.DictWriter(csvfile, fieldnames=FIELDNAMES)
             writer.writeheader()
 
         logging.info(f"Created CSV file for trade results: {csv_path}")
@@ -31,10 +45,14 @@ class CSVWriter:
 
     def record_trade(self, trade_data: Dict[str, Any]):
         """Record trade result to CSV file"""
-        with open(self.csv_file, 'a', newline='') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=[
-                'timestamp', 'wallet', 'direction', 'size', 'status',
-                'active_branches', 'thread_count', 'transaction_hash', 'error'
-            ])
+        csv_file = self.csv_file
+        with self._lock, open(csv_file, 'a', newline='') as csvfile:
+            writer = csv.DictWriter(csvfile, fieldnames=FIELDNAMES)
             writer.writerow(trade_data)
-            logging.info(f"Recorded trade result to CSV: {trade_data}") 
\ No newline at end of file
+            logging.info("Recorded trade result to CSV: %s", trade_data)
+
+    def record_result(
+        self, result: TradeResult, active_branches: int, thread_count: int
+    ):
+        """Format trade result and record it to CSV file"""
+        self.record_trade(result.to_row(active_branches, thread_count))
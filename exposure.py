@@ -0,0 +1,124 @@
+import threading
+
+from typing import Dict, List, Optional
+
+from trade_result import asset_code, asset_name
+
+
+class ExposureIndex:
+    """
+    Running net exposure per asset and per branch.
+
+    Every fill adds its signed notional (long positive, short negative) to
+    the totals of its asset and branch, so updates and queries are O(1)
+    and never rescan the result history. Orders admitted by allows hold a
+    reservation until their fill or failure is recorded, so concurrent
+    orders cannot all pass against the same filled exposure.
+    """
+
+    def __init__(self):
+        # Per asset code: [net, gross]
+        self._assets: Dict[int, List[float]] = {}
+        # Per branch: [asset code, net, gross, fills]
+        self._branches: Dict[int, List[float]] = {}
+        # Per asset code: signed notional of admitted orders not yet settled
+        self._pending: Dict[int, float] = {}
+        self.rejected = 0
+        self._lock = threading.Lock()
+
+    def record_fill(
+        self,
+        asset: int,
+        direction: int,
+        size: float,
+        branch: Optional[int] = None,
+        reserved: float = 0.0,
+    ):
+        """
+        Add a filled trade (asset code, Direction sign, notional size),
+        settling the reservation it was admitted under.
+        """
+        signed = direction * size
+        with self._lock:
+            if reserved:
+                self._pending[asset] -= reserved
+            totals = self._assets.get(asset)
+            if totals is None:
+                totals = self._assets[asset] = [0.0, 0.0]
+            totals[0] += signed
+            totals[1] += size
+            if branch is not None:
+                entry = self._branches.get(branch)
+                if entry is None:
+                    entry = self._branches[branch] = [asset, 0.0, 0.0, 0]
+                entry[1] += signed
+                entry[2] += size
+                entry[3] += 1
+
+    def release(self, asset: int, reserved: float):
+        """Drop the reservation of an admitted order that did not fill"""
+        if reserved:
+            with self._lock:
+                self._pending[asset] -= reserved
+
+    def net(self, asset: str) -> float:
+        """Net signed exposure of asset (long minus short notional)"""
+        totals = self._assets.get(asset_code(asset))
+        return totals[0] if totals else 0.0
+
+    def reserved(self, asset: str) -> float:
+        """Signed notional reserved by admitted orders of asset not yet settled"""
+        return self._pending.get(asset_code(asset), 0.0)
+
+    def allows(self, asset: str, delta: float, limit: Optional[float]) -> bool:
+        """
+        Whether orders changing asset exposure by delta stay within limit.
+
+        Filled exposure and the reservations of admitted orders both count.
+        Orders that do not grow the absolute net exposure are always
+        allowed, so an imbalanced book can still be brought back. Allowed
+        orders reserve delta (when a limit is set); the caller settles it
+        through record_fill or release.
+        """
+        if limit is None:
+            return True
+        code = asset_code(asset)
+        with self._lock:
+            totals = self._assets.get(code)
+            current = (totals[0] if totals else 0.0) + self._pending.get(code, 0.0)
+            new = abs(current + delta)
+            # Tolerance for float error on legs that offset exactly
+            if new <= limit or new <= abs(current) + 1e-9:
+                self._pending[code] = self._pending.get(code, 0.0) + delta
+                return True
+            self.rejected += 1
+        return False
+
+    def by_asset(self) -> Dict[str, Dict[str, float]]:
+        """Net and gross exposure plus imbalance (|net| / gross) per asset"""
+        with self._lock:
+            return {
+                asset_name(code): {
+                    "net": net,
+                    "gross": gross,
+                    "imbalance": abs(net) / gross if gross else 0.0,
+                }
+                for code, (net, gross) in self._assets.items()
+            }
+
+    def branch(self, branch: int) -> Optional[Dict[str, float]]:
+        """Exposure of one branch, None if it has no fills"""
+        with self._lock:
+            entry = self._branches.get(branch)
+            if entry is None:
+                return None
+            code, net, gross, fills = entry
+            return {"asset": asset_name(code), "net": net, "gross": gross, "fills": fills}
+
+    def unbalanced_branches(self, tolerance: float = 1e-9) -> List[int]:
+        """Branches whose filled legs do not offset (e.g. after a failed leg)"""
+        with self._lock:
+            return [
+                branch for branch, entry in self._branches.items()
+                if abs(entry[1]) > tolerance
+            ]
@@ -0,0 +1,310 @@
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+
+from typing import Dict, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+from config import TRADING_CONFIG
+from crypto_trading_bot import TradingSession
+from simulator import SimulatedBackend
+
+
+EXECUTION_MODES = ["branch", "parallel", "process"]
+
+# Backend round-trip latency ranges in seconds
+LATENCY_PROFILES = {
+    "none": (0.0, 0.0),
+    "lan": (0.001, 0.005),
+    "wan": (0.05, 0.2),
+    "production": (0.5, 2.0),
+}
+
+# Share of orders the backend rejects
+ERROR_PROFILES = {
+    "none": 0.0,
+    "flaky": 0.02,
+    "degraded": 0.1,
+}
+
+
+class InstrumentedBackend(SimulatedBackend):
+    """
+    Simulated backend that records the latency seen by every order.
+
+    Figures are kept in shared memory, so orders sent by the forked worker
+    processes of process mode are counted too. Latencies of the first
+    `capacity` orders are kept; counts cover every order.
+    """
+
+    def __init__(self, *args, capacity: int = 100000, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._latencies = multiprocessing.RawArray("d", capacity)
+        # Orders, failed orders, requests
+        self._counts = multiprocessing.RawArray("q", 3)
+        self._stats_lock = multiprocessing.Lock()
+
+    @property
+    def order_latencies(self) -> List[float]:
+        with self._stats_lock:
+            return self._latencies[: min(self._counts[0], len(self._latencies))]
+
+    @property
+    def failed_orders(self) -> int:
+        return self._counts[1]
+
+    @property
+    def requests(self) -> int:
+        """Requests of this process and its forked workers (unlike request_count)"""
+        return self._counts[2]
+
+    def _round_trip(self):
+        with self._stats_lock:
+            self._counts[2] += 1
+        super()._round_trip()
+
+    def _record(self, started: float, responses: List[Dict[str, str]]):
+        """Attribute request latency to each order it carried"""
+        elapsed = time.perf_counter() - started
+        failed = sum(r["status"] != "success" for r in responses)
+        with self._stats_lock:
+            start = self._counts[0]
+            end = min(start + len(responses), len(self._latencies))
+            if end > start:
+                self._latencies[start:end] = [elapsed] * (end - start)
+            self._counts[0] += len(responses)
+            self._counts[1] += failed
+
+    def submit_order(self, wallet_key, asset, direction, size):
+        started = time.perf_counter()
+        response = super().submit_order(wallet_key, asset, direction, size)
+        self._record(started, [response])
+        return response
+
+    def submit_batch(self, orders):
+        started = time.perf_counter()
+        responses = super().submit_batch(orders)
+        self._record(started, responses)
+        return responses
+
+
+def write_synthetic_inputs(
+    directory: str, wallet_count: int, proxy_count: int
+) -> Tuple[str, str]:
+    """Write keys and proxies files of the requested size"""
+    keys_file = os.path.join(directory, "wallet_keys.txt")
+    proxy_file = os.path.join(directory, "proxies.txt")
+    rng = random.Random(wallet_count)
+    with open(keys_file, "w") as f:
+        for _ in range(wallet_count):
+            f.write(f"0x{rng.getrandbits(256):064x}\n")
+    with open(proxy_file, "w") as f:
+        for i in range(proxy_count):
+            ip = f"10.{i // 65536 % 256}.{i // 256 % 256}.{i % 256}"
+            f.write(f"{ip}:8080@user{i}:pass{i}\n")
+    return keys_file, proxy_file
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of values"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def peak_rss_mb() -> Optional[float]:
+    """
+    Peak resident set size in MB of this process or of its largest
+    joined child, whichever is higher (process-mode workers hold their
+    own memory)
+    """
+    if resource is None:
+        return None
+    peak = max(
+        resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss,
+    )
+    # Linux reports kilobytes, macOS bytes
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return peak / divisor
+
+
+def children_cpu_s() -> float:
+    """CPU seconds used so far by joined child processes"""
+    if resource is None:
+        return 0.0
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+def run_mode(
+    mode: str,
+    wallet_count: int,
+    proxy_count: int,
+    latency_range: Tuple[float, float],
+    error_rate: float,
+) -> Dict:
+    """Run one session in the given mode inside a scratch directory"""
+    previous_dir = os.getcwd()
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        try:
+            keys_file, proxy_file = write_synthetic_inputs(
+                workdir, wallet_count, proxy_count
+            )
+            config = dict(
+                TRADING_CONFIG,
+                keys_file=keys_file,
+                proxy_file=proxy_file,
+                proxy_type="regular",
+                # Synthetic proxies are not reachable
+                proxy_preflight=False,
+                enable_logs=False,
+                launch_delay=(0, 0),
+                max_parallel_branches=wallet_count,
+            )
+            session = TradingSession(config)
+            backend = InstrumentedBackend(
+                latency_range=latency_range, error_rate=error_rate,
+                capacity=wallet_count,
+            )
+            session.transaction_manager.backend = backend
+
+            cpu_started = time.process_time()
+            children_cpu_started = children_cpu_s()
+            started = time.perf_counter()
+            session.run_session(execution_mode=mode)
+            elapsed = time.perf_counter() - started
+            # run_session joins its workers, so their usage is counted here
+            cpu = (
+                time.process_time() - cpu_started
+                + children_cpu_s() - children_cpu_started
+            )
+        finally:
+            os.chdir(previous_dir)
+
+    latencies = backend.order_latencies
+    return {
+        "mode": mode,
+        "wallets": wallet_count,
+        "proxies": proxy_count,
+        "trades": len(latencies),
+        "failed": backend.failed_orders,
+        "requests": backend.requests,
+        "elapsed_s": elapsed,
+        "trades_per_s": len(latencies) / elapsed if elapsed else 0.0,
+        "latency_p50_ms": percentile(latencies, 50) * 1000,
+        "latency_p95_ms": percentile(latencies, 95) * 1000,
+        "latency_p99_ms": percentile(latencies, 99) * 1000,
+        "cpu_s": cpu,
+        "cpu_pct": 100 * cpu / elapsed if elapsed else 0.0,
+        "peak_rss_mb": peak_rss_mb(),
+        # Adaptive concurrency applies to parallel mode only
+        "concurrency": session.concurrency.metrics() if session.concurrency else None,
+    }
+
+
+def _run_mode_in_child(queue, *args):
+    """Child process entry point: report run_mode metrics through the queue"""
+    queue.put(run_mode(*args))
+
+
+def run_loadtest(
+    wallet_count: int,
+    proxy_count: int,
+    latency_range: Tuple[float, float],
+    error_rate: float,
+    modes: List[str] = EXECUTION_MODES,
+    isolate: bool = True,
+) -> List[Dict]:
+    """
+    Run every execution mode and collect metrics.
+
+    With isolate, each mode runs in a fresh process so peak RSS
+    and CPU figures are not mixed between modes.
+    """
+    results = []
+    for mode in modes:
+        args = (mode, wallet_count, proxy_count, latency_range, error_rate)
+        if not isolate:
+            results.append(run_mode(*args))
+            continue
+        context = multiprocessing.get_context("spawn")
+        queue = context.Queue()
+        process = context.Process(target=_run_mode_in_child, args=(queue,) + args)
+        process.start()
+        results.append(queue.get())
+        process.join()
+    return results
+
+
+def main(argv: Optional[List[str]] = None):
+    """Stress TradingSession against the local simulated backend"""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--wallets", type=int, default=1000)
+    parser.add_argument("--proxies", type=int, default=100)
+    parser.add_argument("--latency", choices=LATENCY_PROFILES, default="lan")
+    parser.add_argument(
+        "--latency-range", type=float, nargs=2, metavar=("MIN", "MAX"),
+        help="Custom latency range in seconds (overrides --latency)",
+    )
+    parser.add_argument("--errors", choices=ERROR_PROFILES, default="none")
+    parser.add_argument(
+        "--error-rate", type=float, help="Custom error rate (overrides --errors)"
+    )
+    parser.add_argument(
+        "--modes", nargs="+", choices=EXECUTION_MODES, default=EXECUTION_MODES
+    )
+    parser.add_argument(
+        "--no-isolate", action="store_true", help="Run all modes in this process"
+    )
+    parser.add_argument("--json", help="Write results to this JSON file")
+    args = parser.parse_args(argv)
+
+    latency_range = tuple(args.latency_range or LATENCY_PROFILES[args.latency])
+    error_rate = (
+        args.error_rate if args.error_rate is not None else ERROR_PROFILES[args.errors]
+    )
+    results = run_loadtest(
+        args.wallets, args.proxies, latency_range, error_rate,
+        args.modes, not args.no_isolate,
+    )
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+    print(
+        f"{'mode':<10}{'trades':>8}{'failed':>8}{'req':>7}{'trades/s':>10}"
+        f"{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'cpu %':>7}{'rss MB':>8}"
+        f"{'conc':>7}"
+    )
+    for r in results:
+        rss = f"{r['peak_rss_mb']:.1f}" if r["peak_rss_mb"] is not None else "n/a"
+        # Final/peak adaptive concurrency limit
+        conc = (
+            f"{r['concurrency']['concurrency_limit']}/"
+            f"{r['concurrency']['concurrency_peak']}"
+            if r["concurrency"] else "n/a"
+        )
+        print(
+            f"{r['mode']:<10}{r['trades']:>8}{r['failed']:>8}{r['requests']:>7}"
+            f"{r['trades_per_s']:>10.1f}{r['latency_p50_ms']:>9.1f}"
+            f"{r['latency_p95_ms']:>9.1f}{r['latency_p99_ms']:>9.1f}"
+            f"{r['cpu_pct']:>7.1f}{rss:>8}{conc:>7}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+import atexit
+import glob
+import gzip
+import os
+import queue
+import shutil
+import threading
+import time
+
+from datetime import datetime
+from logging.handlers import BaseRotatingHandler
+from typing import Optional
+
+
+class _Compressor:
+    """
+    Single background thread that gzips rotated log segments.
+
+    Logging threads only rename the full segment and enqueue it, so no
+    compression I/O ever happens on the hot path.
+    """
+
+    def __init__(self):
+        self._reset()
+        if hasattr(os, "register_at_fork"):
+            # A forked child has no compressor thread, and the queue or lock
+            # may have been held by another thread of the parent
+            os.register_at_fork(after_in_child=self._reset)
+
+    def _reset(self):
+        self._queue: "queue.Queue" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def submit(
+        self,
+        path: str,
+        pattern: str,
+        backup_count: Optional[int] = None,
+        max_age: Optional[float] = None,
+    ):
+        """Compress path, then apply retention to archives matching pattern"""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="log-compressor", daemon=True
+                )
+                self._thread.start()
+        self._queue.put((path, pattern, backup_count, max_age))
+
+    def wait(self):
+        """Block until every submitted segment is compressed"""
+        self._queue.join()
+
+    def _run(self):
+        while True:
+            path, pattern, backup_count, max_age = self._queue.get()
+            try:
+                compress(path)
+                prune(pattern, backup_count, max_age)
+            except OSError:
+                # Never let a disk error kill the compressor; the segment
+                # just stays uncompressed
+                pass
+            finally:
+                self._queue.task_done()
+
+
+_compressor = _Compressor()
+# Finish pending compression on normal interpreter exit
+atexit.register(_compressor.wait)
+
+
+def wait_for_compression():
+    """Block until all rotated segments submitted so far are compressed"""
+    _compressor.wait()
+
+
+def compress(path: str):
+    """Gzip path to path.gz and remove the original"""
+    if not os.path.exists(path):
+        return
+    temp_path = f"{path}.gz.tmp"
+    with open(path, "rb") as source, gzip.open(temp_path, "wb") as target:
+        shutil.copyfileobj(source, target)
+    os.replace(temp_path, f"{path}.gz")
+    os.remove(path)
+
+
+def prune(
+    pattern: str, backup_count: Optional[int] = None, max_age: Optional[float] = None
+):
+    """Delete archives matching pattern beyond backup_count or older than max_age"""
+    archives = sorted(glob.glob(pattern), key=os.path.getmtime)
+    if max_age is not None:
+        cutoff = time.time() - max_age
+        expired = [path for path in archives if os.path.getmtime(path) < cutoff]
+        archives = archives[len(expired):]
+    else:
+        expired = []
+    if backup_count is not None and len(archives) > backup_count:
+        expired += archives[:len(archives) - backup_count]
+    for path in expired:
+        os.remove(path)
+
+
+def archive_logs(pattern: str, idle_age: float, max_age: Optional[float] = None):
+    """
+    Compress finished log files matching pattern in the background.
+
+    Only files untouched for idle_age seconds are archived, so logs that
+    other processes still write to are left alone.
+    """
+    cutoff = time.time() - idle_age
+    for path in glob.glob(pattern):
+        if os.path.getmtime(path) < cutoff:
+            _compressor.submit(path, f"{pattern}.gz", max_age=max_age)
+
+
+class CompressingRotatingFileHandler(BaseRotatingHandler):
+    """
+    File handler that rotates by size and age and compresses in the background.
+
+    The active file keeps its name; full segments are renamed to
+    <name>.<timestamp> and gzipped to <name>.<timestamp>.gz by a background
+    thread. At most backup_count archives are kept, none older than
+    retention seconds.
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        max_bytes: int = 50 * 1024 * 1024,
+        max_age: Optional[float] = 24 * 3600,
+        backup_count: Optional[int] = 20,
+        retention: Optional[float] = 30 * 24 * 3600,
+        encoding: Optional[str] = None,
+    ):
+        super().__init__(filename, "a", encoding=encoding)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.backup_count = backup_count
+        self.retention = retention
+        self._opened_at = time.time()
+
+    def shouldRollover(self, record) -> bool:
+        if self.stream is None:
+            self.stream = self._open()
+        if self.max_bytes and self.stream.tell() >= self.max_bytes:
+            return True
+        return bool(self.max_age) and time.time() - self._opened_at >= self.max_age
+
+    def doRollover(self):
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+
+        if os.path.exists(self.baseFilename) and os.path.getsize(self.baseFilename):
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+            segment = f"{self.baseFilename}.{timestamp}"
+            os.rename(self.baseFilename, segment)
+            _compressor.submit(
+                segment, f"{self.baseFilename}.*.gz", self.backup_count, self.retention
+            )
+
+        self.stream = self._open()
+        self._opened_at = time.time()
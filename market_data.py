@@ -0,0 +1,271 @@
+import csv
+import multiprocessing
+import random
+import threading
+import time
+
+from datetime import datetime
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+from config import logger
+
+
+# Starting marks for the simulated source; other assets start at 100
+DEFAULT_START_PRICES = {"BTC": 60000.0, "ETH": 3000.0, "SOL": 150.0}
+
+
+class PriceSnapshot:
+    """
+    Immutable view of the latest mark prices.
+
+    The feed never changes a published snapshot; it builds a new one and
+    swaps the reference, so readers take `feed.snapshot` once and use it
+    without any lock.
+    """
+
+    __slots__ = ("prices", "updated_at", "sequence")
+
+    def __init__(
+        self,
+        prices: Mapping[str, float],
+        updated_at: Mapping[str, float],
+        sequence: int,
+    ):
+        self.prices = MappingProxyType(dict(prices))
+        # time.monotonic() of the last update per asset
+        self.updated_at = MappingProxyType(dict(updated_at))
+        self.sequence = sequence
+
+    def price(self, asset: str) -> Optional[float]:
+        return self.prices.get(asset)
+
+    def ages(self, now: Optional[float] = None) -> Dict[str, float]:
+        """Seconds since each asset's price was last updated"""
+        now = time.monotonic() if now is None else now
+        return {asset: now - updated for asset, updated in self.updated_at.items()}
+
+
+class RandomWalkPriceSource:
+    """Simulated marks: every fetch moves each price by a random step"""
+
+    def __init__(
+        self,
+        assets: Sequence[str],
+        start_prices: Optional[Mapping[str, float]] = None,
+        volatility: float = 0.001,
+        seed: Optional[int] = None,
+    ):
+        start_prices = start_prices or DEFAULT_START_PRICES
+        self.prices = {asset: float(start_prices.get(asset, 100.0)) for asset in assets}
+        self.volatility = volatility
+        self._random = random.Random(seed)
+
+    def fetch(self) -> Dict[str, float]:
+        for asset, price in self.prices.items():
+            self.prices[asset] = price * (1 + self._random.gauss(0, self.volatility))
+        return dict(self.prices)
+
+
+def _parse_timestamp(value: str) -> float:
+    """Epoch seconds from an epoch number or an ISO timestamp"""
+    try:
+        return float(value)
+    except ValueError:
+        return datetime.fromisoformat(value).timestamp()
+
+
+class ReplayPriceSource:
+    """
+    Replay recorded prices from a CSV file with timestamp, asset and price
+    columns (epoch seconds or ISO timestamps).
+
+    The first fetch starts the clock; each fetch returns the latest price
+    of every asset whose recorded time has been reached, at `speed` times
+    the recorded pace. With loop, the recording restarts after its end.
+    """
+
+    def __init__(self, path: str, speed: float = 1.0, loop: bool = False):
+        self.path = path
+        self.speed = speed
+        self.loop = loop
+        with open(path, newline="") as f:
+            self.rows: List[Tuple[float, str, float]] = sorted(
+                (_parse_timestamp(row["timestamp"]), row["asset"], float(row["price"]))
+                for row in csv.DictReader(f)
+            )
+        self._index = 0
+        self._started: Optional[float] = None
+
+    def fetch(self) -> Dict[str, float]:
+        if not self.rows:
+            return {}
+        now = time.monotonic()
+        if self._started is None:
+            self._started = now
+        first = self.rows[0][0]
+        horizon = first + (now - self._started) * self.speed
+        prices: Dict[str, float] = {}
+        while self._index < len(self.rows) and self.rows[self._index][0] <= horizon:
+            _, asset, price = self.rows[self._index]
+            prices[asset] = price
+            self._index += 1
+        if self.loop and self._index == len(self.rows):
+            self._index = 0
+            self._started = now
+        return prices
+
+
+class SharedPriceSource:
+    """
+    Marks of another process's feed, read through shared memory.
+
+    The publishing feed (mirror=source) writes every snapshot into shared
+    memory; a forked process polls it like any other source. Each fetch
+    returns only the assets the publisher updated since the last fetch,
+    so the reading feed's marks and staleness follow the publisher's,
+    one poll interval behind at most.
+    """
+
+    def __init__(self, assets: Sequence[str], context=None):
+        self.assets = tuple(assets)
+        context = context or multiprocessing
+        # Per asset: price, publisher's time.monotonic() of it (0: none yet)
+        self._values = context.RawArray("d", 2 * len(self.assets))
+        self._lock = context.Lock()
+        self._seen = [0.0] * len(self.assets)
+
+    def publish(self, snapshot: PriceSnapshot):
+        with self._lock:
+            for i, asset in enumerate(self.assets):
+                updated = snapshot.updated_at.get(asset)
+                if updated is not None:
+                    self._values[2 * i] = snapshot.prices[asset]
+                    self._values[2 * i + 1] = updated
+
+    def fetch(self) -> Dict[str, float]:
+        with self._lock:
+            values = self._values[:]
+        prices = {}
+        for i, asset in enumerate(self.assets):
+            updated = values[2 * i + 1]
+            if updated > self._seen[i]:
+                self._seen[i] = updated
+                prices[asset] = values[2 * i]
+        return prices
+
+
+class MarkPriceFeed:
+    """
+    Latest mark price per asset, refreshed from a pluggable source.
+
+    A source is any object with fetch() -> {asset: price}. A background
+    thread polls it every poll_interval seconds and publishes a new
+    PriceSnapshot; trades read the current snapshot and never fetch.
+    Staleness (age of each price, longest gap between updates, failed
+    fetches) is tracked in metrics(). With a mirror (SharedPriceSource),
+    every snapshot is also published to other processes.
+    """
+
+    def __init__(self, assets: Sequence[str], source, poll_interval: float = 1.0):
+        self.assets = tuple(assets)
+        self.source = source
+        self.poll_interval = poll_interval
+        self.snapshot = PriceSnapshot({}, {}, 0)
+        self.mirror: Optional[SharedPriceSource] = None
+        self.fetches = 0
+        self.errors = 0
+        self.updates: Dict[str, int] = dict.fromkeys(self.assets, 0)
+        self.max_gap: Dict[str, float] = dict.fromkeys(self.assets, 0.0)
+        # Only one writer at a time; readers never take it
+        self._write_lock = threading.Lock()
+        self._ready = threading.Event()
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def update(self, prices: Mapping[str, float], now: Optional[float] = None):
+        """Publish new prices for some or all assets"""
+        now = time.monotonic() if now is None else now
+        with self._write_lock:
+            current = self.snapshot
+            updated_prices = dict(current.prices)
+            updated_at = dict(current.updated_at)
+            for asset, price in prices.items():
+                if asset not in self.updates:
+                    continue
+                previous = updated_at.get(asset)
+                if previous is not None:
+                    self.max_gap[asset] = max(self.max_gap[asset], now - previous)
+                updated_prices[asset] = float(price)
+                updated_at[asset] = now
+                self.updates[asset] += 1
+            self.snapshot = PriceSnapshot(
+                updated_prices, updated_at, current.sequence + 1
+            )
+            if self.mirror is not None:
+                self.mirror.publish(self.snapshot)
+            if all(asset in updated_at for asset in self.assets):
+                self._ready.set()
+
+    def poll(self):
+        """Fetch once from the source and publish the result"""
+        self.fetches += 1
+        try:
+            prices = self.source.fetch()
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Price source fetch failed: {e}")
+            return
+        if prices:
+            self.update(prices)
+
+    def start(self):
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="price-feed", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every asset has a price"""
+        return self._ready.wait(timeout)
+
+    def _run(self):
+        while not self._stopping.is_set():
+            self.poll()
+            self._stopping.wait(self.poll_interval)
+
+    def metrics(self) -> Dict:
+        snapshot = self.snapshot
+        ages = snapshot.ages()
+        return {
+            "sequence": snapshot.sequence,
+            "fetches": self.fetches,
+            "errors": self.errors,
+            "assets": {
+                asset: {
+                    "price": snapshot.price(asset),
+                    "age_s": ages.get(asset),
+                    "updates": self.updates[asset],
+                    "max_gap_s": self.max_gap[asset],
+                }
+                for asset in self.assets
+            },
+        }
+
+
+def create_source(
+    spec: str, assets: Sequence[str], replay_speed: float = 1.0
+):
+    """Build the price source named in settings: "simulated" or a CSV path"""
+    if spec == "simulated":
+        return RandomWalkPriceSource(assets)
+    return ReplayPriceSource(spec, speed=replay_speed, loop=True)
@@ -0,0 +1,269 @@
+import numpy as np
+
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from config import logger
+
+
+LONG = 1
+SHORT = -1
+FLAT = 0
+
+DIRECTION_SIDES = {"long": LONG, "short": SHORT}
+
+QUANTITY_EPSILON = 1e-12
+
+
+class PositionBook:
+    """
+    NumPy-backed book of open leveraged positions.
+
+    Positions are stored as struct-of-arrays columns with one row per
+    (wallet, asset) pair: wallet and asset codes, side (+1 long, -1 short,
+    0 flat), size in asset units, average entry price and leverage.
+    Fills are netted into the rows in batches and all positions are
+    marked against a price vector in one vectorized pass.
+    """
+
+    def __init__(
+        self,
+        assets: Sequence[str],
+        capacity: int = 1024,
+        maintenance_margin_rate: float = 0.005,
+    ):
+        self.assets = list(assets)
+        self.asset_codes = {asset: code for code, asset in enumerate(self.assets)}
+        self.maintenance_margin_rate = maintenance_margin_rate
+
+        self.wallets: List[str] = []
+        self.wallet_codes: Dict[str, int] = {}
+        # (wallet code, asset code) -> row
+        self._rows: Dict[Tuple[int, int], int] = {}
+        self.count = 0
+
+        self.wallet = np.zeros(capacity, dtype=np.int32)
+        self.asset = np.zeros(capacity, dtype=np.int32)
+        self.side = np.zeros(capacity, dtype=np.int8)
+        self.size = np.zeros(capacity, dtype=np.float64)
+        self.entry = np.zeros(capacity, dtype=np.float64)
+        self.leverage = np.ones(capacity, dtype=np.float64)
+        self.realized_pnl = np.zeros(capacity, dtype=np.float64)
+
+    def __len__(self) -> int:
+        """Number of open (non-flat) positions"""
+        return int(np.count_nonzero(self.side[: self.count]))
+
+    def _grow(self, needed: int):
+        """Grow all columns so that at least `needed` rows fit"""
+        capacity = len(self.side)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        for name in ("wallet", "asset", "side", "size", "entry", "realized_pnl"):
+            column = getattr(self, name)
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[: self.count] = column[: self.count]
+            setattr(self, name, grown)
+        leverage = np.ones(capacity, dtype=np.float64)
+        leverage[: self.count] = self.leverage[: self.count]
+        self.leverage = leverage
+
+    def _wallet_code(self, wallet: str) -> int:
+        """Get code for wallet, registering it on first use"""
+        code = self.wallet_codes.get(wallet)
+        if code is None:
+            code = len(self.wallets)
+            self.wallet_codes[wallet] = code
+            self.wallets.append(wallet)
+        return code
+
+    def _asset_code(self, asset: str) -> int:
+        """Get code for asset, registering assets first traded after startup"""
+        code = self.asset_codes.get(asset)
+        if code is None:
+            code = len(self.assets)
+            self.asset_codes[asset] = code
+            self.assets.append(asset)
+        return code
+
+    def _row_indices(
+        self, wallets: Sequence[str], assets: Sequence[str]
+    ) -> np.ndarray:
+        """Resolve (wallet, asset) pairs to rows, creating missing rows"""
+        keys = [
+            (self._wallet_code(wallet), self._asset_code(asset))
+            for wallet, asset in zip(wallets, assets)
+        ]
+        new_keys = [key for key in dict.fromkeys(keys) if key not in self._rows]
+        if new_keys:
+            self._grow(self.count + len(new_keys))
+            for key in new_keys:
+                row = self.count
+                self._rows[key] = row
+                self.wallet[row], self.asset[row] = key
+                self.count += 1
+        return np.fromiter(
+            (self._rows[key] for key in keys), dtype=np.int64, count=len(keys)
+        )
+
+    def apply_fills(
+        self,
+        wallets: Sequence[str],
+        assets: Sequence[str],
+        directions: Sequence[str],
+        sizes: Sequence[float],
+        prices: Sequence[float],
+        leverages: Sequence[float],
+    ):
+        """
+        Net a batch of fills into the book.
+
+        Sizes are quote-currency notionals, as used for trade sizes
+        elsewhere. Fills on the same side increase the position at a
+        volume-weighted entry; opposite fills reduce it (realizing PnL)
+        and flip it when larger than the open size.
+        """
+        if len(wallets) == 0:
+            return
+        rows = self._row_indices(wallets, assets)
+        sides = np.array([DIRECTION_SIDES[d] for d in directions], dtype=np.int8)
+        prices = np.asarray(prices, dtype=np.float64)
+        quantities = sides * (np.asarray(sizes, dtype=np.float64) / prices)
+        leverages = np.asarray(leverages, dtype=np.float64)
+
+        # Fills for the same row are applied in order, one round per
+        # occurrence, so that each vectorized round touches distinct rows
+        order = np.argsort(rows, kind="stable")
+        sorted_rows = rows[order]
+        starts = np.r_[0, np.flatnonzero(np.diff(sorted_rows)) + 1]
+        group_sizes = np.diff(np.r_[starts, len(rows)])
+        rank = np.empty(len(rows), dtype=np.int64)
+        rank[order] = np.arange(len(rows)) - np.repeat(starts, group_sizes)
+
+        for occurrence in range(int(rank.max()) + 1):
+            mask = rank == occurrence
+            self._net(rows[mask], quantities[mask], prices[mask], leverages[mask])
+
+    def _net(
+        self,
+        rows: np.ndarray,
+        fill_qty: np.ndarray,
+        fill_price: np.ndarray,
+        fill_leverage: np.ndarray,
+    ):
+        """Net signed fill quantities into distinct rows"""
+        qty = self.side[rows] * self.size[rows]
+        entry = self.entry[rows]
+        new_qty = qty + fill_qty
+        # Treat float residue from closing fills as flat
+        new_qty[np.abs(new_qty) < QUANTITY_EPSILON] = 0.0
+
+        increasing = (qty == 0) | (np.sign(qty) == np.sign(fill_qty))
+        flipped = ~increasing & (np.sign(new_qty) == np.sign(fill_qty))
+        closed = np.where(
+            increasing, 0.0, np.minimum(np.abs(fill_qty), np.abs(qty))
+        )
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            averaged = (
+                np.abs(qty) * entry + np.abs(fill_qty) * fill_price
+            ) / np.abs(new_qty)
+        new_entry = np.where(increasing, averaged, np.where(flipped, fill_price, entry))
+        new_entry = np.where(new_qty == 0, 0.0, new_entry)
+
+        self.realized_pnl[rows] += np.sign(qty) * closed * (fill_price - entry)
+        self.side[rows] = np.sign(new_qty).astype(np.int8)
+        self.size[rows] = np.abs(new_qty)
+        self.entry[rows] = new_entry
+        self.leverage[rows] = np.where(
+            increasing | flipped, fill_leverage, self.leverage[rows]
+        )
+
+    def price_vector(self, prices: Dict[str, float]) -> np.ndarray:
+        """Build a price vector indexed by asset code from a mapping"""
+        return np.array(
+            [prices.get(asset, np.nan) for asset in self.assets], dtype=np.float64
+        )
+
+    def liquidation_prices(self) -> np.ndarray:
+        """Isolated-margin liquidation price for every row (NaN when flat)"""
+        n = self.count
+        side = self.side[:n]
+        liquidation = self.entry[:n] * (
+            1 - side * (1 / self.leverage[:n] - self.maintenance_margin_rate)
+        )
+        return np.where(side == FLAT, np.nan, liquidation)
+
+    def margin(self) -> np.ndarray:
+        """Initial margin posted for every row"""
+        n = self.count
+        return self.size[:n] * self.entry[:n] / self.leverage[:n]
+
+    def mark(self, prices: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Mark all positions against a price vector indexed by asset code.
+
+        Returns unrealized PnL, liquidation price and liquidation distance
+        (signed fraction of the mark price the market can move against the
+        position before liquidation; negative means past liquidation).
+        """
+        n = self.count
+        side = self.side[:n]
+        marks = np.asarray(prices, dtype=np.float64)[self.asset[:n]]
+        liquidation = self.liquidation_prices()
+        with np.errstate(invalid="ignore", divide="ignore"):
+            distance = side * (marks - liquidation) / marks
+        return {
+            "unrealized_pnl": side * self.size[:n] * (marks - self.entry[:n]),
+            "liquidation_price": liquidation,
+            "liquidation_distance": distance,
+        }
+
+    def margin_by_wallet(self) -> np.ndarray:
+        """Total posted margin per wallet code"""
+        return np.bincount(
+            self.wallet[: self.count],
+            weights=self.margin(),
+            minlength=len(self.wallets),
+        )
+
+    def notional_by_wallet(self, prices: np.ndarray) -> np.ndarray:
+        """Open notional per wallet code, at the entry price where a mark is missing"""
+        n = self.count
+        marks = np.asarray(prices, dtype=np.float64)[self.asset[:n]]
+        marks = np.where(np.isnan(marks), self.entry[:n], marks)
+        return np.bincount(
+            self.wallet[:n], weights=self.size[:n] * marks, minlength=len(self.wallets)
+        )
+
+    def at_risk(self, prices: np.ndarray, threshold: float = 0.05) -> List[Dict]:
+        """Positions whose liquidation distance is below threshold"""
+        marked = self.mark(prices)
+        rows = np.flatnonzero(marked["liquidation_distance"] < threshold)
+        if len(rows):
+            logger.warning(
+                f"{len(rows)} positions within {threshold:.1%} of liquidation"
+            )
+        return [
+            self.position(self.wallets[self.wallet[row]], self.assets[self.asset[row]])
+            for row in rows
+        ]
+
+    def position(self, wallet: str, asset: str) -> Optional[Dict]:
+        """Get position for wallet and asset as a dictionary"""
+        code = self.wallet_codes.get(wallet)
+        if code is None:
+            return None
+        row = self._rows.get((code, self.asset_codes.get(asset)))
+        if row is None:
+            return None
+        return {
+            "wallet": wallet,
+            "asset": asset,
+            "side": int(self.side[row]),
+            "size": float(self.size[row]),
+            "entry": float(self.entry[row]),
+            "leverage": float(self.leverage[row]),
+            "realized_pnl": float(self.realized_pnl[row]),
+        }
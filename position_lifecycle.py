@@ -0,0 +1,144 @@
+import math
+import threading
+import time
+
+from typing import Any, Callable, Dict, List, Optional
+
+from config import logger
+from timing_wheel import TimingWheel
+
+
+OPPOSITE_DIRECTIONS = {"long": "short", "short": "long"}
+
+
+class PositionLifecycle:
+    """
+    Open -> hold -> close lifecycle for positions opened through the backend.
+
+    Every filled open is held for hold_time seconds in a timing wheel. A
+    background thread advances the wheel once per tick and hands all
+    positions that fell due together to close_batch in batches of at most
+    batch_size. close_batch returns the positions it failed to close; those
+    are retried after retry_delay, up to max_retries times.
+    """
+
+    def __init__(
+        self,
+        hold_time: float,
+        close_batch: Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]],
+        batch_size: int = 100,
+        max_retries: int = 3,
+        retry_delay: float = 5,
+        tick: float = 0.1,
+    ):
+        self.hold_time = hold_time
+        self.close_batch = close_batch
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        # One lap covers the hold time, so a tick only visits due positions
+        horizon = max(hold_time, retry_delay)
+        slots = min(max(math.ceil(horizon / tick) + 1, 64), 1 << 16)
+        self._wheel = TimingWheel(tick, slots, time.monotonic())
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._closing = 0
+        self._stopping = False
+        self._thread: Optional[threading.Thread] = None
+        self.opened = 0
+        self.closed = 0
+        self.abandoned = 0
+        self.close_requests = 0
+
+    @property
+    def open_count(self) -> int:
+        """Positions held or being closed"""
+        with self._lock:
+            return len(self._wheel) + self._closing
+
+    def hold(
+        self,
+        wallet_key: str,
+        asset: str,
+        direction: str,
+        size: float,
+        branch: Optional[int] = None,
+    ):
+        """Hold a filled position until hold_time from now, then close it"""
+        position = {
+            "wallet_key": wallet_key,
+            "asset": asset,
+            "direction": direction,
+            "size": size,
+            "branch": branch,
+            "attempts": 0,
+        }
+        with self._lock:
+            self._wheel.schedule(time.monotonic() + self.hold_time, position)
+            self.opened += 1
+
+    def start(self):
+        self._stopping = False
+        self._thread = threading.Thread(
+            target=self._run, name="position-closer", daemon=True
+        )
+        self._thread.start()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until every held position is closed or abandoned"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._wakeup:
+            while len(self._wheel) or self._closing:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._wakeup.wait(remaining)
+        return True
+
+    def stop(self, close_open: bool = False):
+        """Stop the closer thread, first closing held positions if close_open"""
+        if close_open:
+            with self._lock:
+                due = self._wheel.drain()
+                self._closing += len(due)
+            self._close(due)
+        self._stopping = True
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stopping:
+            with self._lock:
+                due = self._wheel.advance(time.monotonic())
+                self._closing += len(due)
+            if due:
+                self._close(due)
+            time.sleep(self._wheel.tick)
+
+    def _close(self, positions: List[Dict[str, Any]]):
+        """Close due positions in batches, rescheduling failed closes"""
+        for start in range(0, len(positions), self.batch_size):
+            batch = positions[start : start + self.batch_size]
+            try:
+                failed = self.close_batch(batch)
+            except Exception as e:
+                logger.error(f"Closing {len(batch)} position(s) failed: {e}")
+                failed = batch
+            with self._wakeup:
+                self.close_requests += 1
+                self.closed += len(batch) - len(failed)
+                for position in failed:
+                    position["attempts"] += 1
+                    if position["attempts"] > self.max_retries:
+                        self.abandoned += 1
+                        logger.error(
+                            "Giving up closing %s %.2f of %s for %s after %d attempts",
+                            position["direction"], position["size"], position["asset"],
+                            position["wallet_key"][:8], position["attempts"],
+                        )
+                    else:
+                        retry_at = time.monotonic() + self.retry_delay
+                        self._wheel.schedule(retry_at, position)
+                self._closing -= len(batch)
+                self._wakeup.notify_all()
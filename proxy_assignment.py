@@ -0,0 +1,221 @@
+import statistics
+import threading
+
+from typing import Any, Dict, Hashable, List, Optional, Set
+
+
+class _IndexedHeap:
+    """Binary min-heap whose items can be re-keyed or removed in O(log n)"""
+
+    def __init__(self):
+        self._heap: List[List[Any]] = []  # [key, item]
+        self._positions: Dict[Hashable, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def peek(self) -> Hashable:
+        """Item with the smallest key"""
+        return self._heap[0][1]
+
+    def set(self, item: Hashable, key: Any):
+        """Insert item, or move it to its new key"""
+        position = self._positions.get(item)
+        if position is None:
+            self._heap.append([key, item])
+            self._positions[item] = len(self._heap) - 1
+            self._sift_up(len(self._heap) - 1)
+            return
+        old_key = self._heap[position][0]
+        self._heap[position][0] = key
+        if key < old_key:
+            self._sift_up(position)
+        else:
+            self._sift_down(position)
+
+    def remove(self, item: Hashable):
+        position = self._positions.pop(item)
+        last = self._heap.pop()
+        if position < len(self._heap):
+            self._heap[position] = last
+            self._positions[last[1]] = position
+            self._sift_up(position)
+            self._sift_down(self._positions[last[1]])
+
+    def _swap(self, i: int, j: int):
+        heap = self._heap
+        heap[i], heap[j] = heap[j], heap[i]
+        self._positions[heap[i][1]] = i
+        self._positions[heap[j][1]] = j
+
+    def _sift_up(self, position: int):
+        while position:
+            parent = (position - 1) // 2
+            if not self._heap[position][0] < self._heap[parent][0]:
+                break
+            self._swap(position, parent)
+            position = parent
+
+    def _sift_down(self, position: int):
+        size = len(self._heap)
+        while True:
+            smallest = position
+            for child in (2 * position + 1, 2 * position + 2):
+                if child < size and self._heap[child][0] < self._heap[smallest][0]:
+                    smallest = child
+            if smallest == position:
+                return
+            self._swap(position, smallest)
+            position = smallest
+
+
+class ProxyAssignment:
+    """
+    Sticky wallet-to-proxy assignment; the base class picks account_id modulo.
+
+    A wallet keeps its proxy for the whole session; a proxy is only chosen
+    when a wallet trades for the first time or its proxy was removed, in
+    which case remove() moves the proxy's wallets at once. In-flight trades
+    and failures per proxy are tracked for the load-aware subclasses.
+    """
+
+    def __init__(self, proxies: List[Dict]):
+        self._lock = threading.Lock()
+        self._proxies: Dict[str, Dict] = {proxy["ip_port"]: proxy for proxy in proxies}
+        self._order: List[str] = list(self._proxies)
+        self._affinity: Dict[int, str] = {}
+        self._wallets: Dict[str, Set[int]] = {ip_port: set() for ip_port in self._order}
+        self._outstanding: Dict[str, int] = dict.fromkeys(self._order, 0)
+        self._failures: Dict[str, int] = dict.fromkeys(self._order, 0)
+
+    def assign(self, account_id: int) -> Dict:
+        """Get the account's proxy and count a trade in flight on it"""
+        with self._lock:
+            ip_port = self._affinity.get(account_id)
+            if ip_port is None:
+                ip_port = self._choose(account_id)
+                self._bind(account_id, ip_port)
+            self._outstanding[ip_port] += 1
+            self._update(ip_port)
+            return self._proxies[ip_port]
+
+    def release(self, proxy: Dict, success: Optional[bool] = None):
+        """Count a trade on proxy as finished (success None: it never ran)"""
+        ip_port = proxy["ip_port"]
+        with self._lock:
+            if ip_port not in self._proxies:
+                return
+            if self._outstanding[ip_port]:
+                self._outstanding[ip_port] -= 1
+            if success is not None:
+                self._failures[ip_port] = 0 if success else self._failures[ip_port] + 1
+            self._update(ip_port)
+
+    def remove(self, ip_port: str) -> List[int]:
+        """Take a proxy out of rotation, return the accounts moved off it"""
+        with self._lock:
+            if ip_port not in self._proxies:
+                return []
+            del self._proxies[ip_port]
+            self._order.remove(ip_port)
+            del self._outstanding[ip_port]
+            del self._failures[ip_port]
+            self._forget(ip_port)
+            moved = sorted(self._wallets.pop(ip_port))
+            for account_id in moved:
+                del self._affinity[account_id]
+                if self._order:
+                    self._bind(account_id, self._choose(account_id))
+            return moved
+
+    def load(self) -> Dict[str, Dict[str, int]]:
+        """Wallets assigned to and trades in flight on every proxy"""
+        with self._lock:
+            return {
+                ip_port: {
+                    "wallets": len(self._wallets[ip_port]),
+                    "in_flight": self._outstanding[ip_port],
+                }
+                for ip_port in self._order
+            }
+
+    def _bind(self, account_id: int, ip_port: str):
+        self._affinity[account_id] = ip_port
+        self._wallets[ip_port].add(account_id)
+        self._update(ip_port)
+
+    def _choose(self, account_id: int) -> str:
+        return self._order[account_id % len(self._order)]
+
+    def _update(self, ip_port: str):
+        """Hook: the proxy's load or health changed"""
+
+    def _forget(self, ip_port: str):
+        """Hook: the proxy was removed"""
+
+
+class _HeapAssignment(ProxyAssignment):
+    """Assignment to the proxy with the smallest _key(), kept in an indexed heap"""
+
+    def __init__(self, proxies: List[Dict]):
+        self._heap = _IndexedHeap()
+        super().__init__(proxies)
+        for ip_port in self._order:
+            self._update(ip_port)
+
+    def _key(self, ip_port: str) -> Any:
+        raise NotImplementedError
+
+    def _choose(self, account_id: int) -> str:
+        return self._heap.peek()
+
+    def _update(self, ip_port: str):
+        self._heap.set(ip_port, self._key(ip_port))
+
+    def _forget(self, ip_port: str):
+        self._heap.remove(ip_port)
+
+
+class LeastOutstandingAssignment(_HeapAssignment):
+    """New wallets go to the proxy with the fewest trades in flight"""
+
+    def _key(self, ip_port: str) -> Any:
+        return (
+            self._outstanding[ip_port],
+            len(self._wallets[ip_port]),
+            self._failures[ip_port],
+            ip_port,
+        )
+
+
+class LatencyWeightedAssignment(_HeapAssignment):
+    """
+    New wallets go to the proxy with the lowest expected wait.
+
+    The wait is the proxy's connect latency (from pre-flight; unprobed
+    proxies count as the median) times the wallets and trades already on
+    it, doubled for every consecutive failure.
+    """
+
+    def __init__(self, proxies: List[Dict], latencies: Dict[str, float]):
+        self._latencies = latencies
+        self._default_latency = (
+            statistics.median(latencies.values()) if latencies else 1.0
+        )
+        super().__init__(proxies)
+
+    def _key(self, ip_port: str) -> Any:
+        latency = self._latencies.get(ip_port, self._default_latency)
+        load = len(self._wallets[ip_port]) + self._outstanding[ip_port] + 1
+        return (latency * load * 2 ** min(self._failures[ip_port], 16), ip_port)
+
+
+def create_assignment(
+    strategy: str, proxies: List[Dict], latencies: Dict[str, float]
+) -> ProxyAssignment:
+    """Build the assignment strategy named in settings"""
+    if strategy == "least_outstanding":
+        return LeastOutstandingAssignment(proxies)
+    if strategy == "latency_weighted":
+        return LatencyWeightedAssignment(proxies, latencies)
+    return ProxyAssignment(proxies)
@@ -0,0 +1,146 @@
+import errno
+import queue
+import selectors
+import socket
+import threading
+import time
+
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+from config import logger
+
+
+# connect_ex results meaning "connection in progress" on a non-blocking socket
+_IN_PROGRESS = {0, errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EAGAIN, 10035}
+
+
+def parse_address(ip_port: str) -> Tuple[str, int]:
+    """Split "host:port" into host and integer port"""
+    host, _, port = ip_port.rpartition(":")
+    if not host:
+        raise ValueError(f"Missing port in proxy address: {ip_port}")
+    return host, int(port)
+
+
+def _resolve(
+    addresses: List[str], timeout: float, max_parallel: int
+) -> Dict[str, Tuple]:
+    """
+    Resolve "host:port" addresses to getaddrinfo entries.
+
+    IP literals resolve immediately; host names are looked up on background
+    threads, and names not resolved within timeout are given up.
+    """
+    resolved: Dict[str, Tuple] = {}
+    lookups: "queue.SimpleQueue" = queue.SimpleQueue()
+    pending = 0
+    for address in addresses:
+        try:
+            host, port = parse_address(address)
+        except ValueError as e:
+            logger.warning(f"Proxy {address} is invalid: {e}")
+            continue
+        try:
+            resolved[address] = socket.getaddrinfo(
+                host, port, type=socket.SOCK_STREAM, flags=socket.AI_NUMERICHOST
+            )[0]
+        except socket.gaierror:
+            lookups.put((address, host, port))
+            pending += 1
+    if not pending:
+        return resolved
+
+    lock = threading.Lock()
+    done = threading.Event()
+    remaining = [pending]
+
+    def lookup_worker():
+        while True:
+            try:
+                address, host, port = lookups.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                info = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)[0]
+            except OSError:
+                info = None
+            with lock:
+                if info is not None:
+                    resolved[address] = info
+                remaining[0] -= 1
+                if not remaining[0]:
+                    done.set()
+
+    for _ in range(min(pending, max_parallel)):
+        # Daemon threads: a hung lookup must not keep the process alive
+        threading.Thread(target=lookup_worker, name="proxy-lookup", daemon=True).start()
+    done.wait(timeout)
+    with lock:
+        return dict(resolved)
+
+
+def _start_connect(address_info: Tuple) -> Optional[socket.socket]:
+    """Open a non-blocking connection attempt, None if it failed outright"""
+    family, kind, proto, _, address = address_info
+    try:
+        sock = socket.socket(family, kind, proto)
+    except OSError:
+        return None
+    sock.setblocking(False)
+    if sock.connect_ex(address) not in _IN_PROGRESS:
+        sock.close()
+        return None
+    return sock
+
+
+def probe_proxies(
+    addresses: List[str], timeout: float = 3.0, max_parallel: int = 256
+) -> Dict[str, Optional[float]]:
+    """
+    TCP connect to every address concurrently and time it.
+
+    Up to max_parallel connection attempts are open at once, multiplexed
+    on one selector, so a list no longer than max_parallel finishes within
+    about one timeout (plus up to one more if host names need resolving).
+    Returns connect latency in seconds per address, or None for addresses
+    that were invalid, refused, failed or timed out.
+    """
+    results: Dict[str, Optional[float]] = {address: None for address in addresses}
+    resolved = _resolve(list(results), timeout, max_parallel)
+    pending = deque(address for address in results if address in resolved)
+    # socket -> (address, started, deadline)
+    in_flight: Dict[socket.socket, Tuple[str, float, float]] = {}
+    selector = selectors.DefaultSelector()
+    try:
+        while pending or in_flight:
+            while pending and len(in_flight) < max_parallel:
+                address = pending.popleft()
+                sock = _start_connect(resolved[address])
+                if sock is not None:
+                    started = time.monotonic()
+                    in_flight[sock] = (address, started, started + timeout)
+                    selector.register(sock, selectors.EVENT_WRITE)
+            if not in_flight:
+                continue
+
+            next_deadline = min(deadline for _, _, deadline in in_flight.values())
+            for key, _ in selector.select(max(next_deadline - time.monotonic(), 0)):
+                sock = key.fileobj
+                address, started, _ = in_flight.pop(sock)
+                if sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR) == 0:
+                    results[address] = time.monotonic() - started
+                selector.unregister(sock)
+                sock.close()
+
+            now = time.monotonic()
+            for sock, (_, _, deadline) in list(in_flight.items()):
+                if deadline <= now:
+                    del in_flight[sock]
+                    selector.unregister(sock)
+                    sock.close()
+    finally:
+        for sock in in_flight:
+            sock.close()
+        selector.close()
+    return results
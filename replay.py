@@ -0,0 +1,219 @@
+import argparse
+import json
+import time
+
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from crypto_trading_bot import TransactionManager
+from loadtest import ERROR_PROFILES, LATENCY_PROFILES, percentile
+from reporting import iter_trade_records
+from simulator import SimulatedBackend
+
+
+TIMING_MODES = ["fast", "original"]
+
+# Profile metrics compared by diff_profiles
+PROFILE_METRICS = [
+    "trades", "succeeded", "success_rate",
+    "latency_p50_ms", "latency_p95_ms", "latency_p99_ms",
+]
+
+
+def load_trades(path: str) -> List[Dict]:
+    """
+    Load the trade sequence of a results CSV or session log.
+
+    Records keep file order; the timestamp is converted to epoch seconds
+    (None when missing or unparsable) for replay at original timing.
+    """
+    trades = []
+    for record in iter_trade_records(path):
+        try:
+            timestamp = datetime.fromisoformat(record["timestamp"]).timestamp()
+        except ValueError:
+            timestamp = None
+        trades.append({
+            "timestamp": timestamp,
+            "wallet": record["wallet"],
+            "asset": record["asset"],
+            "direction": record["direction"],
+            "size": float(record["size"]) if record["size"] else 0.0,
+            "status": record["status"],
+        })
+    return trades
+
+
+def build_profile(
+    assets: List[str], outcomes: List[bool], latencies: Optional[List[float]] = None
+) -> Dict:
+    """Summarize per-trade outcomes (and latencies, if measured) into a profile"""
+    by_asset: Dict[str, Dict] = {}
+    for asset, success in zip(assets, outcomes):
+        stats = by_asset.setdefault(asset, {"trades": 0, "succeeded": 0})
+        stats["trades"] += 1
+        stats["succeeded"] += success
+    for stats in by_asset.values():
+        stats["success_rate"] = stats["succeeded"] / stats["trades"]
+
+    succeeded = sum(outcomes)
+    profile = {
+        "trades": len(outcomes),
+        "succeeded": succeeded,
+        "success_rate": succeeded / len(outcomes) if outcomes else 0.0,
+        "by_asset": by_asset,
+        # One character per trade, so runs can be compared trade by trade
+        "outcomes": "".join("S" if success else "F" for success in outcomes),
+    }
+    for pct in (50, 95, 99):
+        profile[f"latency_p{pct}_ms"] = (
+            percentile(latencies, pct) * 1000 if latencies else None
+        )
+    return profile
+
+
+def recorded_profile(trades: List[Dict]) -> Dict:
+    """Profile of the recorded run itself (no latencies are recorded)"""
+    return build_profile(
+        [trade["asset"] for trade in trades],
+        [trade["status"] == "success" for trade in trades],
+    )
+
+
+def replay(
+    trades: List[Dict],
+    transaction_manager: TransactionManager,
+    timing: str = "fast",
+    speed: float = 1.0,
+) -> Dict:
+    """
+    Re-issue the trades in order through transaction_manager.
+
+    With "original" timing each trade waits for its recorded offset from
+    the first trade (divided by speed); a trade that is already late goes
+    out immediately. With "fast" timing trades go out back to back.
+    """
+    start = time.monotonic()
+    first_timestamp = next(
+        (trade["timestamp"] for trade in trades if trade["timestamp"] is not None), None
+    )
+    latencies = []
+    outcomes = []
+    for trade in trades:
+        if timing == "original" and trade["timestamp"] is not None:
+            due = start + (trade["timestamp"] - first_timestamp) / speed
+            delay = due - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+
+        started = time.perf_counter()
+        result = transaction_manager.execute_trade(
+            trade["wallet"], trade["asset"], trade["direction"], trade["size"], None
+        )
+        latencies.append(time.perf_counter() - started)
+        outcomes.append(result.success)
+
+    profile = build_profile([trade["asset"] for trade in trades], outcomes, latencies)
+    profile["elapsed_s"] = time.monotonic() - start
+    return profile
+
+
+def diff_profiles(baseline: Dict, candidate: Dict) -> Dict:
+    """
+    Compare two profiles metric by metric.
+
+    Returns (baseline, candidate, delta) per metric and per-asset success
+    rate, plus how many trades changed outcome when both runs replayed the
+    same sequence.
+    """
+    def compare(old, new):
+        delta = new - old if old is not None and new is not None else None
+        return {"baseline": old, "candidate": new, "delta": delta}
+
+    diff = {
+        "metrics": {
+            metric: compare(baseline.get(metric), candidate.get(metric))
+            for metric in PROFILE_METRICS
+        },
+        "success_rate_by_asset": {
+            asset: compare(
+                baseline["by_asset"].get(asset, {}).get("success_rate"),
+                candidate["by_asset"].get(asset, {}).get("success_rate"),
+            )
+            for asset in sorted(set(baseline["by_asset"]) | set(candidate["by_asset"]))
+        },
+        "changed_outcomes": None,
+    }
+    if len(baseline["outcomes"]) == len(candidate["outcomes"]):
+        diff["changed_outcomes"] = sum(
+            old != new for old, new in zip(baseline["outcomes"], candidate["outcomes"])
+        )
+    return diff
+
+
+def _format_value(value) -> str:
+    if value is None:
+        return "n/a"
+    if isinstance(value, float):
+        return f"{value:.3f}"
+    return str(value)
+
+
+def main(argv: Optional[List[str]] = None):
+    """Replay a recorded session against the local simulated backend"""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("source", help="trade_results CSV or session log")
+    parser.add_argument("--timing", choices=TIMING_MODES, default="fast")
+    parser.add_argument(
+        "--speed", type=float, default=1.0, help="Speed-up factor for original timing"
+    )
+    parser.add_argument("--latency", choices=LATENCY_PROFILES, default="none")
+    parser.add_argument("--errors", choices=ERROR_PROFILES, default="none")
+    parser.add_argument(
+        "--seed", type=int, default=0, help="Simulator seed (same seed, same run)"
+    )
+    parser.add_argument(
+        "--baseline",
+        help="Profile JSON of an earlier replay to diff against "
+             "(default: the recorded run)",
+    )
+    parser.add_argument("--output", help="Write the replay profile to this JSON file")
+    args = parser.parse_args(argv)
+
+    trades = load_trades(args.source)
+    backend = SimulatedBackend(
+        latency_range=LATENCY_PROFILES[args.latency],
+        error_rate=ERROR_PROFILES[args.errors],
+        seed=args.seed,
+    )
+    profile = replay(
+        trades, TransactionManager(backend=backend), args.timing, args.speed
+    )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(profile, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    else:
+        baseline = recorded_profile(trades)
+    diff = diff_profiles(baseline, profile)
+
+    print(f"{'metric':<24}{'baseline':>12}{'replay':>12}{'delta':>12}")
+    rows = list(diff["metrics"].items()) + [
+        (f"success_rate[{asset}]", values)
+        for asset, values in diff["success_rate_by_asset"].items()
+    ]
+    for name, values in rows:
+        print(
+            f"{name:<24}{_format_value(values['baseline']):>12}"
+            f"{_format_value(values['candidate']):>12}"
+            f"{_format_value(values['delta']):>12}"
+        )
+    print(f"changed outcomes: {_format_value(diff['changed_outcomes'])}")
+
+
+if __name__ == "__main__":
+    main()
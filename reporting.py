@@ -0,0 +1,326 @@
+import argparse
+import csv
+import glob
+import gzip
+import hashlib
+import json
+import os
+import re
+
+from itertools import islice
+from typing import AbstractSet, Collection, Dict, Iterator, List, Optional
+
+import numpy as np
+
+from config import LOG_DIR, logger
+
+
+# Columns every trade record is normalized to, whichever file version it
+# came from (older CSVs have `asset`, newer ones have branch/thread columns)
+RECORD_FIELDS = [
+    'timestamp', 'wallet', 'asset', 'direction', 'size', 'status',
+    'transaction_hash', 'error'
+]
+
+UNKNOWN_ASSET = "unknown"
+
+DEFAULT_RESULT_GLOB = os.path.join("trade_results", "trade_results_*.csv")
+DEFAULT_LOG_GLOBS = [
+    # Session logs and their rotated, compressed segments
+    os.path.join(LOG_DIR, "trading_*_*.txt*"),
+    # Older sessions wrote their logs to the working directory
+    "trading_*_*.txt",
+]
+DEFAULT_CACHE_FILE = os.path.join("trade_results", ".report_cache.json")
+
+# Bump when the partial aggregate format changes to drop old cache entries
+CACHE_VERSION = 2
+
+LOG_EXECUTING = re.compile(
+    r"^(?P<timestamp>\S+ \S+) - (?:\w+ - )?Executing trade: (?P<tx_id>\S+) "
+    r"for (?P<wallet>\S+) - (?P<direction>\w+) (?P<size>\S+) of (?P<asset>\S+)"
+)
+LOG_SUCCESS = re.compile(
+    r" - (?:\w+ - )?Trade executed successfully: (?P<tx_id>\S+)"
+)
+LOG_FAILED = re.compile(
+    r" - (?:\w+ - )?Trade failed for (?P<wallet>\S+): (?P<error>.*)$"
+)
+
+
+def _normalize_row(row: Dict[str, str]) -> Dict[str, str]:
+    """Map a CSV row of any known schema version to RECORD_FIELDS"""
+    record = {field: (row.get(field) or "") for field in RECORD_FIELDS}
+    if not record["asset"]:
+        record["asset"] = UNKNOWN_ASSET
+    return record
+
+
+def iter_result_rows(path: str) -> Iterator[Dict[str, str]]:
+    """Stream normalized trade records from a trade_results CSV file"""
+    with open(path, newline="") as csvfile:
+        for row in csv.DictReader(csvfile):
+            yield _normalize_row(row)
+
+
+def iter_log_trades(path: str) -> Iterator[Dict[str, str]]:
+    """
+    Stream trade records reconstructed from a session log file.
+
+    A trade starts with its "Executing trade" line and ends with a success
+    line (matched by transaction ID) or a failure line (matched by wallet).
+    """
+    pending: Dict[str, Dict[str, str]] = {}
+    pending_by_wallet: Dict[str, str] = {}
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt", errors="replace") as f:
+        for line in f:
+            match = LOG_EXECUTING.search(line)
+            if match:
+                record = {field: "" for field in RECORD_FIELDS}
+                record.update(
+                    timestamp=match["timestamp"].replace(" ", "T").replace(",", "."),
+                    wallet=match["wallet"],
+                    asset=match["asset"],
+                    direction=match["direction"],
+                    size=match["size"],
+                    transaction_hash=match["tx_id"],
+                )
+                pending[match["tx_id"]] = record
+                pending_by_wallet[match["wallet"]] = match["tx_id"]
+                continue
+
+            match = LOG_SUCCESS.search(line)
+            if match and match["tx_id"] in pending:
+                record = pending.pop(match["tx_id"])
+                record["status"] = "success"
+                yield record
+                continue
+
+            match = LOG_FAILED.search(line)
+            if match and match["wallet"] in pending_by_wallet:
+                record = pending.pop(pending_by_wallet.pop(match["wallet"]), None)
+                if record is not None:
+                    record.update(status="failed", error=match["error"].strip())
+                    yield record
+
+
+def iter_trade_records(path: str) -> Iterator[Dict[str, str]]:
+    """Stream normalized trade records from a results CSV or a session log"""
+    if path.endswith(".csv"):
+        return iter_result_rows(path)
+    return iter_log_trades(path)
+
+
+def _aggregate_chunk(records: List[Dict[str, str]]) -> Dict[str, List[float]]:
+    """Group a chunk of records by day and asset with vectorized counts"""
+    keys = np.array([f"{r['timestamp'][:10]}|{r['asset']}" for r in records])
+    success = np.array(
+        [r["status"] == "success" for r in records], dtype=np.float64
+    )
+    sizes = np.array(
+        [float(r["size"]) if r["size"] else 0.0 for r in records], dtype=np.float64
+    )
+
+    groups, inverse = np.unique(keys, return_inverse=True)
+    trades = np.bincount(inverse, minlength=len(groups))
+    successes = np.bincount(inverse, weights=success, minlength=len(groups))
+    volume = np.bincount(inverse, weights=sizes * success, minlength=len(groups))
+    return {
+        str(group): [int(trades[i]), int(successes[i]), float(volume[i])]
+        for i, group in enumerate(groups)
+    }
+
+
+def _merge(total: Dict[str, List[float]], partial: Dict[str, List[float]]):
+    """Add partial aggregates into the running total"""
+    for key, values in partial.items():
+        current = total.setdefault(key, [0, 0, 0.0])
+        for i, value in enumerate(values):
+            current[i] += value
+
+
+def aggregate_file(
+    path: str, chunk_size: int = 10000, session_txs: Collection[str] = ()
+) -> Dict:
+    """
+    Aggregate one file in bounded memory, chunk by chunk.
+
+    Also returns the file's first transaction hash and which of
+    session_txs (first transactions of result CSVs) the file contains.
+    """
+    totals: Dict[str, List[float]] = {}
+    first_tx = None
+    sessions = set()
+    records = iter_trade_records(path)
+    while True:
+        chunk = list(islice(records, chunk_size))
+        if not chunk:
+            break
+        for record in chunk:
+            tx = record["transaction_hash"]
+            if tx:
+                first_tx = first_tx or tx
+                if tx in session_txs:
+                    sessions.add(tx)
+        _merge(totals, _aggregate_chunk(chunk))
+    return {"aggregates": totals, "first_tx": first_tx, "sessions": sorted(sessions)}
+
+
+def _load_cache(cache_file: str) -> Dict:
+    """Load cached per-file partial aggregates"""
+    if not cache_file or not os.path.exists(cache_file):
+        return {}
+    try:
+        with open(cache_file) as f:
+            cache = json.load(f)
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable report cache {cache_file}: {e}")
+        return {}
+    if cache.get("version") != CACHE_VERSION:
+        return {}
+    return cache.get("files", {})
+
+
+def _save_cache(cache_file: str, files: Dict):
+    """Write per-file partial aggregates atomically"""
+    directory = os.path.dirname(cache_file)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temp_file = f"{cache_file}.tmp"
+    with open(temp_file, "w") as f:
+        json.dump({"version": CACHE_VERSION, "files": files}, f)
+    os.replace(temp_file, cache_file)
+
+
+def build_report(
+    paths: List[str],
+    cache_file: Optional[str] = DEFAULT_CACHE_FILE,
+    chunk_size: int = 10000,
+) -> List[Dict]:
+    """
+    Compute per-day, per-asset trade counts, success rate and filled volume.
+
+    Partial aggregates are cached per file (keyed by size and mtime), so
+    re-runs only read files that are new or changed since the last run.
+
+    A session writes every trade to both its results CSV and its log, so a
+    log is only counted when it has no CSV: a log containing the first
+    transaction of a CSV among paths belongs to that CSV's session.
+    """
+    cached = _load_cache(cache_file)
+    files = {}
+    totals: Dict[str, List[float]] = {}
+    processed = 0
+
+    def load(
+        path: str, session_txs: AbstractSet[str] = frozenset(), checked: str = ""
+    ) -> Dict:
+        nonlocal processed
+        stat = os.stat(path)
+        signature = [stat.st_size, stat.st_mtime_ns]
+        entry = cached.get(path)
+        if (
+            entry is None
+            or entry["signature"] != signature
+            # Logs without a CSV are checked again when new CSVs show up
+            or (not set(entry["sessions"]) & session_txs
+                and entry.get("checked", "") != checked)
+        ):
+            entry = dict(
+                aggregate_file(path, chunk_size, session_txs), signature=signature
+            )
+            processed += 1
+        if checked:
+            entry["checked"] = checked
+        files[path] = entry
+        return entry
+
+    logs = [path for path in paths if not path.endswith(".csv")]
+    for path in paths:
+        if path.endswith(".csv"):
+            _merge(totals, load(path)["aggregates"])
+
+    session_txs = {
+        entry["first_tx"] for entry in files.values() if entry["first_tx"]
+    }
+    checked = hashlib.sha1("\n".join(sorted(session_txs)).encode()).hexdigest()
+    skipped = 0
+    for path in logs:
+        entry = load(path, session_txs, checked)
+        if set(entry["sessions"]) & session_txs:
+            skipped += 1
+        else:
+            _merge(totals, entry["aggregates"])
+
+    logger.info(
+        f"Report covers {len(paths)} files, {processed} (re)processed, "
+        f"{skipped} session logs skipped in favour of their CSVs"
+    )
+    if cache_file:
+        _save_cache(cache_file, files)
+
+    report = []
+    for key in sorted(totals):
+        day, asset = key.split("|", 1)
+        trades, successes, volume = totals[key]
+        report.append({
+            "day": day,
+            "asset": asset,
+            "trades": trades,
+            "successes": successes,
+            "success_rate": successes / trades if trades else 0.0,
+            "volume": volume,
+        })
+    return report
+
+
+def find_input_files(result_glob: str, log_globs: List[str]) -> List[str]:
+    """List result CSVs and session logs matching the given patterns"""
+    paths = sorted(glob.glob(result_glob))
+    for log_glob in log_globs:
+        paths += sorted(set(glob.glob(log_glob)) - set(paths))
+    return paths
+
+
+def main(argv: Optional[List[str]] = None):
+    """Print success rate per asset per day across all sessions"""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument(
+        "--results", default=DEFAULT_RESULT_GLOB, help="Result CSV glob"
+    )
+    parser.add_argument(
+        "--logs", nargs="*", default=DEFAULT_LOG_GLOBS,
+        help="Session log globs (--logs alone skips logs)",
+    )
+    parser.add_argument(
+        "--cache", default=DEFAULT_CACHE_FILE, help="Cache file ('' to disable)"
+    )
+    parser.add_argument("--chunk-size", type=int, default=10000)
+    parser.add_argument("--output", help="Write the report to this CSV file")
+    args = parser.parse_args(argv)
+
+    report = build_report(
+        find_input_files(args.results, args.logs), args.cache or None, args.chunk_size
+    )
+
+    if args.output:
+        with open(args.output, "w", newline="") as csvfile:
+            fieldnames = list(report[0]) if report else []
+            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+            writer.writeheader()
+            writer.writerows(report)
+
+    print(
+        f"{'day':<12}{'asset':<10}{'trades':>8}{'success':>9}"
+        f"{'rate':>8}{'volume':>14}"
+    )
+    for row in report:
+        print(
+            f"{row['day']:<12}{row['asset']:<10}{row['trades']:>8}"
+            f"{row['successes']:>9}{row['success_rate']:>8.1%}{row['volume']:>14.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+import multiprocessing
+import struct
+import threading
+import time
+
+from multiprocessing import shared_memory
+from typing import Iterator, List, Optional, Tuple
+
+from trade_result import Direction, TradeResult, TradeStatus
+
+
+# Fixed layout of one trade record: timestamp, tx_id, size, wallet index,
+# proxy index, asset code, status, direction, signature digest, error text
+RECORD = struct.Struct("<dQdIIHBb32s96s")
+ERROR_BYTES = 96
+NO_PROXY = 0xFFFFFFFF
+
+# Each slot is a ready flag followed by the record, padded to 8 bytes
+SLOT_SIZE = (1 + RECORD.size + 7) // 8 * 8
+
+
+class ResultRing:
+    """
+    Ring of fixed-layout trade records in shared memory.
+
+    One worker process writes, the parent drains; the ring must be created
+    before the worker is forked. Every slot starts with a ready flag: the
+    writer fills a free slot and then sets its flag, the reader decodes a
+    ready slot in place and then clears it. Nothing is pickled on the way.
+
+    Flags are only read and flipped under a process-shared lock. Its
+    acquire and release are full memory barriers, so a reader that sees a
+    flag set also sees the whole record written before it, and a writer
+    that sees a flag cleared sees the reader done with the slot, on
+    weakly ordered CPUs as well as on x86.
+    """
+
+    def __init__(self, capacity: int = 4096, context=None):
+        self.capacity = capacity
+        # Shared with the forked writer; pass the context it is forked with
+        self._flag_lock = (context or multiprocessing).Lock()
+        self._shm = shared_memory.SharedMemory(create=True, size=capacity * SLOT_SIZE)
+        self._buf = self._shm.buf
+        # Writer and reader positions, each only used on its own side
+        self._write_slot = 0
+        self._read_slot = 0
+        # Worker threads of the writing process take turns
+        self._write_lock = threading.Lock()
+        self.full_waits = 0
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    def write(
+        self, result: TradeResult, wallet_index: int, proxy_index: Optional[int] = None
+    ):
+        """Append a result; blocks while the ring is full"""
+        error = result.error.encode("utf-8")[:ERROR_BYTES]
+        with self._write_lock:
+            offset = self._write_slot * SLOT_SIZE
+            while self._ready(offset):
+                # Full: the reader has not taken this slot yet
+                self.full_waits += 1
+                time.sleep(0.0005)
+            RECORD.pack_into(
+                self._buf, offset + 1,
+                result.timestamp, result.tx_id, result.size, wallet_index,
+                NO_PROXY if proxy_index is None else proxy_index,
+                result.asset, result.status, result.direction,
+                result.signature, error,
+            )
+            # Publish: the record stores happen before the flag store
+            with self._flag_lock:
+                self._buf[offset] = 1
+            self._write_slot = (self._write_slot + 1) % self.capacity
+
+    def drain(self, wallets: List[str]) -> Iterator[Tuple[TradeResult, Optional[int]]]:
+        """
+        Take ready records, at most one lap, as (result, proxy index).
+
+        wallets resolves the wallet index of each record to its key.
+        """
+        buf = self._buf
+        for _ in range(self.capacity):
+            offset = self._read_slot * SLOT_SIZE
+            if not self._ready(offset):
+                return
+            (
+                timestamp, tx_id, size, wallet_index, proxy_index,
+                asset, status, direction, signature, error,
+            ) = RECORD.unpack_from(buf, offset + 1)
+            # Hand the slot back only after the record has been read
+            with self._flag_lock:
+                buf[offset] = 0
+            self._read_slot = (self._read_slot + 1) % self.capacity
+            success = status == TradeStatus.SUCCESS
+            result = TradeResult(
+                TradeStatus(status), wallets[wallet_index], asset,
+                Direction(direction), size,
+                tx_id=tx_id,
+                error=error.rstrip(b"\0").decode("utf-8", "ignore"),
+                signature=signature if success else b"",
+                timestamp=timestamp,
+            )
+            yield result, None if proxy_index == NO_PROXY else proxy_index
+
+    def _ready(self, offset: int) -> bool:
+        """Read a slot's ready flag under the lock"""
+        with self._flag_lock:
+            return bool(self._buf[offset])
+
+    def close(self):
+        """Release and remove the shared memory (owner side)"""
+        self._buf = None
+        self._shm.close()
+        self._shm.unlink()
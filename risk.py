@@ -0,0 +1,146 @@
+import threading
+
+from collections import Counter
+from typing import Dict, List, Mapping, Optional, Sequence
+
+from exposure import ExposureIndex
+from trade_result import Direction, asset_code, asset_name
+
+
+# Rules in the order they are applied; an order is reported under the
+# first rule it breaks
+RULES = ("size", "balance", "leverage", "price", "slippage", "exposure")
+
+
+class PreTradeRisk:
+    """
+    Vectorized pre-trade checks for a planned batch of orders.
+
+    Runs before transaction IDs, proxies, signing or any request, on the
+    order dicts the session builds (wallet_key, asset, direction, size and
+    optionally leverage and price, the mark the order was planned at):
+
+    - size: positive and finite
+    - balance: the wallet's orders in the batch fit its balance
+    - leverage: the wallet's open notional plus its orders in the batch is
+      at most max_leverage times its balance, and an order's own leverage
+      is at most max_leverage
+    - price: the asset's mark price is at most max_price_age seconds old
+      (when price ages are given)
+    - slippage: the mark has moved at most slippage_tolerance percent
+      against the order since its price was taken (when both are known)
+    - exposure: the batch keeps every asset within the net exposure limit
+      (see ExposureIndex.allows)
+
+    Exposure goes last because passing it reserves exposure: every order
+    that passes carries its signed notional as "reserved", which the
+    caller must settle with ExposureIndex.record_fill or release.
+    """
+
+    def __init__(self, exposure: ExposureIndex):
+        self.exposure = exposure
+        self.rejected: Counter = Counter()
+        self._lock = threading.Lock()
+
+    def check(
+        self,
+        orders: List[Dict],
+        balances: Sequence[Optional[float]],
+        max_net_exposure: Optional[float] = None,
+        open_notional: Optional[Sequence[float]] = None,
+        max_leverage: float = float("inf"),
+        slippage_tolerance: float = float("inf"),
+        prices: Optional[Mapping[str, float]] = None,
+        price_ages: Optional[Mapping[str, float]] = None,
+        max_price_age: float = float("inf"),
+    ) -> List[Optional[str]]:
+        """
+        Rule that rejected each order, None for orders that passed.
+
+        balances and open_notional (the notional of the wallet's open
+        positions at mark prices, none if omitted) are given per order.
+        """
+        count = len(orders)
+        if not count:
+            return []
+        import numpy as np  # Deferred: keeps NumPy out of startup
+
+        sizes = np.fromiter((order["size"] for order in orders), np.float64, count)
+        sides = np.fromiter(
+            (Direction.from_name(order["direction"]) for order in orders), np.int8, count
+        )
+        codes = np.fromiter(
+            (asset_code(order["asset"]) for order in orders), np.int64, count
+        )
+        leverages = np.fromiter(
+            (order.get("leverage", 1.0) for order in orders), np.float64, count
+        )
+        balances = np.array(
+            [np.nan if balance is None else balance for balance in balances], np.float64
+        )
+        held = (
+            np.zeros(count) if open_notional is None
+            else np.asarray(open_notional, dtype=np.float64)
+        )
+        wallet_codes: Dict[str, int] = {}
+        wallets = np.fromiter(
+            (wallet_codes.setdefault(order["wallet_key"], len(wallet_codes))
+             for order in orders),
+            np.int64, count,
+        )
+
+        # 0: passed, otherwise 1 + index of the first rule broken
+        reasons = np.zeros(count, dtype=np.int8)
+
+        def reject(mask: np.ndarray, rule: str):
+            reasons[(reasons == 0) & mask] = RULES.index(rule) + 1
+
+        reject(~np.isfinite(sizes) | (sizes <= 0), "size")
+        # Unknown balances (NaN) fail the comparison and are rejected too
+        wallet_totals = np.bincount(wallets, weights=sizes)[wallets]
+        reject(~(wallet_totals <= balances), "balance")
+        with np.errstate(divide="ignore", invalid="ignore"):
+            effective = (held + wallet_totals) / balances
+        reject((leverages > max_leverage) | (effective > max_leverage), "leverage")
+        if price_ages is not None:
+            # Assets without a price yet count as infinitely stale
+            ages = np.fromiter(
+                (price_ages.get(order["asset"], np.inf) for order in orders),
+                np.float64, count,
+            )
+            reject(ages > max_price_age, "price")
+
+        if prices:
+            planned = np.fromiter(
+                (order.get("price", np.nan) for order in orders), np.float64, count
+            )
+            current = np.fromiter(
+                (prices.get(order["asset"], np.nan) for order in orders),
+                np.float64, count,
+            )
+            # Adverse move only: marks up for longs, down for shorts
+            slippage = sides * (current - planned) / planned * 100
+            reject(slippage > slippage_tolerance, "slippage")
+
+        if max_net_exposure is not None:
+            passed = reasons == 0
+            signed = sides * sizes
+            deltas = np.bincount(
+                codes[passed], weights=signed[passed], minlength=codes.max() + 1
+            )
+            for code in np.unique(codes[passed]):
+                if not self.exposure.allows(
+                    asset_name(code), deltas[code], max_net_exposure
+                ):
+                    reject(codes == code, "exposure")
+            for index in np.flatnonzero(reasons == 0).tolist():
+                orders[index]["reserved"] = float(signed[index])
+
+        result: List[Optional[str]] = [
+            RULES[reason - 1] if reason else None for reason in reasons.tolist()
+        ]
+        rejected = [rule for rule in result if rule is not None]
+        if rejected:
+            with self._lock:
+                self.rejected.update(rejected)
+        return result
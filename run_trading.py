@@ -1,7 +1,8 @@
 import logging
 
 from crypto_trading_bot import TradingSession
-from config import logger, TRADING_CONFIG, LOGGING_CONFIG
+from config import logger, init_runtime, TRADING_CONFIG, LOGGING_CONFIG
+from settings import SettingsReloader
 
 
 def main():
@@ -9,9 +10,17 @@ def main():
     Main function, which settings up logging,
     configures trade session, executes trading based on configuration
     """
+    init_runtime()
     try:
         # Initialize trading session with configuration
         session = TradingSession(TRADING_CONFIG)
+
+        # Pick up edits to the settings file without restarting the session
+        settings = session.settings
+        if settings.settings_file:
+            reloader = SettingsReloader(settings.settings_file, session.apply_settings)
+            if not reloader.install_signal_handler():
+                reloader.start_polling(settings.settings_poll_interval)
         
         # Run trading session with configured execution mode
         execution_mode = TRADING_CONFIG.get("execution_mode", "branch")
@@ -0,0 +1,297 @@
+import json
+import os
+import signal
+import threading
+
+from dataclasses import asdict, dataclass, fields
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from config import logger
+from tx_ids import DEFAULT_LANE_BITS, WORKER_BITS
+
+
+PROXY_TYPES = ("regular", "mobile")
+PROXY_ASSIGNMENTS = ("modulo", "least_outstanding", "latency_weighted")
+EXECUTION_MODES = ("branch", "parallel", "process")
+POSITION_DIRECTIONS = ("random", "long", "short")
+
+# Upper bound on in-flight trades of parallel mode; a sanity limit only, as
+# transaction ID lanes are leased per call and shared by any number of threads
+MAX_CONCURRENCY = 256
+# Worker processes of process mode take the transaction ID process numbers
+# following the session's own
+MAX_PROCESSES = (1 << (WORKER_BITS - DEFAULT_LANE_BITS)) - 1
+
+# Settings a running session may change through a settings file; the rest
+# (files, logging, ID worker, buffer sizes) are bound at startup
+RELOADABLE_KEYS = frozenset({
+    "enable_shuffling",
+    "thread_count",
+    "launch_delay",
+    "branch_wallet_range",
+    "max_parallel_branches",
+    "concurrency_min",
+    "concurrency_max",
+    "trading_assets",
+    "position_direction",
+    "volume_percentage_range",
+    "max_net_exposure",
+    "max_leverage",
+    "slippage_tolerance",
+})
+
+
+@dataclass(frozen=True)
+class Settings:
+    """
+    Validated, immutable view of TRADING_CONFIG.
+
+    Sessions read one snapshot per use, so a reload swaps the whole object
+    and no reader ever sees a half-updated configuration.
+    """
+
+    keys_file: str = "wallet_keys.txt"
+    proxy_file: str = "proxies.txt"
+    proxy_type: str = "regular"
+    proxy_assignment: str = "modulo"
+    proxy_max_failures: Optional[int] = None
+    proxy_preflight: bool = False
+    proxy_preflight_timeout: float = 3.0
+    proxy_preflight_parallelism: int = 256
+    execution_mode: str = "branch"
+    enable_shuffling: bool = True
+    enable_logs: bool = True
+    thread_count: int = 10
+    launch_delay: Tuple[float, float] = (0, 3600)
+    branch_wallet_range: Tuple[int, int] = (2, 5)
+    max_parallel_branches: int = 5
+    concurrency_min: int = 1
+    concurrency_max: int = 16
+    latency_target_p95: float = 2.5
+    trade_timeout: float = 10
+    worker_id: Optional[int] = None
+    process_count: int = 0
+    result_ring_capacity: int = 4096
+    trading_assets: Tuple[str, ...] = ("BTC", "ETH", "SOL")
+    position_direction: str = "random"
+    volume_percentage_range: Tuple[float, float] = (10, 50)
+    max_net_exposure: Optional[float] = None
+    balance_cache_ttl: float = 30
+    result_buffer_size: int = 1000
+    position_hold_time: Optional[float] = None
+    position_close_batch: int = 100
+    price_feed: Optional[str] = None
+    price_poll_interval: float = 1.0
+    price_max_age: float = 5.0
+    price_replay_speed: float = 1.0
+    leverage: float = 5
+    max_leverage: float = 20
+    max_retries: int = 3
+    retry_delay: float = 5
+    gas_limit: int = 300000
+    slippage_tolerance: float = 0.5
+    status_port: Optional[int] = None
+    trace_sample_rate: float = 0.0
+    trace_file: Optional[str] = None
+    trace_collector: Optional[str] = None
+    settings_file: Optional[str] = None
+    settings_poll_interval: float = 5
+
+    def with_overrides(self, overrides: Dict[str, Any]) -> "Settings":
+        """Build new settings with reloadable keys replaced by overrides"""
+        ignored = sorted(set(overrides) - RELOADABLE_KEYS)
+        if ignored:
+            logger.warning(
+                f"Ignoring settings that need a restart: {', '.join(ignored)}"
+            )
+        values = asdict(self)
+        values.update(
+            (key, value) for key, value in overrides.items() if key in RELOADABLE_KEYS
+        )
+        return compile_settings(values)
+
+
+def _pair(value: Any, cast: Callable) -> Tuple:
+    """Convert a two-item range (list or tuple) to a typed tuple"""
+    low, high = value
+    return cast(low), cast(high)
+
+
+def _check_range(errors, name, value, minimum, maximum=None):
+    """Record an error unless minimum <= low <= high (<= maximum)"""
+    low, high = value
+    if low < minimum or low > high or (maximum is not None and high > maximum):
+        bounds = f"{minimum} <= min <= max" + (f" <= {maximum}" if maximum else "")
+        errors.append(f"{name} must satisfy {bounds}, got {value}")
+
+
+def compile_settings(config: Dict[str, Any]) -> Settings:
+    """
+    Compile a config dict into Settings.
+
+    Missing keys take their defaults, unknown keys (such as UI options)
+    are left to their consumers. Raises ValueError listing every problem.
+    """
+    known = {field.name for field in fields(Settings)}
+    values = {key: value for key, value in config.items() if key in known}
+    errors = []
+
+    try:
+        for name, cast in (
+            ("launch_delay", float),
+            ("branch_wallet_range", int),
+            ("volume_percentage_range", float),
+        ):
+            if name in values:
+                values[name] = _pair(values[name], cast)
+        if "trading_assets" in values:
+            values["trading_assets"] = tuple(values["trading_assets"])
+        for name in (
+            "thread_count", "max_parallel_branches", "result_buffer_size",
+            "concurrency_min", "concurrency_max", "proxy_preflight_parallelism",
+            "process_count", "result_ring_capacity", "position_close_batch",
+        ):
+            if name in values:
+                values[name] = int(values[name])
+    except (TypeError, ValueError) as e:
+        raise ValueError(f"Invalid settings: {e}") from e
+
+    settings = Settings(**values)
+
+    if settings.proxy_type not in PROXY_TYPES:
+        errors.append(f"proxy_type must be one of {PROXY_TYPES}")
+    if settings.proxy_assignment not in PROXY_ASSIGNMENTS:
+        errors.append(f"proxy_assignment must be one of {PROXY_ASSIGNMENTS}")
+    if settings.proxy_max_failures is not None and settings.proxy_max_failures < 1:
+        errors.append("proxy_max_failures must be at least 1")
+    if settings.proxy_preflight_timeout <= 0:
+        errors.append("proxy_preflight_timeout must be positive")
+    if settings.proxy_preflight_parallelism < 1:
+        errors.append("proxy_preflight_parallelism must be at least 1")
+    if settings.execution_mode not in EXECUTION_MODES:
+        errors.append(f"execution_mode must be one of {EXECUTION_MODES}")
+    if settings.position_direction not in POSITION_DIRECTIONS:
+        errors.append(f"position_direction must be one of {POSITION_DIRECTIONS}")
+    if settings.thread_count < 1:
+        errors.append("thread_count must be at least 1")
+    if settings.max_parallel_branches < 1:
+        errors.append("max_parallel_branches must be at least 1")
+    if not 1 <= settings.concurrency_min <= settings.concurrency_max <= MAX_CONCURRENCY:
+        errors.append(
+            f"concurrency limits must satisfy 1 <= concurrency_min <= "
+            f"concurrency_max <= {MAX_CONCURRENCY}"
+        )
+    if not 0 <= settings.process_count <= MAX_PROCESSES:
+        errors.append(f"process_count must be between 0 and {MAX_PROCESSES}")
+    if settings.result_ring_capacity < 1:
+        errors.append("result_ring_capacity must be at least 1")
+    if settings.latency_target_p95 <= 0 or settings.trade_timeout <= 0:
+        errors.append("latency_target_p95 and trade_timeout must be positive")
+    if settings.result_buffer_size < 1:
+        errors.append("result_buffer_size must be at least 1")
+    if settings.status_port is not None and not 0 <= settings.status_port <= 65535:
+        errors.append("status_port must be between 0 and 65535")
+    if not 0 <= settings.trace_sample_rate <= 1:
+        errors.append("trace_sample_rate must be between 0 and 1")
+    if settings.settings_poll_interval <= 0:
+        errors.append("settings_poll_interval must be positive")
+    if settings.max_net_exposure is not None and settings.max_net_exposure < 0:
+        errors.append("max_net_exposure must not be negative")
+    if settings.position_hold_time is not None and settings.position_hold_time < 0:
+        errors.append("position_hold_time must not be negative")
+    if settings.position_close_batch < 1:
+        errors.append("position_close_batch must be at least 1")
+    if settings.price_poll_interval <= 0 or settings.price_max_age <= 0:
+        errors.append("price_poll_interval and price_max_age must be positive")
+    if settings.price_replay_speed <= 0:
+        errors.append("price_replay_speed must be positive")
+    if settings.leverage < 1 or settings.max_leverage < 1:
+        errors.append("leverage and max_leverage must be at least 1")
+    elif settings.leverage > settings.max_leverage:
+        errors.append("leverage must not exceed max_leverage")
+    if settings.slippage_tolerance < 0:
+        errors.append("slippage_tolerance must not be negative")
+    if settings.balance_cache_ttl < 0:
+        errors.append("balance_cache_ttl must not be negative")
+    if not settings.trading_assets:
+        errors.append("trading_assets must not be empty")
+    if settings.worker_id is not None and settings.worker_id < 0:
+        errors.append("worker_id must not be negative")
+    _check_range(errors, "launch_delay", settings.launch_delay, 0)
+    # A branch needs at least one long and one short leg
+    _check_range(errors, "branch_wallet_range", settings.branch_wallet_range, 2)
+    _check_range(
+        errors, "volume_percentage_range", settings.volume_percentage_range, 0, 100
+    )
+
+    if errors:
+        raise ValueError(f"Invalid settings: {'; '.join(errors)}")
+    return settings
+
+
+class SettingsReloader:
+    """
+    Reloads settings overrides from a JSON file.
+
+    A reload is triggered by SIGHUP (POSIX, main thread only), by polling
+    the file modification time, or by calling reload() directly. Invalid
+    files are logged and the current settings stay in place.
+    """
+
+    def __init__(self, path: str, apply: Callable[[Dict[str, Any]], Settings]):
+        self.path = path
+        self.apply = apply
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def reload(self) -> bool:
+        """Read the settings file and apply it, return whether it was applied"""
+        try:
+            with open(self.path) as f:
+                overrides = json.load(f)
+            if not isinstance(overrides, dict):
+                raise ValueError("expected a JSON object")
+            self.apply(overrides)
+        except (OSError, ValueError) as e:
+            logger.error(f"Settings reload from {self.path} failed: {e}")
+            return False
+        logger.info(
+            f"Settings reloaded from {self.path}: {', '.join(sorted(overrides))}"
+        )
+        return True
+
+    def install_signal_handler(self) -> bool:
+        """Reload on SIGHUP, return False where the signal is unavailable"""
+        if not hasattr(signal, "SIGHUP"):
+            return False
+        signal.signal(signal.SIGHUP, lambda signum, frame: self.reload())
+        return True
+
+    def _mtime(self) -> Optional[int]:
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
+
+    def _poll(self, interval: float):
+        last_mtime = self._mtime()
+        while not self._stop.wait(interval):
+            mtime = self._mtime()
+            if mtime is not None and mtime != last_mtime:
+                last_mtime = mtime
+                self.reload()
+
+    def start_polling(self, interval: float = 5.0):
+        """Reload whenever the file changes, checked every interval seconds"""
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._poll, args=(interval,), name="settings-reloader", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Stop polling"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
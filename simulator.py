@@ -0,0 +1,98 @@
+import random
+import threading
+import time
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from config import logger
+
+
+class SimulatedBackend:
+    """
+    Local stand-in for the trading platform API.
+
+    Keeps per-wallet collateral balances and simulates request latency
+    and failures, so sessions can run end to end without a network.
+    """
+
+    def __init__(
+        self,
+        starting_balance: float = 10000.0,
+        latency_range: Tuple[float, float] = (0.5, 2.0),
+        error_rate: float = 0.0,
+        seed: Optional[int] = None,
+    ):
+        self.starting_balance = starting_balance
+        self.latency_range = latency_range
+        self.error_rate = error_rate
+        self.balances: Dict[str, float] = {}
+        self.request_count = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _round_trip(self):
+        """Simulate one request/response round trip"""
+        with self._lock:
+            self.request_count += 1
+            delay = self._random.uniform(*self.latency_range)
+        if delay > 0:
+            time.sleep(delay)
+
+    def _balance(self, wallet_key: str) -> float:
+        """Get balance for wallet, funding it on first use"""
+        return self.balances.setdefault(wallet_key, self.starting_balance)
+
+    def get_balances(self, wallet_keys: Iterable[str]) -> Dict[str, float]:
+        """Get balances for a batch of wallets in a single request"""
+        self._round_trip()
+        with self._lock:
+            return {wallet_key: self._balance(wallet_key) for wallet_key in wallet_keys}
+
+    def _fill(self, wallet_key: str, size: float) -> Dict[str, str]:
+        """Validate and fill one order (caller holds the lock)"""
+        if self._random.random() < self.error_rate:
+            logger.warning(f"Simulated backend error for {wallet_key[:10]}...")
+            return {"status": "failed", "error": "Backend error"}
+        if size > self._balance(wallet_key):
+            return {"status": "failed", "error": "Insufficient balance"}
+        self.balances[wallet_key] -= size
+        return {"status": "success"}
+
+    def submit_order(
+        self, wallet_key: str, asset: str, direction: str, size: float
+    ) -> Dict[str, str]:
+        """Submit a single order; the size is debited from the wallet balance"""
+        self._round_trip()
+        with self._lock:
+            return self._fill(wallet_key, size)
+
+    def submit_batch(
+        self, orders: List[Tuple[str, str, str, float]]
+    ) -> List[Dict[str, str]]:
+        """
+        Submit (wallet_key, asset, direction, size) orders in one request.
+
+        Orders are filled independently, so the response may mix
+        successes and failures.
+        """
+        self._round_trip()
+        with self._lock:
+            return [self._fill(wallet_key, size) for wallet_key, _, _, size in orders]
+
+    def close_batch(
+        self, orders: List[Tuple[str, str, str, float]]
+    ) -> List[Dict[str, str]]:
+        """
+        Close positions in one request; orders are (wallet_key, asset,
+        closing direction, size) and the size is credited back.
+        """
+        self._round_trip()
+        with self._lock:
+            responses = []
+            for wallet_key, _, _, size in orders:
+                if self._random.random() < self.error_rate:
+                    responses.append({"status": "failed", "error": "Backend error"})
+                else:
+                    self.balances[wallet_key] = self._balance(wallet_key) + size
+                    responses.append({"status": "success"})
+            return responses
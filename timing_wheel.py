@@ -0,0 +1,61 @@
+import math
+
+from typing import Any, List, Tuple
+
+
+class TimingWheel:
+    """
+    Hashed timing wheel for deadlines.
+
+    Time is cut into ticks and an entry due at tick t goes into bucket
+    t % slots, so scheduling is O(1). advance() visits each elapsed bucket
+    once and takes the entries that are due; entries a lap or more ahead
+    stay in place. With the wheel sized to cover the usual deadline, a tick
+    only touches the entries that expire in it.
+    """
+
+    def __init__(self, tick: float, slots: int, now: float):
+        self.tick = tick
+        self.slots = slots
+        self._buckets: List[List[Tuple[int, Any]]] = [[] for _ in range(slots)]
+        # Last tick advance() has processed
+        self._current = int(now / tick)
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def schedule(self, deadline: float, item: Any):
+        """Add item, due at deadline (seconds on the clock passed to advance)"""
+        due = max(math.ceil(deadline / self.tick), self._current + 1)
+        self._buckets[due % self.slots].append((due, item))
+        self._count += 1
+
+    def advance(self, now: float) -> List[Any]:
+        """Move the wheel to now and take every item that is due"""
+        target = int(now / self.tick)
+        expired: List[Any] = []
+        # Every bucket is visited at most once, however long the gap
+        last = min(target, self._current + self.slots)
+        for tick in range(self._current + 1, last + 1):
+            bucket = self._buckets[tick % self.slots]
+            if not bucket:
+                continue
+            pending = []
+            for entry in bucket:
+                if entry[0] <= target:
+                    expired.append(entry[1])
+                else:
+                    pending.append(entry)
+            self._buckets[tick % self.slots] = pending
+        self._current = max(self._current, target)
+        self._count -= len(expired)
+        return expired
+
+    def drain(self) -> List[Any]:
+        """Take every remaining item regardless of its deadline"""
+        entries = [entry for bucket in self._buckets for entry in bucket]
+        items = [item for _, item in sorted(entries, key=lambda entry: entry[0])]
+        self._buckets = [[] for _ in range(self.slots)]
+        self._count = 0
+        return items
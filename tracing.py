@@ -0,0 +1,238 @@
+import argparse
+import json
+import os
+import random
+import socket
+import threading
+import time
+
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+
+class Span:
+    """Timed stage of a trace; use as a context manager"""
+
+    __slots__ = (
+        "name", "trace_id", "span_id", "parent_id", "start", "duration",
+        "attributes", "_tracer", "_trace", "_token", "_started",
+    )
+
+    def __init__(self, tracer, name, trace_id, span_id, parent_id, trace, attributes):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.attributes = attributes
+        self.start = 0.0
+        self.duration = 0.0
+        self._tracer = tracer
+        # Spans of the whole trace, exported together when the root ends
+        self._trace: List["Span"] = trace
+        self._token = None
+        self._started = 0.0
+
+    def set(self, **attributes):
+        """Add attributes to the span"""
+        self.attributes.update(attributes)
+
+    def __enter__(self) -> "Span":
+        self.start = time.time()
+        self._started = time.perf_counter()
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.duration = time.perf_counter() - self._started
+        if exc is not None:
+            self.attributes["error"] = repr(exc)
+        _current_span.reset(self._token)
+        self._trace.append(self)
+        if self.parent_id is None:
+            self._tracer.export(self._trace)
+        return False
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start": self.start,
+            "duration_ms": self.duration * 1000,
+            **self.attributes,
+        }
+
+
+class _NoopSpan:
+    """Stand-in for spans of unsampled traces: costs one attribute lookup"""
+
+    __slots__ = ()
+
+    def set(self, **attributes):
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        return False
+
+
+NOOP_SPAN = _NoopSpan()
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+class JsonLinesExporter:
+    """Append finished spans to a file, one JSON object per line"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+
+    def export(self, spans: List[Span]):
+        lines = "".join(json.dumps(span.to_dict()) + "\n" for span in spans)
+        with self._lock, open(self.path, "a") as f:
+            f.write(lines)
+
+
+class UdpExporter:
+    """Send finished spans as JSON lines to a local collector over UDP"""
+
+    def __init__(self, address: str):
+        host, _, port = address.rpartition(":")
+        self.address = (host or "127.0.0.1", int(port))
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+
+    def export(self, spans: List[Span]):
+        for span in spans:
+            try:
+                self._socket.sendto(json.dumps(span.to_dict()).encode(), self.address)
+            except OSError:
+                # Fire and forget: a missing collector must not slow trades
+                pass
+
+
+class InMemoryExporter:
+    """Keep finished spans in a list (tests and ad-hoc inspection)"""
+
+    def __init__(self):
+        self.spans: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def export(self, spans: List[Span]):
+        with self._lock:
+            self.spans.extend(span.to_dict() for span in spans)
+
+
+class Tracer:
+    """
+    Head-sampled tracer.
+
+    trace() decides once per root (trade or branch) whether it is
+    recorded; span() creates a child of the current span, or a no-op span
+    when there is none or its trace was not sampled. Disabled by default.
+    """
+
+    def __init__(self, sample_rate: float = 0.0, exporter=None):
+        self.sample_rate = sample_rate
+        self.exporter = exporter
+        self._random = random.Random()
+        if hasattr(os, "register_at_fork"):
+            # Forked worker processes must not repeat the parent's IDs
+            os.register_at_fork(after_in_child=self._random.seed)
+
+    def _new_id(self) -> str:
+        return f"{self._random.getrandbits(64):016x}"
+
+    def trace(self, name: str, **attributes):
+        """Start a root span, or join the current trace if one is active"""
+        if _current_span.get() is not None:
+            return self.span(name, **attributes)
+        if not self.sample_rate or self._random.random() >= self.sample_rate:
+            return NOOP_SPAN
+        return Span(self, name, self._new_id(), self._new_id(), None, [], attributes)
+
+    def span(self, name: str, **attributes):
+        """Start a child of the current span"""
+        parent = _current_span.get()
+        if parent is None:
+            return NOOP_SPAN
+        return Span(
+            self, name, parent.trace_id, self._new_id(), parent.span_id,
+            parent._trace, attributes,
+        )
+
+    def export(self, spans: List[Span]):
+        if self.exporter is not None:
+            self.exporter.export(spans)
+
+
+# Process-wide tracer, configured by the session (see configure())
+tracer = Tracer()
+
+
+class _FanOutExporter:
+    """Export to several exporters"""
+
+    def __init__(self, exporters):
+        self.exporters = exporters
+
+    def export(self, spans: List[Span]):
+        for exporter in self.exporters:
+            exporter.export(spans)
+
+
+def configure(
+    sample_rate: float,
+    trace_file: Optional[str] = None,
+    collector: Optional[str] = None,
+):
+    """Sample traces at sample_rate into a JSON lines file and/or a UDP collector"""
+    exporters = []
+    if trace_file:
+        exporters.append(JsonLinesExporter(trace_file))
+    if collector:
+        exporters.append(UdpExporter(collector))
+    if len(exporters) > 1:
+        tracer.exporter = _FanOutExporter(exporters)
+    else:
+        tracer.exporter = exporters[0] if exporters else None
+    tracer.sample_rate = sample_rate if exporters else 0.0
+
+
+def summarize(path: str) -> Dict[str, Dict[str, float]]:
+    """Per-stage count and duration percentiles (ms) from a JSON lines trace file"""
+    durations: Dict[str, List[float]] = {}
+    with open(path) as f:
+        for line in f:
+            span = json.loads(line)
+            durations.setdefault(span["name"], []).append(span["duration_ms"])
+
+    summary = {}
+    for name, values in durations.items():
+        values.sort()
+        summary[name] = {"count": len(values)}
+        for pct in (50, 95, 99):
+            index = max(0, -(-len(values) * pct // 100) - 1)
+            summary[name][f"p{pct}_ms"] = values[index]
+    return summary
+
+
+def main(argv: Optional[List[str]] = None):
+    """Show where trade latency goes, stage by stage, from a trace file"""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("trace_file")
+    args = parser.parse_args(argv)
+
+    print(f"{'stage':<20}{'count':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for name, stats in sorted(summarize(args.trace_file).items()):
+        print(
+            f"{name:<20}{stats['count']:>8}{stats['p50_ms']:>10.2f}"
+            f"{stats['p95_ms']:>10.2f}{stats['p99_ms']:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
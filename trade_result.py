@@ -0,0 +1,162 @@
+import threading
+import time
+
+from base64 import b64encode
+from collections import deque
+from datetime import datetime
+from enum import IntEnum
+from typing import Any, Deque, Dict, List, Optional
+
+from tx_ids import format_tx_id
+
+
+# Backend errors that refuse the order itself: the request went through, so
+# they say nothing about the health of the proxy, connection or backend
+REJECTION_ERRORS = frozenset({"Insufficient balance"})
+
+
+class TradeStatus(IntEnum):
+    SUCCESS = 1
+    FAILED = 2
+
+
+class Direction(IntEnum):
+    # Same signs as PositionBook sides
+    LONG = 1
+    SHORT = -1
+
+    @classmethod
+    def from_name(cls, name: str) -> "Direction":
+        """Get direction from its lowercase name ("long" or "short")"""
+        return cls[name.upper()]
+
+    @property
+    def label(self) -> str:
+        """Lowercase name as used in configs and CSV files"""
+        return self.name.lower()
+
+
+# Process-wide asset interning: small integer codes instead of strings
+_asset_names: List[str] = []
+_asset_codes: Dict[str, int] = {}
+_asset_lock = threading.Lock()
+
+
+def asset_code(asset: str) -> int:
+    """Get code for asset name, registering it on first use"""
+    code = _asset_codes.get(asset)
+    if code is None:
+        with _asset_lock:
+            code = _asset_codes.get(asset)
+            if code is None:
+                code = len(_asset_names)
+                _asset_names.append(asset)
+                _asset_codes[asset] = code
+    return code
+
+
+def asset_name(code: int) -> str:
+    """Get asset name for code"""
+    return _asset_names[code]
+
+
+class TradeResult:
+    """
+    Compact record of one trade outcome.
+
+    Holds numbers and enum codes only (epoch timestamp, numeric transaction
+    ID, raw signature digest); strings are produced when the record reaches
+    a sink such as the CSV writer or a log line.
+    """
+
+    __slots__ = (
+        "timestamp", "wallet", "asset", "direction", "size",
+        "status", "tx_id", "error", "signature",
+    )
+
+    def __init__(
+        self,
+        status: TradeStatus,
+        wallet: str,
+        asset: int,
+        direction: Direction,
+        size: float,
+        tx_id: int = 0,
+        error: str = "",
+        signature: bytes = b"",
+        timestamp: Optional[float] = None,
+    ):
+        self.timestamp = time.time() if timestamp is None else timestamp
+        self.wallet = wallet
+        self.asset = asset
+        self.direction = direction
+        self.size = size
+        self.status = status
+        self.tx_id = tx_id
+        self.error = error
+        self.signature = signature
+
+    @property
+    def success(self) -> bool:
+        return self.status == TradeStatus.SUCCESS
+
+    @property
+    def rejected(self) -> bool:
+        """Failed because the backend refused the order, not the request"""
+        return self.status == TradeStatus.FAILED and self.error in REJECTION_ERRORS
+
+    @property
+    def transaction_hash(self) -> str:
+        """Formatted transaction ID (empty if none was assigned)"""
+        return format_tx_id(self.tx_id) if self.tx_id else ""
+
+    def to_row(self, active_branches: int, thread_count: int) -> Dict[str, Any]:
+        """Format as a CSV row"""
+        return {
+            'timestamp': datetime.fromtimestamp(self.timestamp).isoformat(),
+            'wallet': self.wallet,
+            'asset': asset_name(self.asset),
+            'direction': Direction(self.direction).label,
+            'size': self.size,
+            'status': TradeStatus(self.status).name.lower(),
+            'active_branches': active_branches,
+            'thread_count': thread_count,
+            'transaction_hash': self.transaction_hash,
+            'error': self.error,
+        }
+
+    def __repr__(self) -> str:
+        status = TradeStatus(self.status).name.lower()
+        details = f"{Direction(self.direction).label} {self.size} of {asset_name(self.asset)}"
+        if self.success:
+            signature = b64encode(self.signature).decode("utf-8")
+            return f"{status} {self.transaction_hash} {details} (signature {signature})"
+        return f"{status} {self.transaction_hash or '-'} {details}: {self.error}"
+
+
+class ResultBuffer:
+    """
+    Bounded buffer of recent trade results with running totals.
+
+    Memory stays flat however long the session runs: only the last
+    `capacity` results are kept, older ones are counted and dropped.
+    """
+
+    def __init__(self, capacity: int = 1000):
+        self.recent: Deque[TradeResult] = deque(maxlen=capacity)
+        self.total = 0
+        self.succeeded = 0
+        self.volume = 0.0
+        self._lock = threading.Lock()
+
+    def append(self, result: TradeResult):
+        with self._lock:
+            self.recent.append(result)
+            self.total += 1
+            if result.success:
+                self.succeeded += 1
+                self.volume += result.size
+
+    @property
+    def failed(self) -> int:
+        return self.total - self.succeeded
@@ -1,19 +1,49 @@
+import os
 import random
-
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import (
-    TimeoutException,
-    ElementClickInterceptedException,
-)
-from selenium.webdriver.chrome.options import Options
+import sys
 import time
 import logging
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 
+# Selenium is imported on first use (see _load_selenium) so that importing
+# this module stays cheap for tooling and backend-only sessions
+webdriver = None
+By = None
+WebDriverWait = None
+EC = None
+TimeoutException = None
+ElementClickInterceptedException = None
+Options = None
+
+
+def _load_selenium():
+    """
+    Imports Selenium and binds its names at module level.
+    """
+    global webdriver, By, WebDriverWait, EC, Options
+    global TimeoutException, ElementClickInterceptedException
+    if webdriver is not None:
+        return
+
+    from selenium import webdriver as _webdriver
+    from selenium.webdriver.common.by import By as _By
+    from selenium.webdriver.support.ui import WebDriverWait as _WebDriverWait
+    from selenium.webdriver.support import expected_conditions as _EC
+    from selenium.common.exceptions import (
+        TimeoutException as _TimeoutException,
+        ElementClickInterceptedException as _ElementClickInterceptedException,
+    )
+    from selenium.webdriver.chrome.options import Options as _Options
+
+    By = _By
+    WebDriverWait = _WebDriverWait
+    EC = _EC
+    TimeoutException = _TimeoutException
+    ElementClickInterceptedException = _ElementClickInterceptedException
+    Options = _Options
+    webdriver = _webdriver
+
 
 class TradingPlatformUI:
     """
@@ -39,16 +69,113 @@ class TradingPlatformUI:
         "waitlist_email": 'input[name="waitlist-email"]',
         "submit_waitlist": "#submit-waitlist-btn",
         "trading_history": ".trading-history-table",
+        "wallet_popup": ".wallet-connect-modal",
+        "balance_display": ".account-balance",
+        "approval_confirmed": ".approval-confirmed",
     }
 
-    def __init__(self, headless: bool = True, proxy: Optional[Dict] = None):
+    # Default wait timeout (seconds) for selectors without an explicit entry
+    DEFAULT_TIMEOUT = 10
+
+    # Per-selector upper bounds for waits (seconds)
+    SELECTOR_TIMEOUTS = {
+        "connect_wallet": 15,
+        "wallet_popup": 20,
+        "deposit_button": 15,
+        "balance_display": 30,
+        "approve_usdc": 5,
+        "approval_confirmed": 60,
+        "confirm_trade": 15,
+    }
+
+    # Adaptive timeout = observed step latency (EWMA) * factor, bounded
+    # by the per-selector timeout; it never drops below MIN_TIMEOUT or
+    # MIN_TIMEOUT_SHARE of that timeout, so a run of fast steps does not
+    # make the next slow page load time out
+    ADAPTIVE_TIMEOUT_FACTOR = 3.0
+    MIN_TIMEOUT = 2.0
+    MIN_TIMEOUT_SHARE = 0.5
+    EWMA_ALPHA = 0.3
+
+    PLATFORM_URL = "https://trading-platform-url.com"  # Replace with actual URL
+
+    # Browser profiles: "standard" loads everything, "lean" blocks
+    # resources the automation never looks at
+    BROWSER_PROFILES = ("standard", "lean")
+
+    # URL patterns blocked in the lean profile (Chrome DevTools wildcards)
+    LEAN_BLOCKED_URL_PATTERNS = [
+        # Images
+        "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+        # Fonts
+        "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+        # Media
+        "*.mp4", "*.webm", "*.ogg", "*.mp3", "*.wav",
+        # Analytics and tracking
+        "*google-analytics.com*", "*googletagmanager.com*",
+        "*doubleclick.net*", "*hotjar.com*", "*segment.io*",
+        "*mixpanel.com*",
+    ]
+
+    LEAN_ARGUMENTS = [
+        "--disable-gpu",
+        "--disable-extensions",
+        "--disable-background-networking",
+        "--mute-audio",
+    ]
+
+    # Collects navigation and resource timing from the page
+    PAGE_METRICS_SCRIPT = """
+        const nav = performance.getEntriesByType('navigation')[0];
+        const resources = performance.getEntriesByType('resource');
+        let transferred = nav ? nav.transferSize : 0;
+        for (const entry of resources) {
+            transferred += entry.transferSize || 0;
+        }
+        return {
+            bytes_transferred: transferred,
+            resource_count: resources.length,
+            dom_content_loaded_ms: nav ? nav.domContentLoadedEventEnd : null,
+        };
+    """
+
+    def __init__(
+            self,
+            headless: bool = True,
+            proxy: Optional[Dict] = None,
+            timeouts: Optional[Dict[str, float]] = None,
+            profile: str = "standard",
+            blocked_url_patterns: Optional[List[str]] = None
+    ):
         """
         Initializes the Selenium WebDriver with the specified options.
 
         :param headless: Whether to run the browser in headless mode.
         :param proxy: Optional proxy settings
         as a dictionary {"ip_port": "IP:Port"}.
-        """
+        :param timeouts: Optional per-selector timeout overrides
+        in seconds, merged over SELECTOR_TIMEOUTS.
+        :param profile: Browser profile, "standard" or "lean".
+        :param blocked_url_patterns: Optional URL patterns to block
+        in the lean profile instead of LEAN_BLOCKED_URL_PATTERNS.
+        """
+        if profile not in self.BROWSER_PROFILES:
+            raise ValueError(f"Unknown browser profile: {profile}")
+        self.profile = profile
+        self.blocked_url_patterns = (
+            blocked_url_patterns
+            if blocked_url_patterns is not None
+            else list(self.LEAN_BLOCKED_URL_PATTERNS)
+        )
+        self.page_metrics: List[Dict] = []
+        self.timeouts = dict(self.SELECTOR_TIMEOUTS)
+        if timeouts:
+            self.timeouts.update(timeouts)
+        _load_selenium()
+        self.step_timings: Dict[str, List[float]] = {}
+        self._latency_ewma: Dict[str, float] = {}
+        self._waits: Dict[float, "WebDriverWait"] = {}
+
         self.chrome_options = Options()
         if headless:
             self.chrome_options.add_argument("--headless")
@@ -60,8 +187,23 @@ class TradingPlatformUI:
 
         self.chrome_options.add_argument("--no-sandbox")
         self.chrome_options.add_argument("--disable-dev-shm-usage")
+        if self.profile == "lean":
+            self._apply_lean_profile()
         self.setup_logging()
 
+    def _apply_lean_profile(self):
+        """
+        Configures Chrome for minimal page weight: eager page loads
+        (no waiting for images and subframes), no GPU or extensions,
+        and images disabled at the content-settings level.
+        """
+        self.chrome_options.page_load_strategy = "eager"
+        for argument in self.LEAN_ARGUMENTS:
+            self.chrome_options.add_argument(argument)
+        self.chrome_options.add_experimental_option(
+            "prefs", {"profile.managed_default_content_settings.images": 2}
+        )
+
     def setup_logging(self):
         """
         Sets up logging for the automation process.
@@ -73,16 +215,58 @@ class TradingPlatformUI:
             format="%(asctime)s - %(message)s",
         )
 
-    def start_session(self, user_agent: str):
+    def start_session(self, user_agent: str, url: Optional[str] = None):
         """
         Starts a Selenium session with the specified user agent.
 
         :param user_agent: The user agent string to use for the browser.
+        :param url: Optional page to open instead of PLATFORM_URL.
         """
         self.chrome_options.add_argument(f"user-agent={user_agent}")
         self.driver = webdriver.Chrome(options=self.chrome_options)
-        self.wait = WebDriverWait(self.driver, 10)
-        self.driver.get("https://trading-platform-url.com")  # Replace with actual URL
+        self.wait = WebDriverWait(self.driver, self.DEFAULT_TIMEOUT)
+        self._waits = {float(self.DEFAULT_TIMEOUT): self.wait}
+        if self.profile == "lean":
+            self._install_request_filter()
+        self.load_page(url or self.PLATFORM_URL)
+
+    def _install_request_filter(self):
+        """
+        Blocks non-essential requests (images, fonts, media, analytics)
+        before they reach the network, so they never go through the proxy.
+        """
+        self.driver.execute_cdp_cmd("Network.enable", {})
+        self.driver.execute_cdp_cmd(
+            "Network.setBlockedURLs", {"urls": self.blocked_url_patterns}
+        )
+
+    def load_page(self, url: str) -> Dict:
+        """
+        Opens a page and records its load time and transferred bytes.
+
+        :param url: The page URL.
+        :return: The recorded page metrics.
+        """
+        started = time.perf_counter()
+        self.driver.get(url)
+        metrics = {
+            "url": url,
+            "profile": self.profile,
+            "load_time": time.perf_counter() - started,
+            "bytes_transferred": 0,
+            "resource_count": 0,
+        }
+        try:
+            metrics.update(self.driver.execute_script(self.PAGE_METRICS_SCRIPT))
+        except Exception as e:
+            logging.warning(f"Could not read page metrics for {url}: {str(e)}")
+        self.page_metrics.append(metrics)
+        logging.info(
+            f"Loaded {url} ({self.profile} profile) in "
+            f"{metrics['load_time']:.3f}s, "
+            f"{metrics['bytes_transferred']} bytes transferred"
+        )
+        return metrics
 
     def close_session(self):
         """
@@ -91,17 +275,130 @@ class TradingPlatformUI:
         if hasattr(self, "driver"):
             self.driver.quit()
 
-    def wait_and_click(self, selector: str, timeout: int = 10):
+    @staticmethod
+    def _locator(selector: str) -> Tuple[str, str]:
+        """
+        Builds a Selenium locator, treating selectors
+        starting with "//" as XPath and the rest as CSS.
+
+        :param selector: The selector string.
+        :return: A (By, selector) tuple.
+        """
+        if selector.startswith("//"):
+            return By.XPATH, selector
+        return By.CSS_SELECTOR, selector
+
+    def timeout_for(self, step: str) -> float:
+        """
+        Returns the current wait timeout for a step. Once the step
+        has been observed, the timeout follows its recent latency,
+        but stays at least MIN_TIMEOUT_SHARE of the configured one.
+
+        :param step: The selector key or step name.
+        :return: Timeout in seconds.
+        """
+        upper = float(self.timeouts.get(step, self.DEFAULT_TIMEOUT))
+        observed = self._latency_ewma.get(step)
+        if observed is None:
+            return upper
+        adaptive = observed * self.ADAPTIVE_TIMEOUT_FACTOR
+        floor = max(self.MIN_TIMEOUT, upper * self.MIN_TIMEOUT_SHARE)
+        return min(upper, max(floor, adaptive))
+
+    def _get_wait(self, timeout: float) -> "WebDriverWait":
+        """
+        Returns a cached WebDriverWait for the given timeout.
+        Timeouts are rounded to half a second to keep the cache small.
+
+        :param timeout: Timeout in seconds.
+        :return: WebDriverWait instance bound to the current driver.
+        """
+        timeout = max(0.5, round(timeout * 2) / 2)
+        wait = self._waits.get(timeout)
+        if wait is None:
+            wait = WebDriverWait(self.driver, timeout)
+            self._waits[timeout] = wait
+        return wait
+
+    def _record_step(self, step: str, elapsed: float, success: bool):
+        """
+        Records how long a step took and updates its latency estimate.
+        Timed-out steps push the estimate up so the next attempt
+        gets a longer timeout.
+
+        :param step: The selector key or step name.
+        :param elapsed: Step duration in seconds.
+        :param success: Whether the step's condition was met.
+        """
+        self.step_timings.setdefault(step, []).append(elapsed)
+        sample = elapsed if success else elapsed * 2
+        previous = self._latency_ewma.get(step)
+        if previous is None:
+            self._latency_ewma[step] = sample
+        else:
+            self._latency_ewma[step] = (
+                self.EWMA_ALPHA * sample + (1 - self.EWMA_ALPHA) * previous
+            )
+        logging.info(
+            f"UI step {step} took {elapsed:.3f}s "
+            f"({'ok' if success else 'failed'})"
+        )
+
+    def wait_for(self, step: str, condition, timeout: Optional[float] = None):
+        """
+        Waits until a condition holds, timing the wait as a step.
+
+        :param step: The selector key or step name used for
+        timeouts and timings.
+        :param condition: An expected condition callable.
+        :param timeout: Optional explicit timeout in seconds.
+        :return: The condition's result.
+        :raises TimeoutException: If the condition is not met in time.
+        """
+        if timeout is None:
+            timeout = self.timeout_for(step)
+        started = time.perf_counter()
+        try:
+            result = self._get_wait(timeout).until(condition)
+        except TimeoutException:
+            self._record_step(step, time.perf_counter() - started, False)
+            raise
+        self._record_step(step, time.perf_counter() - started, True)
+        return result
+
+    def get_step_timings(self) -> Dict[str, Dict[str, float]]:
+        """
+        Summarises recorded step durations.
+
+        :return: Mapping of step name to count, mean, max and
+        current timeout (seconds).
+        """
+        return {
+            step: {
+                "count": len(durations),
+                "mean": sum(durations) / len(durations),
+                "max": max(durations),
+                "timeout": self.timeout_for(step),
+            }
+            for step, durations in self.step_timings.items()
+        }
+
+    def wait_and_click(self, selector: str, timeout: Optional[float] = None):
         """
         Waits for an element to be clickable and clicks it.
 
-        :param selector: The CSS selector of the element to click.
-        :param timeout: Maximum time to wait for the element.
+        :param selector: The selector key in SELECTORS
+        or a raw CSS/XPath selector.
+        :param timeout: Optional explicit timeout; by default
+        the selector's adaptive timeout is used.
         :return: True if click was successful, False otherwise.
         """
+        step = self._selector_key(selector)
         try:
-            element = WebDriverWait(self.driver, timeout).until(
-                EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
+            element = self.wait_for(
+                step,
+                EC.element_to_be_clickable(self._locator(selector)),
+                timeout,
             )
             element.click()
             return True
@@ -109,6 +406,21 @@ class TradingPlatformUI:
             logging.error(f"Error clicking element {selector}: {str(e)}")
             return False
 
+    def _selector_key(self, selector: str) -> str:
+        """
+        Maps a raw selector back to its SELECTORS key for
+        timeout lookups and timings.
+
+        :param selector: The selector string.
+        :return: The matching key, or the selector itself.
+        """
+        for key, value in self.SELECTORS.items():
+            if value == selector:
+                return key
+            if isinstance(value, dict) and selector in value.values():
+                return key
+        return selector
+
     def get_random_user_agent(self) -> str:
         """
         Returns random User-Agent for the imitation of various browsers .
@@ -161,10 +473,19 @@ class TradingPlatformUI:
         :return: True if successfully connected, False otherwise.
         """
         try:
+            windows_before = len(self.driver.window_handles)
             if self.wait_and_click(self.SELECTORS["connect_wallet"]):
-                # Handle wallet connection popup/interaction
-                # This would depend on the specific wallet integration
-                time.sleep(2)  # Wait for wallet popup
+                # Wallet popup opens either as a new window or as a modal
+                # (the interaction itself depends on the wallet integration)
+                self.wait_for(
+                    "wallet_popup",
+                    EC.any_of(
+                        EC.number_of_windows_to_be(windows_before + 1),
+                        EC.visibility_of_element_located(
+                            self._locator(self.SELECTORS["wallet_popup"])
+                        ),
+                    ),
+                )
                 return True
             return False
         except Exception as e:
@@ -187,15 +508,30 @@ class TradingPlatformUI:
         :return: True if successful, False otherwise.
         """
         try:
+            balance_before = self._read_balance()
             if self.wait_and_click(self.SELECTORS["deposit_button"]):
-                # Handle deposit confirmation
-                time.sleep(2)
+                # Deposit is confirmed once the displayed balance changes
+                self.wait_for(
+                    "balance_display",
+                    lambda driver: self._read_balance() != balance_before,
+                )
                 return True
             return False
         except Exception as e:
             logging.error(f"Error making deposit: {str(e)}")
             return False
 
+    def _read_balance(self) -> Optional[str]:
+        """
+        Reads the displayed account balance.
+
+        :return: Balance text, or None if the element is not present.
+        """
+        elements = self.driver.find_elements(
+            *self._locator(self.SELECTORS["balance_display"])
+        )
+        return elements[0].text if elements else None
+
     def select_asset(self, asset: str) -> bool:
         """
         Selects an asset from the dropdown menu for trading.
@@ -261,7 +597,21 @@ class TradingPlatformUI:
 
             # Approve USDC if needed
             if self.wait_and_click(self.SELECTORS["approve_usdc"]):
-                time.sleep(2)  # Wait for approval
+                # Approval is confirmed once the confirmation marker shows
+                # up or the approve button goes away
+                self.wait_for(
+                    "approval_confirmed",
+                    EC.any_of(
+                        EC.presence_of_element_located(
+                            self._locator(
+                                self.SELECTORS["approval_confirmed"]
+                            )
+                        ),
+                        EC.invisibility_of_element_located(
+                            self._locator(self.SELECTORS["approve_usdc"])
+                        ),
+                    ),
+                )
 
             # Confirm trade
             return self.wait_and_click(self.SELECTORS["confirm_trade"])
@@ -294,6 +644,26 @@ class UITradingSession:
         """
         self.config = config
         self.ui = None
+        self.run_summary = {
+            "browser_profile": config.get("browser_profile", "standard"),
+            "page_loads": 0,
+            "load_time": 0.0,
+            "bytes_transferred": 0,
+        }
+
+    def _update_run_summary(self, ui: "TradingPlatformUI"):
+        """
+        Adds page load figures of a finished UI session to the run summary.
+
+        :param ui: The finished UI session.
+        """
+        for metrics in ui.page_metrics:
+            self.run_summary["page_loads"] += 1
+            self.run_summary["load_time"] += metrics["load_time"]
+            self.run_summary["bytes_transferred"] += (
+                metrics["bytes_transferred"]
+            )
+        logging.info(f"UI run summary: {self.run_summary}")
 
     def execute_trading_sequence(
         self, wallet_key: str, proxy: Dict, user_agent: str
@@ -308,7 +678,15 @@ class UITradingSession:
         :return: True if the trading sequence was successful, False otherwise.
         """
         try:
-            self.ui = TradingPlatformUI(headless=True, proxy=proxy)
+            self.ui = TradingPlatformUI(
+                headless=True,
+                proxy=proxy,
+                timeouts=self.config.get("ui_timeouts"),
+                profile=self.config.get("browser_profile", "standard"),
+                blocked_url_patterns=self.config.get(
+                    "blocked_url_patterns"
+                ),
+            )
             self.ui.start_session(user_agent)
 
             # Execute trading steps
@@ -346,9 +724,127 @@ class UITradingSession:
 
         finally:
             if self.ui:
+                logging.info(f"UI step timings: {self.ui.get_step_timings()}")
+                self._update_run_summary(self.ui)
                 self.ui.close_session()
 
 
+# Third-party script the benchmark page loads, as sites embed it; the
+# browser resolves its host to the local server (--host-resolver-rules)
+BENCHMARK_THIRD_PARTY_HOST = "cdn.segment.io"
+BENCHMARK_THIRD_PARTY_PATH = "/analytics.js/v1/benchmark/analytics.min.js"
+
+
+def benchmark_browser_profiles(
+        profiles: Tuple[str, ...] = TradingPlatformUI.BROWSER_PROFILES,
+        user_agent: Optional[str] = None
+) -> Dict[str, Dict]:
+    """
+    Loads a local static test page with each browser profile
+    and reports load time and transferred bytes per profile.
+
+    The page references an image, a web font, a media file and a
+    third-party analytics script, all served from a temporary local
+    HTTP server. Each profile's metrics also list the paths the
+    server actually served.
+
+    :param profiles: Browser profiles to compare.
+    :param user_agent: Optional user agent for the browser sessions.
+    :return: Mapping of profile name to its page metrics.
+    """
+    import functools
+    import http.server
+    import tempfile
+    import threading
+
+    served: List[str] = []
+
+    class Handler(http.server.SimpleHTTPRequestHandler):
+        def end_headers(self):
+            # Lets resource timing report sizes of cross-origin requests
+            self.send_header("Timing-Allow-Origin", "*")
+            super().end_headers()
+
+        def do_GET(self):
+            served.append(self.path.split("?")[0])
+            super().do_GET()
+
+        def log_message(self, format, *args):
+            pass
+
+    with tempfile.TemporaryDirectory() as site_dir:
+        _write_static_test_site(site_dir)
+        handler = functools.partial(Handler, directory=site_dir)
+        server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        port = server.server_address[1]
+        url = f"http://127.0.0.1:{port}/index.html"
+
+        results = {}
+        try:
+            for profile in profiles:
+                served.clear()
+                ui = TradingPlatformUI(headless=True, profile=profile)
+                ui.chrome_options.add_argument(
+                    f"--host-resolver-rules=MAP {BENCHMARK_THIRD_PARTY_HOST} "
+                    f"127.0.0.1:{port}"
+                )
+                try:
+                    ui.start_session(
+                        user_agent or ui.get_random_user_agent(), url=url
+                    )
+                    results[profile] = dict(
+                        ui.page_metrics[-1], served_paths=sorted(set(served))
+                    )
+                finally:
+                    ui.close_session()
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    for profile, metrics in results.items():
+        logging.info(
+            f"Profile {profile}: {metrics['load_time']:.3f}s, "
+            f"{metrics['bytes_transferred']} bytes, "
+            f"{metrics['resource_count']} resources"
+        )
+    return results
+
+
+def _write_static_test_site(site_dir: str):
+    """
+    Writes a static page with typical non-essential resources.
+
+    :param site_dir: Directory to write the site into.
+    """
+    assets = {
+        "hero.png": 512 * 1024,
+        "font.woff2": 128 * 1024,
+        "intro.mp4": 1024 * 1024,
+        BENCHMARK_THIRD_PARTY_PATH.lstrip("/"): 64 * 1024,
+    }
+    for name, size in assets.items():
+        path = os.path.join(site_dir, *name.split("/"))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(os.urandom(size))
+
+    with open(os.path.join(site_dir, "index.html"), "w") as f:
+        f.write(
+            "<html><head>"
+            "<style>@font-face {font-family: t; src: url(font.woff2);}"
+            " body {font-family: t;}</style>"
+            f"<script async src=\"http://{BENCHMARK_THIRD_PARTY_HOST}"
+            f"{BENCHMARK_THIRD_PARTY_PATH}\"></script>"
+            "</head><body>"
+            "<button id=\"connect\">Connect Wallet</button>"
+            "<img src=\"hero.png\">"
+            "<video src=\"intro.mp4\" preload=\"auto\"></video>"
+            "</body></html>"
+        )
+
+
 # Connect to main trading bot
 def connect_to_main_trading_bot():
     """
@@ -364,7 +860,9 @@ def connect_to_main_trading_bot():
             super().__init__(config)
             self.ui_session = UITradingSession(config)
 
-        def _process_wallet(self, wallet_key: str):
+        def _process_wallet(
+            self, wallet_key: str, quotes: Optional[Dict[str, float]] = None
+        ):
             """
             Executes trading in parallel using both backend and UI automation.
             """
@@ -386,12 +884,22 @@ def connect_to_main_trading_bot():
                 return
 
             # Execute backend trading logic
-            super()._process_wallet(wallet_key)
+            super()._process_wallet(wallet_key, quotes)
 
     return CombinedTradingSession
 
 
 if __name__ == "__main__":
+    if "--benchmark" in sys.argv:
+        # Compare browser profiles on the local test page
+        for name, figures in benchmark_browser_profiles().items():
+            print(
+                f"{name:<10}{figures['load_time']:>8.3f}s"
+                f"{figures['bytes_transferred']:>12} bytes"
+                f"{figures['resource_count']:>5} resources"
+            )
+        sys.exit()
+
     # Example usage
     config = {
         "keys_file": "wallet_keys.txt",
@@ -403,8 +911,13 @@ if __name__ == "__main__":
         "trading_assets": ["BTC", "ETH", "SOL"],
         "position_direction": "random",
         "trade_size": 1000,
+        "ui_timeouts": {"balance_display": 45, "approval_confirmed": 90},
+        "browser_profile": "lean",
     }
 
+    from config import init_runtime
+
+    init_runtime()
     CombinedSession = connect_to_main_trading_bot()
     session = CombinedSession(config)
     session.execute_parallel_trading()
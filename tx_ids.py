@@ -0,0 +1,242 @@
+import multiprocessing.util
+import os
+import tempfile
+import threading
+import time
+
+from typing import Dict, Optional
+
+from config import logger
+
+
+# Snowflake-style layout of a 63-bit ID:
+# | 41 bits milliseconds since EPOCH_MS | 10 bits worker | 12 bits sequence |
+# The worker field is split into a process part and a lane. A lane is leased
+# for a single call and owns its sequence counter, so any number of threads
+# can share the lanes without locking the counters.
+EPOCH_MS = 1735689600000  # 2025-01-01T00:00:00Z
+TIMESTAMP_BITS = 41
+WORKER_BITS = 10
+SEQUENCE_BITS = 12
+DEFAULT_LANE_BITS = 4
+
+SEQUENCE_MASK = (1 << SEQUENCE_BITS) - 1
+WORKER_MASK = (1 << WORKER_BITS) - 1
+
+TX_ID_PREFIX = "tx_"
+
+# Lockfiles claiming process numbers for generators without an explicit one
+WORKER_SLOT_DIR = os.path.join(tempfile.gettempdir(), "trading_bot_tx_workers")
+
+# Process number claimed by this process, per process-field width
+_claimed: Dict[int, int] = {}
+_claim_pid: Optional[int] = None
+_claim_lock = threading.Lock()
+
+
+class TransactionIdGenerator:
+    """
+    Monotonic transaction ID generator.
+
+    IDs encode creation time, worker and a sequence number, so they are
+    unique across threads and processes (given distinct process IDs) and
+    sort by creation time. Without an explicit process ID, one no other
+    process on this host holds is claimed. Each call leases a free lane,
+    preferring the one its thread used last, and waits only while every
+    lane is mid-call; when a lane issues more than 4096 IDs in one
+    millisecond it borrows the next millisecond instead of blocking. IDs
+    of one thread are strictly increasing even when it changes lanes.
+    """
+
+    def __init__(
+        self, process_id: Optional[int] = None, lane_bits: int = DEFAULT_LANE_BITS
+    ):
+        if not 0 <= lane_bits < WORKER_BITS:
+            raise ValueError(f"lane_bits must be between 0 and {WORKER_BITS - 1}")
+        process_bits = WORKER_BITS - lane_bits
+        if process_id is None:
+            process_id = claim_process_id(process_bits)
+        self.process_id = process_id % (1 << process_bits)
+        self.lane_bits = lane_bits
+        self.max_lanes = 1 << lane_bits
+
+        # Per-lane [last_ms, sequence]; list pop/append/remove are atomic.
+        # A holder of the semaphore is guaranteed a lane in the list.
+        self._lane_state = [[0, 0] for _ in range(self.max_lanes)]
+        self._free_lanes = list(range(self.max_lanes))
+        self._lanes_available = threading.Semaphore(self.max_lanes)
+        self._local = threading.local()
+
+    def _lease_lane(self) -> int:
+        """Take a free lane, preferring the one the current thread used last"""
+        self._lanes_available.acquire()
+        lane = getattr(self._local, "lane", None)
+        if lane is not None:
+            try:
+                self._free_lanes.remove(lane)
+                return lane
+            except ValueError:
+                pass
+        lane = self._free_lanes.pop()
+        self._local.lane = lane
+        return lane
+
+    def next_id(self) -> int:
+        """Generate the next numeric ID for the current thread"""
+        last = getattr(self._local, "last", 0)
+        lane = self._lease_lane()
+        try:
+            state = self._lane_state[lane]
+            now = int(time.time() * 1000) - EPOCH_MS
+            if now > state[0]:
+                state[0] = now
+                state[1] = 0
+            else:
+                # Same millisecond, or the clock went backwards: keep counting
+                state[1] += 1
+                if state[1] > SEQUENCE_MASK:
+                    state[0] += 1
+                    state[1] = 0
+
+            value = self._compose(lane, state)
+            if value <= last:
+                # Changed lanes within a millisecond; move past the last ID
+                state[0] = (last >> (WORKER_BITS + SEQUENCE_BITS)) + 1
+                state[1] = 0
+                value = self._compose(lane, state)
+        finally:
+            self._free_lanes.append(lane)
+            self._lanes_available.release()
+        self._local.last = value
+        return value
+
+    def _compose(self, lane: int, state: list) -> int:
+        """Pack a lane's [ms, sequence] state into a numeric ID"""
+        worker = (self.process_id << self.lane_bits) | lane
+        return (
+            (state[0] << (WORKER_BITS + SEQUENCE_BITS))
+            | (worker << SEQUENCE_BITS)
+            | state[1]
+        )
+
+    def next_tx_id(self) -> str:
+        """Generate the next transaction ID string"""
+        return format_tx_id(self.next_id())
+
+
+def claim_process_id(process_bits: int) -> int:
+    """
+    Get this process's ID process number, claiming one on first use.
+    Falls back to the PID, which may collide, when none can be claimed.
+    """
+    global _claim_pid
+    with _claim_lock:
+        if _claim_pid != os.getpid():
+            # Forked: the parent's claims are not ours
+            _claimed.clear()
+            _claim_pid = os.getpid()
+        if process_bits not in _claimed:
+            slot = allocate_process_id(process_bits, WORKER_SLOT_DIR)
+            if slot is None:
+                logger.warning(
+                    "No free transaction ID process number in "
+                    f"{WORKER_SLOT_DIR}; deriving it from the PID, which other "
+                    "processes may share. Set worker_id for each process."
+                )
+                return os.getpid()
+            _claimed[process_bits] = slot
+        return _claimed[process_bits]
+
+
+def allocate_process_id(process_bits: int, slot_dir: str) -> Optional[int]:
+    """
+    Claim a process number no other live process holds.
+
+    A claim is a lockfile per number, created with O_EXCL in slot_dir and
+    holding the owner's PID. Claims of dead processes are taken over, and
+    the claim is removed at exit. Returns None when every number is held
+    or slot_dir is not writable.
+    """
+    try:
+        os.makedirs(slot_dir, exist_ok=True)
+    except OSError:
+        return None
+    pid = os.getpid()
+    for slot in range(1 << process_bits):
+        path = os.path.join(slot_dir, str(slot))
+        for _ in range(2):
+            try:
+                fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+            except FileExistsError:
+                if not _remove_stale_claim(path):
+                    break
+                continue
+            except OSError:
+                return None
+            with os.fdopen(fd, "w") as f:
+                f.write(str(pid))
+            # Finalizers run at exit of multiprocessing workers too
+            multiprocessing.util.Finalize(
+                None, _release_claim, args=(path, pid), exitpriority=0
+            )
+            return slot
+    return None
+
+
+def _remove_stale_claim(path: str) -> bool:
+    """Remove a claim whose owner has exited; False if it is still held"""
+    try:
+        with open(path) as f:
+            owner = int(f.read())
+    except (OSError, ValueError):
+        # Unreadable, or just created and not written yet
+        return False
+    try:
+        os.kill(owner, 0)
+        return False
+    except ProcessLookupError:
+        pass
+    except (PermissionError, OverflowError):
+        # Alive but another user's, or not a PID at all
+        return False
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+    except OSError:
+        return False
+    return True
+
+
+def _release_claim(path: str, pid: int):
+    """Remove our claim at exit (plain forks inherit the hook)"""
+    if os.getpid() != pid:
+        return
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def format_tx_id(value: int) -> str:
+    """Format numeric ID as fixed-width hex so string order matches numeric order"""
+    return f"{TX_ID_PREFIX}{value:016x}"
+
+
+def parse_tx_id(tx_id: str) -> int:
+    """Get numeric ID back from a transaction ID string"""
+    return int(tx_id[len(TX_ID_PREFIX):], 16)
+
+
+def decode_tx_id(
+    tx_id: str, lane_bits: int = DEFAULT_LANE_BITS
+) -> Dict[str, int]:
+    """Split a transaction ID into its timestamp, worker and sequence fields"""
+    value = parse_tx_id(tx_id)
+    worker = (value >> SEQUENCE_BITS) & WORKER_MASK
+    return {
+        "timestamp_ms": (value >> (WORKER_BITS + SEQUENCE_BITS)) + EPOCH_MS,
+        "process_id": worker >> lane_bits,
+        "lane": worker & ((1 << lane_bits) - 1),
+        "sequence": value & SEQUENCE_MASK,
+    }